@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Martian Robots Batch Runner
+
+Runs many independent mission files, each on its own grid, across a pool
+of worker processes (or threads, with --threads). Results are written
+next to each mission file (<mission>.out) or into one combined output
+file. A malformed mission is reported and skipped without aborting the
+rest of the batch.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+from src.batch import collect_mission_files, run_batch
+from src.simulator import ENGINES
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line options.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Run a batch of Martian Robots missions.")
+    parser.add_argument("source", help="directory of *.txt missions or a manifest file")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of workers (default: CPU count)")
+    parser.add_argument("--combined", metavar="PATH",
+                        help="write all results into one file instead of next to each input")
+    parser.add_argument("--engine", choices=ENGINES, default="reference",
+                        help="instruction execution engine")
+    parser.add_argument("--threads", action="store_true",
+                        help="use worker threads instead of processes (scales on free-threaded Python)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run a batch of missions."""
+    options = parse_arguments(argv)
+    try:
+        paths = collect_mission_files(options.source)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    combined = open(options.combined, 'w') if options.combined else None
+    failures = 0
+    total_robots = 0
+    try:
+        for mission in run_batch(paths, options.workers or None,
+                                 write_next_to_input=combined is None,
+                                 engine=options.engine,
+                                 executor="thread" if options.threads else "process"):
+            if mission.error is not None:
+                failures += 1
+                print(f"{mission.path}: ERROR {mission.error}", file=sys.stderr)
+                if combined is not None:
+                    combined.write(f"# {mission.path} ERROR {mission.error}\n")
+                continue
+
+            total_robots += mission.robots
+            print(f"{mission.path}: {mission.robots} robots in {mission.seconds:.3f}s",
+                  file=sys.stderr)
+            if combined is not None:
+                combined.write(f"# {mission.path}\n")
+                combined.writelines(result + "\n" for result in mission.results)
+    finally:
+        if combined is not None:
+            combined.close()
+
+    print(f"{len(paths) - failures}/{len(paths)} missions succeeded, {total_robots} robots",
+          file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
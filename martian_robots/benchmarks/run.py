@@ -0,0 +1,230 @@
+"""
+Benchmark runner.
+
+Times the main entry points on the synthetic workloads and reports
+robots/s, instructions/s and peak memory as JSON. Run from the
+martian_robots directory:
+
+    python -m benchmarks.run --scale 0.1 --output bench.json
+    python -m benchmarks.run --scale 0.1 --compare bench.json
+
+With --compare, throughput is checked against an earlier report and the
+exit status is non-zero if any measurement regressed beyond --tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import main as entry_point
+from benchmarks.workloads import WORKLOADS, generate_mission, mission_lines
+from src.parallel import SpeculativeRunner
+from src.parser import parse_input
+from src.simulator import ENGINES, Simulator
+from src.threaded import gil_enabled
+
+
+# 'threads' runs SpeculativeRunner on a thread per core; compare it with
+# process_multiple_robots to see multi-core scaling on free-threaded Python
+TARGETS = ('parse_input', 'process_robot', 'process_multiple_robots', 'threads', 'main')
+
+
+def _target_function(target: str, mission, lines: List[str], engine: str) -> Callable[[], None]:
+    """Build a zero-argument callable running one benchmark target."""
+    max_x, max_y, robots = mission
+
+    if target == 'parse_input':
+        return lambda: parse_input(lines)
+
+    if target == 'process_robot':
+        def run_each():
+            simulator = Simulator(max_x, max_y, engine=engine)
+            for robot in robots:
+                simulator.process_robot(*robot)
+        return run_each
+
+    if target == 'process_multiple_robots':
+        return lambda: Simulator(max_x, max_y, engine=engine).process_multiple_robots(robots)
+
+    if target == 'threads':
+        def run_threads():
+            simulator = Simulator(max_x, max_y, engine=engine, scent_store='concurrent')
+            SpeculativeRunner(simulator, os.cpu_count(), chunk_size=1000,
+                              executor='thread').process_multiple_robots(robots)
+        return run_threads
+
+    text = ''.join(lines)
+
+    def run_main():
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(text)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                entry_point.main(['--engine', engine])
+        finally:
+            sys.stdin = stdin
+    return run_main
+
+
+def measure(function: Callable[[], None], repeat: int = 3, trace_memory: bool = True) -> Dict[str, float]:
+    """
+    Time a callable and optionally record its peak traced memory.
+
+    Args:
+        function: Callable to measure
+        repeat: Number of timed runs; the best time is reported
+        trace_memory: Also run once under tracemalloc for peak memory
+
+    Returns:
+        Dictionary with 'seconds' and 'peak_memory_bytes'
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'seconds': best, 'peak_memory_bytes': peak}
+
+
+def run_benchmarks(workloads: List[str], targets: List[str], engine: str = 'reference',
+                   seed: int = 2018, scale: float = 1.0, repeat: int = 3,
+                   trace_memory: bool = True) -> Dict[str, object]:
+    """
+    Run every target on every workload.
+
+    Args:
+        workloads: Workload names from WORKLOADS
+        targets: Target names from TARGETS
+        engine: Simulator engine to benchmark
+        seed: Workload seed
+        scale: Workload size multiplier
+        repeat: Timed runs per measurement
+        trace_memory: Whether to record peak memory
+
+    Returns:
+        JSON-serializable report
+    """
+    results = []
+    for workload in workloads:
+        mission = generate_mission(workload, seed, scale)
+        lines = list(mission_lines(mission))
+        robots = len(mission[2])
+        instructions = sum(len(robot[3]) for robot in mission[2])
+
+        for target in targets:
+            measurement = measure(_target_function(target, mission, lines, engine),
+                                  repeat, trace_memory)
+            seconds = max(measurement['seconds'], 1e-9)
+            results.append({
+                'workload': workload,
+                'target': target,
+                'robots': robots,
+                'instructions': instructions,
+                'seconds': measurement['seconds'],
+                'robots_per_second': robots / seconds,
+                'instructions_per_second': instructions / seconds,
+                'peak_memory_bytes': measurement['peak_memory_bytes'],
+            })
+
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'gil_enabled': gil_enabled(),
+        'engine': engine,
+        'seed': seed,
+        'scale': scale,
+        'results': results,
+    }
+
+
+def compare_reports(baseline: Dict[str, object], current: Dict[str, object],
+                    tolerance: float = 0.1) -> List[str]:
+    """
+    Find measurements whose throughput dropped against a baseline.
+
+    Args:
+        baseline: Earlier report from run_benchmarks
+        current: New report from run_benchmarks
+        tolerance: Allowed relative slowdown (0.1 = 10%)
+
+    Returns:
+        Human-readable description of each regression
+    """
+    previous = {(r['workload'], r['target']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get((result['workload'], result['target']))
+        if before is None:
+            continue
+        ratio = result['robots_per_second'] / max(before['robots_per_second'], 1e-9)
+        if ratio < 1 - tolerance:
+            regressions.append(f"{result['workload']}/{result['target']}: "
+                               f"{ratio:.2f}x of baseline robots/s")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit, if available."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the Martian Robots simulator.")
+    parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                        help="workload to run (repeatable, default: all)")
+    parser.add_argument('--target', action='append', choices=TARGETS,
+                        help="entry point to time (repeatable, default: all)")
+    parser.add_argument('--engine', choices=ENGINES, default='reference')
+    parser.add_argument('--seed', type=int, default=2018)
+    parser.add_argument('--scale', type=float, default=1.0, help="workload size multiplier")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per measurement")
+    parser.add_argument('--no-memory', action='store_true', help="skip peak memory tracing")
+    parser.add_argument('--output', metavar='PATH', help="write the JSON report here")
+    parser.add_argument('--compare', metavar='PATH', help="baseline report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="allowed relative slowdown before flagging a regression")
+    options = parser.parse_args(argv)
+
+    report = run_benchmarks(options.workload or sorted(WORKLOADS), options.target or list(TARGETS),
+                            options.engine, options.seed, options.scale, options.repeat,
+                            not options.no_memory)
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare_reports(json.load(f), report, options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Seeded synthetic mission generators for benchmarking.
+
+Every workload is fully determined by its name, seed and scale, so the
+same command produces the same missions on every commit.
+"""
+
+import random
+from typing import Callable, Dict, Iterator, List, Tuple
+
+
+RobotData = Tuple[int, int, str, str]
+Mission = Tuple[int, int, List[RobotData]]
+
+
+def _realistic(rng: random.Random, scale: float) -> Mission:
+    """Moderate grid, mixed instructions, occasional losses."""
+    max_x, max_y = 50, 50
+    robots = [
+        (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'),
+         ''.join(rng.choice('LRFFF') for _ in range(rng.randint(5, 99))))
+        for _ in range(_count(20000, scale))
+    ]
+    return max_x, max_y, robots
+
+
+def _huge_grid(rng: random.Random, scale: float) -> Mission:
+    """Very large grid with long straight runs."""
+    max_x, max_y = 10 ** 9, 10 ** 9
+    robots = []
+    for _ in range(_count(2000, scale)):
+        runs = [rng.choice('LR') + 'F' * rng.randint(100, 5000) for _ in range(rng.randint(1, 8))]
+        robots.append((rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'), ''.join(runs)))
+    return max_x, max_y, robots
+
+
+def _long_instructions(rng: random.Random, scale: float) -> Mission:
+    """A few robots with very long instruction strings."""
+    max_x, max_y = 1000, 1000
+    length = _count(1000000, scale)
+    robots = [
+        (max_x // 2, max_y // 2, rng.choice('NESW'),
+         ''.join(rng.choice('LRFF') for _ in range(length)))
+        for _ in range(4)
+    ]
+    return max_x, max_y, robots
+
+
+def _edge_hugging(rng: random.Random, scale: float) -> Mission:
+    """Robots driven into the edges so losses and scent hits dominate."""
+    max_x, max_y = 40, 40
+    robots = []
+    for _ in range(_count(20000, scale)):
+        heading = rng.choice('NESW')
+        if heading in 'NS':
+            start = (rng.randint(0, max_x), max_y if heading == 'N' else 0)
+        else:
+            start = (max_x if heading == 'E' else 0, rng.randint(0, max_y))
+        robots.append((start[0], start[1], heading, 'F' + ''.join(rng.choice('LRF') for _ in range(20))))
+    return max_x, max_y, robots
+
+
+def _turn_only(rng: random.Random, scale: float) -> Mission:
+    """Instructions with no forward moves at all."""
+    max_x, max_y = 10, 10
+    robots = [
+        (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'),
+         ''.join(rng.choice('LR') for _ in range(rng.randint(50, 500))))
+        for _ in range(_count(5000, scale))
+    ]
+    return max_x, max_y, robots
+
+
+def _many_short(rng: random.Random, scale: float) -> Mission:
+    """Millions of robots with a handful of instructions each."""
+    max_x, max_y = 50, 50
+    robots = [
+        (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'),
+         ''.join(rng.choice('LRF') for _ in range(rng.randint(1, 8))))
+        for _ in range(_count(1000000, scale))
+    ]
+    return max_x, max_y, robots
+
+
+WORKLOADS: Dict[str, Callable[[random.Random, float], Mission]] = {
+    'realistic': _realistic,
+    'huge_grid': _huge_grid,
+    'long_instructions': _long_instructions,
+    'edge_hugging': _edge_hugging,
+    'turn_only': _turn_only,
+    'many_short': _many_short,
+}
+
+
+def _count(full_size: int, scale: float) -> int:
+    """Scale a workload size, keeping at least one item."""
+    return max(1, int(full_size * scale))
+
+
+def generate_mission(name: str, seed: int = 2018, scale: float = 1.0) -> Mission:
+    """
+    Generate a named workload.
+
+    Args:
+        name: Workload name from WORKLOADS
+        seed: Random seed
+        scale: Size multiplier (1.0 is the full benchmark size)
+
+    Returns:
+        Tuple of (max_x, max_y, robot_data)
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {name}")
+    return WORKLOADS[name](random.Random(f"{name}:{seed}"), scale)
+
+
+def mission_lines(mission: Mission) -> Iterator[str]:
+    """
+    Render a mission in the stdin text format.
+
+    Args:
+        mission: Tuple of (max_x, max_y, robot_data)
+
+    Yields:
+        Input lines, each ending in a newline
+    """
+    max_x, max_y, robots = mission
+    yield f"{max_x} {max_y}\n"
+    for x, y, orientation, instructions in robots:
+        yield f"{x} {y} {orientation}\n"
+        yield f"{instructions}\n"
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Martian Robots Format Converter
+
+Converts mission and result files between the text format read by main.py
+and the binary columnar format. The direction is detected from the input.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+from src.columnar import convert_file
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line options.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Convert between text and binary mission files.")
+    parser.add_argument("source", help="text or binary mission/results file")
+    parser.add_argument("destination", help="file to write in the other format")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to convert one file."""
+    options = parse_arguments(argv)
+    try:
+        kind = convert_file(options.source, options.destination)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{options.source}: {kind}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
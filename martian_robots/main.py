@@ -8,68 +8,239 @@ where robots that fall off the grid leave a scent that prevents future
 robots from falling off at the same position.
 """
 
+import argparse
+import io
+import os
+import stat
 import sys
-from src.simulator import Simulator
+from typing import Iterable, List, Optional, TextIO
+from src.analytics import TrafficAnalytics
+from src.cache import ResultCache
+from src.columnar import read_mission, results_from_text, results_to_text, write_results as write_binary_results
+from src.checkpoint import read_checkpoint, restore_checkpoint, save_checkpoint
+from src.compression import COMPRESSIONS, decompressed, file_compression, open_compressed, sniff_compression
+from src.mmap_parser import MappedMission
+from src.parallel import SpeculativeRunner
+from src.parser import parse_input, stream_file, stream_input  # parse_input kept importable from main
+from src.simulator import ENGINES, Simulator
+from src.stats import SimulationStats
+from src.terrain import load_terrain
+from src.trajectory import TrajectoryRecorder
 
 
-def parse_input(input_lines):
+# Number of result lines joined into a single write call
+OUTPUT_BATCH_SIZE = 4096
+
+
+def write_results(results: Iterable[str], output: TextIO, batch_size: int = OUTPUT_BATCH_SIZE) -> None:
     """
-    Parse input lines into grid dimensions and robot data.
+    Write results incrementally in batches.
+    
+    The first result is flushed immediately so that output starts as soon
+    as the first robot has been simulated; after that, lines are written
+    and flushed in batches of batch_size.
     
     Args:
-        input_lines: List of input strings
-        
-    Returns:
-        Tuple of (max_x, max_y, robot_data_list)
+        results: Iterable of result strings
+        output: Text stream to write to
+        batch_size: Number of lines per write call
     """
-    if not input_lines:
-        raise ValueError("No input provided")
-    
-    # Parse grid dimensions from first line
-    try:
-        max_x, max_y = map(int, input_lines[0].strip().split())
-    except ValueError:
-        raise ValueError("Invalid grid dimensions format")
-    
-    robot_data = []
-    i = 1
+    batch = []
+    first = True
+    for result in results:
+        batch.append(result)
+        if first or len(batch) >= batch_size:
+            batch.append("")
+            output.write("\n".join(batch))
+            output.flush()
+            batch = []
+            first = False
+    if batch:
+        batch.append("")
+        output.write("\n".join(batch))
+    output.flush()
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line options.
     
-    while i < len(input_lines):
-        if i + 1 >= len(input_lines):
-            raise ValueError("Incomplete robot data")
-        
-        # Parse robot position and orientation
-        try:
-            x, y, orientation = input_lines[i].strip().split()
-            x, y = int(x), int(y)
-        except ValueError:
-            raise ValueError(f"Invalid robot position format at line {i + 1}")
-        
-        # Get instructions
-        instructions = input_lines[i + 1].strip()
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
         
-        robot_data.append((x, y, orientation, instructions))
-        i += 2
-    
-    return max_x, max_y, robot_data
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Simulate robots on the Martian surface.")
+    parser.add_argument("input", nargs="?",
+                        help="mission file to memory-map, or to stream if it is gzip, bz2 or xz "
+                             "compressed (default: read stdin, compressed or not)")
+    parser.add_argument("--input-format", choices=("text", "binary"), default="text",
+                        help="mission format (binary is the columnar format from src.columnar)")
+    parser.add_argument("--output-format", choices=("text", "binary"), default="text",
+                        help="result format written to stdout")
+    parser.add_argument("--compress", choices=COMPRESSIONS,
+                        help="compress the results written to stdout")
+    parser.add_argument("--engine", choices=ENGINES, default="reference",
+                        help="instruction execution engine")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="run speculatively across this many processes (0 = sequential)")
+    parser.add_argument("--threads", action="store_true",
+                        help="with --workers, use threads and a concurrent scent store instead of "
+                             "processes (scales on free-threaded Python)")
+    parser.add_argument("--collisions", choices=("ignore", "stop"),
+                        help="park robots where they finish; an F into a parked robot is "
+                             "ignored or stops the robot")
+    parser.add_argument("--occupancy", choices=("hash", "bitmap"), default="hash",
+                        help="occupancy index for --collisions (bitmap suits dense fleets)")
+    parser.add_argument("--terrain", metavar="PATH",
+                        help="obstacle map: a binary terrain file (memory-mapped) or an ASCII "
+                             "map with '#' for obstacles, north row first")
+    parser.add_argument("--terrain-policy", choices=("ignore", "stop"), default="ignore",
+                        help="an F into an obstacle is ignored or stops the robot")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="resume from and update a scent checkpoint; only robots after "
+                             "the checkpointed count are simulated and printed")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="cache results of up to this many repeated robots (0 = off)")
+    parser.add_argument("--trajectory", metavar="PATH",
+                        help="record every robot's path to a binary trajectory file")
+    parser.add_argument("--analytics", metavar="PREFIX",
+                        help="write a coverage heatmap (PREFIX.pgm) and per-cell and per-edge "
+                             "counts (PREFIX.cells.csv, PREFIX.edges.csv); requires numpy")
+    parser.add_argument("--stats", choices=("json", "prometheus"),
+                        help="collect runtime metrics and print them to stderr")
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the Martian Robots simulation."""
+    options = parse_arguments(argv)
     try:
-        # Read input from stdin
-        input_lines = sys.stdin.readlines()
+        if options.trajectory and options.workers > 0:
+            # Robots accepted from worker processes never pass through the recorder
+            raise ValueError("--trajectory cannot be combined with --workers")
+        if options.stats and options.workers > 0:
+            # Robots accepted from worker processes bypass the instrumented loop
+            raise ValueError("--stats cannot be combined with --workers")
+        if options.analytics and (options.workers > 0 or options.stats or options.trajectory
+                                  or options.collisions or options.terrain or options.cache_size > 0):
+            raise ValueError("--analytics cannot be combined with --workers, --stats, --trajectory, "
+                             "--collisions, --terrain or --cache-size")
+        stats = SimulationStats() if options.stats else None
+        recorder = TrajectoryRecorder(options.trajectory) if options.trajectory else None
+        analytics = None
+        simulator_options = {
+            'engine': options.engine,
+            'stats': stats,
+            'cache': ResultCache(options.cache_size) if options.cache_size > 0 else None,
+            'recorder': recorder,
+        }
+        if options.threads:
+            if options.workers == 0:
+                raise ValueError("--threads requires --workers")
+            simulator_options['scent_store'] = 'concurrent'
+        if options.collisions:
+            if options.workers > 0 or options.checkpoint:
+                raise ValueError("--collisions cannot be combined with --workers or --checkpoint")
+            simulator_options['occupancy'] = options.occupancy
+            simulator_options['collision_policy'] = options.collisions
+        terrain = None
+        if options.terrain:
+            if options.workers > 0:
+                raise ValueError("--terrain cannot be combined with --workers")
+            terrain = simulator_options['terrain'] = load_terrain(options.terrain)
+            simulator_options['terrain_policy'] = options.terrain_policy
+        
+        # Restore scents and skip robots already covered by a checkpoint
+        simulator = None
+        input_offset = 0
+        if options.checkpoint and os.path.exists(options.checkpoint):
+            checkpoint = read_checkpoint(options.checkpoint)
+            if options.analytics:
+                analytics = TrafficAnalytics(checkpoint.max_x, checkpoint.max_y)
+            simulator = restore_checkpoint(checkpoint, analytics=analytics, **simulator_options)
+            input_offset = checkpoint.input_offset
+        skip_robots = simulator.robots_processed if simulator is not None else 0
+        
+        # Parse grid dimensions; robots are parsed lazily as lines arrive
+        mission = columns = None
+        # Compressed input is decompressed as a stream on a reader thread
+        stdin = getattr(sys.stdin, 'buffer', None)
+        if options.input_format == "binary":
+            if options.input:
+                with open(options.input, 'rb') as f:
+                    columns = read_mission(decompressed(f))
+            else:
+                columns = read_mission(decompressed(sys.stdin.buffer))
+            max_x, max_y = columns.max_x, columns.max_y
+            robot_data = columns.robots(skip_robots)
+        elif options.input and file_compression(options.input) is not None:
+            max_x, max_y, robot_data = stream_file(options.input, skip_robots)
+        elif options.input:
+            mission = MappedMission(options.input)
+        elif stdin is not None and sniff_compression(stdin) is not None:
+            max_x, max_y, robot_data = stream_file(stdin, skip_robots)
+        elif stdin is not None and stat.S_ISREG(os.fstat(stdin.fileno()).st_mode):
+            # A redirected file is mapped like --input, so a resume can seek
+            mission = MappedMission(stdin)
+        else:
+            max_x, max_y, robot_data = stream_input(sys.stdin, skip_robots)
+        if mission is not None:
+            # Seek past the checkpointed robots instead of rescanning them
+            max_x, max_y = mission.max_x, mission.max_y
+            robot_data = mission.robots(skip_robots, input_offset)
+        if stats is not None:
+            robot_data = stats.timed(robot_data, 'parse')
+        
+        # Create simulator and stream results to stdout
+        if simulator is None:
+            if options.analytics:
+                analytics = TrafficAnalytics(max_x, max_y)
+            simulator = Simulator(max_x, max_y, analytics=analytics, **simulator_options)
+        elif (simulator.grid.max_x, simulator.grid.max_y) != (max_x, max_y):
+            raise ValueError("Checkpoint grid dimensions do not match the input")
+        if columns is not None and options.workers == 0:
+            result_columns = simulator.process_columns(columns, skip_robots)
+            results = results_to_text(result_columns)
+        elif options.workers > 0:
+            executor = "thread" if options.threads else "process"
+            results = SpeculativeRunner(simulator, options.workers, executor=executor).iter_results(robot_data)
+        else:
+            results = simulator.iter_results(robot_data)
+        compressed = open_compressed(sys.stdout.buffer, options.compress, 'wb') if options.compress else None
+        if options.output_format == "binary":
+            if columns is None or options.workers > 0:
+                result_columns = results_from_text(results)
+            write_binary_results(compressed or sys.stdout.buffer, result_columns)
+        elif compressed is not None:
+            output = io.TextIOWrapper(compressed, encoding='utf-8', newline='\n')
+            write_results(results, output)
+            output.detach()
+        else:
+            write_results(results, sys.stdout)
+        if compressed is not None:
+            compressed.close()
+        sys.stdout.flush()
+        if recorder is not None:
+            recorder.close()
+        if mission is not None:
+            mission.close()
+        if terrain is not None:
+            terrain.close()
         
-        # Parse input
-        max_x, max_y, robot_data = parse_input(input_lines)
+        if analytics is not None:
+            analytics.write_pgm(f"{options.analytics}.pgm")
+            analytics.write_cells_csv(f"{options.analytics}.cells.csv")
+            analytics.write_edges_csv(f"{options.analytics}.edges.csv")
         
-        # Create simulator and process robots
-        simulator = Simulator(max_x, max_y)
-        results = simulator.process_multiple_robots(robot_data)
+        if options.checkpoint:
+            # Only mapped text input can be resumed by offset
+            save_checkpoint(simulator, options.checkpoint, mission.offset if mission is not None else 0)
         
-        # Output results
-        for result in results:
-            print(result)
+        if stats is not None:
+            report = stats.to_json() + "\n" if options.stats == "json" else stats.to_prometheus()
+            sys.stderr.write(report)
             
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Martian Robots Mission Service
+
+Serves missions over TCP or a Unix socket using the stdin line format,
+keeping a warm simulator (and its scents) per named grid between
+requests. See src/server.py for the protocol.
+"""
+
+import argparse
+import asyncio
+from typing import List, Optional
+from src.server import MissionServer
+from src.simulator import ENGINES
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line options.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Serve Martian Robots missions.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP interface to bind")
+    parser.add_argument("--port", type=int, default=7878, help="TCP port to bind")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--engine", choices=ENGINES, default="reference",
+                        help="instruction execution engine")
+    parser.add_argument("--max-batch", type=int, default=1024,
+                        help="maximum robots per simulator call")
+    return parser.parse_args(argv)
+
+
+async def serve(options: argparse.Namespace) -> None:
+    """Run the mission server until cancelled."""
+    server = MissionServer(engine=options.engine, max_batch=options.max_batch)
+    if options.unix:
+        await server.start_unix(options.unix)
+        print(f"Listening on {options.unix}")
+    else:
+        host, port = await server.start_tcp(options.host, options.port)
+        print(f"Listening on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the mission service."""
+    try:
+        asyncio.run(serve(parse_arguments(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
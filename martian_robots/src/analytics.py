@@ -0,0 +1,239 @@
+from array import array
+from typing import Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# Off-grid cells bordering the grid, in perimeter order: the north line
+# (y = max_y + 1), east (x = max_x + 1), south (y = -1) and west (x = -1)
+EDGES = ('north', 'east', 'south', 'west')
+
+# Buffered events before they are folded into the arrays
+BUFFER_SIZE = 1 << 18
+
+
+class TrafficAnalytics:
+    """
+    Fleet coverage heatmap and per-edge loss and scent-hit counts.
+
+    Pass an instance as Simulator(analytics=...). Robots then run through
+    the compiled engine, which reports each F run rather than each step.
+    Runs are buffered as (first cell, stride, length) arithmetic
+    progressions over flattened cell ids (x * (max_y + 1) + y). Every run
+    is a straight segment of one column or one row, so each batch is
+    folded in with column and row difference arrays and a cumsum: memory
+    and work grow with the number of runs and the grid size, never with
+    the run lengths. Losses and scent hits are buffered as perimeter cell
+    ids and folded in with np.bincount.
+    """
+
+    def __init__(self, max_x: int, max_y: int, buffer_size: int = BUFFER_SIZE):
+        """
+        Allocate zeroed count arrays for a grid.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+            buffer_size: Buffered runs before folding them into the counts
+        """
+        if np is None:
+            raise ImportError("Traffic analytics require numpy")
+        self.max_x = max_x
+        self.max_y = max_y
+        self.buffer_size = buffer_size
+        self.robots = 0
+        self._height = max_y + 1
+        self._strides = (1, self._height, -1, -self._height)
+        self._visits = np.zeros((max_x + 1) * self._height, dtype=np.int64)
+        self._perimeter_size = 2 * (max_x + 1) + 2 * (max_y + 1)
+        self._losses = np.zeros(self._perimeter_size, dtype=np.int64)
+        self._scent_hits = np.zeros(self._perimeter_size, dtype=np.int64)
+        self.other_losses = 0
+        self.other_scent_hits = 0
+        self._run_starts, self._run_strides, self._run_lengths = array('q'), array('q'), array('q')
+        self._loss_cells, self._hit_cells, self._hit_counts = array('q'), array('q'), array('q')
+
+    def start(self, x: int, y: int) -> None:
+        """Record a robot placed at its start position."""
+        self.robots += 1
+        if 0 <= x <= self.max_x and 0 <= y <= self.max_y:
+            self._add_run(x * self._height + y, 0, 1)
+
+    def moved(self, x: int, y: int, heading: int, steps: int) -> None:
+        """Record steps forward moves from (x, y); see program.ProgramObserver."""
+        stride = self._strides[heading]
+        first = (x * self._height + y) + stride
+        self._add_run(first, stride, steps)
+
+    def scent_hit(self, x: int, y: int, count: int) -> None:
+        """Record count moves ignored at the scented off-grid cell (x, y)."""
+        cell = self._perimeter_cell(x, y)
+        if cell < 0:
+            self.other_scent_hits += count
+            return
+        self._hit_cells.append(cell)
+        self._hit_counts.append(count)
+
+    def lost(self, x: int, y: int) -> None:
+        """Record a robot lost onto the off-grid cell (x, y)."""
+        cell = self._perimeter_cell(x, y)
+        if cell < 0:
+            self.other_losses += 1
+            return
+        self._loss_cells.append(cell)
+
+    def flush(self) -> None:
+        """Fold buffered events into the count arrays."""
+        if self._run_lengths:
+            starts = np.frombuffer(self._run_starts, dtype=np.int64)
+            strides = np.frombuffer(self._run_strides, dtype=np.int64)
+            lengths = np.frombuffer(self._run_lengths, dtype=np.int64)
+            ends = starts + strides * (lengths - 1)
+            low, high = np.minimum(starts, ends), np.maximum(starts, ends)
+
+            # Runs along a column (stride +-1, or 0 for start cells) cover
+            # consecutive cell ids
+            column = np.abs(strides) <= 1
+            if column.any():
+                size = len(self._visits) + 1
+                difference = (np.bincount(low[column], minlength=size)
+                              - np.bincount(high[column] + 1, minlength=size))
+                self._visits += np.cumsum(difference)[:-1]
+
+            # Runs along a row are ranges of x at a fixed y; count them in
+            # a (y, x) layout with a spare column for the range ends
+            row = ~column
+            if row.any():
+                width = self.max_x + 2
+                ys = low[row] % self._height
+                first_x, last_x = low[row] // self._height, high[row] // self._height
+                size = self._height * width
+                difference = (np.bincount(ys * width + first_x, minlength=size)
+                              - np.bincount(ys * width + last_x + 1, minlength=size))
+                rows = np.cumsum(difference.reshape(self._height, width), axis=1)[:, :-1]
+                self._visits += rows.T.ravel()
+            del starts, strides, lengths
+            self._run_starts, self._run_strides, self._run_lengths = array('q'), array('q'), array('q')
+
+        if self._loss_cells:
+            self._losses += np.bincount(np.frombuffer(self._loss_cells, dtype=np.int64),
+                                        minlength=self._perimeter_size)
+            self._loss_cells = array('q')
+        if self._hit_cells:
+            self._scent_hits += np.bincount(np.frombuffer(self._hit_cells, dtype=np.int64),
+                                            weights=np.frombuffer(self._hit_counts, dtype=np.int64),
+                                            minlength=self._perimeter_size).astype(np.int64)
+            self._hit_cells, self._hit_counts = array('q'), array('q')
+
+    @property
+    def visits(self):
+        """Visit counts indexed as visits[x, y]."""
+        self.flush()
+        return self._visits.reshape(self.max_x + 1, self._height)
+
+    def edge_counts(self) -> Dict[str, Tuple[object, object]]:
+        """
+        Return losses and scent hits along each edge.
+
+        Returns:
+            Mapping of edge name to (losses, scent_hits) arrays, indexed by
+            x for the north and south edges and by y for east and west
+        """
+        self.flush()
+        counts = {}
+        start = 0
+        for edge in EDGES:
+            length = self.max_x + 1 if edge in ('north', 'south') else self._height
+            counts[edge] = (self._losses[start:start + length], self._scent_hits[start:start + length])
+            start += length
+        return counts
+
+    def as_arrays(self) -> Dict[str, object]:
+        """Return every count as NumPy arrays (or ints) keyed by name."""
+        arrays: Dict[str, object] = {'visits': self.visits, 'robots': self.robots,
+                                     'other_losses': self.other_losses,
+                                     'other_scent_hits': self.other_scent_hits}
+        for edge, (losses, scent_hits) in self.edge_counts().items():
+            arrays[f'{edge}_losses'] = losses
+            arrays[f'{edge}_scent_hits'] = scent_hits
+        return arrays
+
+    def write_cells_csv(self, path: str) -> None:
+        """
+        Write "x,y,visits" rows for every visited cell.
+
+        Args:
+            path: Destination file
+        """
+        visits = self.visits
+        xs, ys = np.nonzero(visits)
+        with open(path, 'w') as f:
+            f.write("x,y,visits\n")
+            for x, y, count in zip(xs.tolist(), ys.tolist(), visits[xs, ys].tolist()):
+                f.write(f"{x},{y},{count}\n")
+
+    def write_edges_csv(self, path: str) -> None:
+        """
+        Write "edge,x,y,losses,scent_hits" rows for every perimeter cell with events.
+
+        Args:
+            path: Destination file
+        """
+        with open(path, 'w') as f:
+            f.write("edge,x,y,losses,scent_hits\n")
+            for edge, (losses, scent_hits) in self.edge_counts().items():
+                for index in np.nonzero(losses + scent_hits)[0].tolist():
+                    x, y = self._edge_cell(edge, index)
+                    f.write(f"{edge},{x},{y},{losses[index]},{scent_hits[index]}\n")
+
+    def write_pgm(self, path: str) -> None:
+        """
+        Write the visit heatmap as a binary PGM image, north at the top.
+
+        Counts are scaled linearly so the busiest cell is white.
+
+        Args:
+            path: Destination file
+        """
+        image = self.visits.T[::-1]
+        peak = int(image.max()) if image.size else 0
+        pixels = (image * 255 // peak if peak else image).astype(np.uint8)
+        with open(path, 'wb') as f:
+            f.write(f"P5\n{self.max_x + 1} {self._height}\n255\n".encode())
+            f.write(np.ascontiguousarray(pixels).tobytes())
+
+    def _add_run(self, first: int, stride: int, length: int) -> None:
+        """Buffer a run of visited cells, folding the buffer when it is full."""
+        self._run_starts.append(first)
+        self._run_strides.append(stride)
+        self._run_lengths.append(length)
+        if len(self._run_lengths) >= self.buffer_size:
+            self.flush()
+
+    def _perimeter_cell(self, x: int, y: int) -> int:
+        """Return the perimeter index of an off-grid cell, or -1 if it borders no edge."""
+        width, height = self.max_x + 1, self._height
+        if 0 <= x <= self.max_x:
+            if y == self.max_y + 1:
+                return x
+            if y == -1:
+                return width + height + x
+        elif 0 <= y <= self.max_y:
+            if x == self.max_x + 1:
+                return width + y
+            if x == -1:
+                return 2 * width + height + y
+        return -1
+
+    def _edge_cell(self, edge: str, index: int) -> Tuple[int, int]:
+        """Return the off-grid cell at an index along an edge."""
+        if edge == 'north':
+            return index, self.max_y + 1
+        if edge == 'east':
+            return self.max_x + 1, index
+        if edge == 'south':
+            return index, -1
+        return -1, index
@@ -0,0 +1,137 @@
+import os
+import time
+from collections import deque
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from .parser import stream_file
+from .simulator import Simulator
+from .threaded import make_executor
+
+
+# Suffix of result files written next to their mission file
+RESULT_SUFFIX = '.out'
+
+
+class MissionResult(NamedTuple):
+    """Outcome of running one mission file."""
+    path: str
+    robots: int
+    seconds: float
+    output_path: Optional[str] = None
+    results: Optional[List[str]] = None
+    error: Optional[str] = None
+
+
+def collect_mission_files(source: str, pattern_suffix: str = '.txt') -> List[str]:
+    """
+    List the mission files named by a directory or a manifest file.
+
+    A directory contributes every file ending in pattern_suffix, sorted by
+    name. A manifest lists one path per line, relative to the manifest's
+    directory; blank lines and lines starting with '#' are skipped.
+
+    Args:
+        source: Directory of mission files or path to a manifest
+        pattern_suffix: File name suffix of missions in a directory
+
+    Returns:
+        List of mission file paths
+    """
+    if os.path.isdir(source):
+        return [
+            os.path.join(source, name)
+            for name in sorted(os.listdir(source))
+            if name.endswith(pattern_suffix) and os.path.isfile(os.path.join(source, name))
+        ]
+
+    base = os.path.dirname(source)
+    paths = []
+    with open(source) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(os.path.join(base, line))
+    return paths
+
+
+def run_mission_file(path: str, output_path: Optional[str] = None,
+                     engine: str = 'reference') -> MissionResult:
+    """
+    Run one mission file in its own Simulator.
+
+    Errors are captured in the returned MissionResult instead of being
+    raised, so one malformed file cannot abort a batch.
+
+    Args:
+        path: Mission file in the stdin text format, optionally gzip, bz2
+            or xz compressed
+        output_path: File to write results to; if None they are returned
+        engine: Simulator engine to use
+
+    Returns:
+        MissionResult describing the run
+    """
+    start = time.perf_counter()
+    robots = 0
+    results = []
+    try:
+        max_x, max_y, robot_data = stream_file(path)
+        simulator = Simulator(max_x, max_y, engine=engine)
+        if output_path is None:
+            results = simulator.process_multiple_robots(robot_data)
+            robots = len(results)
+        else:
+            with open(output_path, 'w') as output:
+                for result in simulator.iter_results(robot_data):
+                    output.write(result)
+                    output.write('\n')
+                    robots += 1
+    except Exception as e:
+        if output_path is not None and os.path.exists(output_path):
+            os.remove(output_path)
+        message = str(e) if isinstance(e, ValueError) else f"Unexpected error: {e}"
+        return MissionResult(path, robots, time.perf_counter() - start, error=message)
+
+    return MissionResult(path, robots, time.perf_counter() - start, output_path,
+                         None if output_path is not None else results)
+
+
+def run_batch(paths: Iterable[str], max_workers: Optional[int] = None,
+              write_next_to_input: bool = True, engine: str = 'reference',
+              executor: str = 'process') -> Iterator[MissionResult]:
+    """
+    Run many independent missions in a process or thread pool.
+
+    Concurrency is bounded: at most two missions per worker are queued at
+    once, and results are yielded in input order as they complete.
+
+    Args:
+        paths: Mission file paths
+        max_workers: Number of workers (defaults to the CPU count)
+        write_next_to_input: Write each mission's results to <path>.out;
+            otherwise results are returned in MissionResult.results
+        engine: Simulator engine to use
+        executor: Worker pool, one of threaded.EXECUTORS; every mission
+            has its own grid, so threads share no simulator state
+
+    Yields:
+        MissionResult for each mission, in input order
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    paths = iter(paths)
+    pending = deque()
+
+    with make_executor(executor, max_workers) as pool:
+        def submit() -> bool:
+            path = next(paths, None)
+            if path is None:
+                return False
+            output_path = path + RESULT_SUFFIX if write_next_to_input else None
+            pending.append(pool.submit(run_mission_file, path, output_path, engine))
+            return True
+
+        while len(pending) < 2 * max_workers and submit():
+            pass
+
+        while pending:
+            yield pending.popleft().result()
+            submit()
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from .grid import Grid
+
+
+# (max_x, max_y, start_x, start_y, orientation, instructions)
+CacheKey = Tuple[int, int, int, int, str, str]
+
+
+class CacheEntry(NamedTuple):
+    """A cached robot result and the scent accesses it depended on."""
+    result: str
+    epoch: int
+    reads: Tuple[Tuple[int, int, bool], ...]
+    writes: Tuple[Tuple[int, int], ...]
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of robot results.
+
+    Entries are keyed by grid bounds, start state and instructions, so
+    grids of different sizes (forks, or registry grids) can share a cache
+    without replaying each other's results. Each entry records
+    the grid's scent epoch when it was computed and the scent cells the
+    run consulted. If no scent has appeared since, the entry is used
+    directly; otherwise it is still valid as long as every consulted cell
+    has the same scent state, so only a relevant new scent invalidates it.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[CacheKey, CacheEntry]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, grid: Grid, key: CacheKey) -> Optional[CacheEntry]:
+        """
+        Find a still-valid entry for a robot.
+
+        Args:
+            grid: Grid holding the current scents
+            key: Tuple of (max_x, max_y, start_x, start_y, orientation, instructions)
+
+        Returns:
+            The entry, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        epoch = grid.scent_epoch
+        if entry.epoch != epoch:
+            if any(grid.is_position_scented(x, y) != scented for x, y, scented in entry.reads):
+                del self.entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            entry = entry._replace(epoch=epoch)
+            self.entries[key] = entry
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key: CacheKey, entry: CacheEntry) -> None:
+        """
+        Add an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Tuple of (max_x, max_y, start_x, start_y, orientation, instructions)
+            entry: Result with the epoch from before the run and its scent log
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        self.entries.clear()
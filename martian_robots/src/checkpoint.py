@@ -0,0 +1,156 @@
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, List, NamedTuple, Tuple
+from .simulator import Simulator
+
+
+# Checkpoint layout (little-endian):
+#   header: magic b'MRCP', u16 version, i64 max_x, i64 max_y,
+#           u64 robots_processed, u64 scent_count, u64 input_offset
+#   body:   scent_count (x, y) pairs as i64
+# Version 1 files have no input_offset; they read back as offset 0.
+MAGIC = b'MRCP'
+VERSION = 2
+_PREFIX = struct.Struct('<4sH')
+_FIELDS = {
+    1: struct.Struct('<qqQQ'),
+    2: struct.Struct('<qqQQQ'),
+}
+
+
+class Checkpoint(NamedTuple):
+    """
+    Contents of a checkpoint file.
+
+    input_offset is the byte offset in the mission text where the last
+    processed robot's instruction line ends (its newline, or the end of a
+    file without a final newline), or 0 when the input could not be addressed by offset
+    (pipes, compressed and binary missions).
+    """
+    max_x: int
+    max_y: int
+    robots_processed: int
+    scents: List[Tuple[int, int]]
+    input_offset: int = 0
+
+
+def write_checkpoint(path: str, max_x: int, max_y: int, robots_processed: int,
+                     scents: Iterable[Tuple[int, int]], input_offset: int = 0) -> None:
+    """
+    Atomically write a checkpoint file.
+
+    The data is written to a temporary file, flushed to disk and then
+    renamed over path, so a crash never leaves a truncated checkpoint.
+
+    Args:
+        path: Destination file
+        max_x: Maximum x-coordinate of the grid
+        max_y: Maximum y-coordinate of the grid
+        robots_processed: Number of robots already simulated
+        scents: Scented positions
+        input_offset: Byte offset in the mission text where the last
+            processed robot's line ends, or 0 if unknown
+    """
+    coordinates = array('q')
+    for x, y in scents:
+        coordinates.append(x)
+        coordinates.append(y)
+    if sys.byteorder != 'little':
+        coordinates.byteswap()
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION))
+        f.write(_FIELDS[VERSION].pack(max_x, max_y, robots_processed, len(coordinates) // 2,
+                                      input_offset))
+        coordinates.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_checkpoint(path: str) -> Checkpoint:
+    """
+    Read a checkpoint file.
+
+    Args:
+        path: Checkpoint file
+
+    Returns:
+        Checkpoint with the saved dimensions, robot count, scents and input offset
+
+    Raises:
+        ValueError: If the file is not a valid checkpoint
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"Truncated checkpoint: {path}")
+        magic, version = _PREFIX.unpack(prefix)
+        if magic != MAGIC or version not in _FIELDS:
+            raise ValueError(f"Not a checkpoint file: {path}")
+        fields = _FIELDS[version]
+        header = f.read(fields.size)
+        if len(header) != fields.size:
+            raise ValueError(f"Truncated checkpoint: {path}")
+        max_x, max_y, robots_processed, count, *input_offset = fields.unpack(header)
+
+        coordinates = array('q')
+        try:
+            coordinates.fromfile(f, 2 * count)
+        except EOFError:
+            raise ValueError(f"Truncated checkpoint: {path}")
+    if sys.byteorder != 'little':
+        coordinates.byteswap()
+
+    scents = list(zip(coordinates[0::2], coordinates[1::2]))
+    return Checkpoint(max_x, max_y, robots_processed, scents, *input_offset)
+
+
+def save_checkpoint(simulator: Simulator, path: str, input_offset: int = 0) -> None:
+    """
+    Save a simulator's grid dimensions, scents and robot count.
+
+    Args:
+        simulator: Simulator to checkpoint
+        path: Destination file
+        input_offset: Byte offset in the mission text where the last
+            processed robot's line ends, or 0 if unknown
+    """
+    grid = simulator.grid
+    write_checkpoint(path, grid.max_x, grid.max_y, simulator.robots_processed,
+                     grid.scented_positions, input_offset)
+
+
+def load_checkpoint(path: str, **simulator_options) -> Simulator:
+    """
+    Restore a simulator from a checkpoint.
+
+    Args:
+        path: Checkpoint file
+        **simulator_options: Extra keyword arguments for Simulator
+
+    Returns:
+        Simulator with the saved scents and robots_processed count
+    """
+    return restore_checkpoint(read_checkpoint(path), **simulator_options)
+
+
+def restore_checkpoint(checkpoint: Checkpoint, **simulator_options) -> Simulator:
+    """
+    Build a simulator from checkpoint contents already read with read_checkpoint.
+
+    Args:
+        checkpoint: Checkpoint contents
+        **simulator_options: Extra keyword arguments for Simulator
+
+    Returns:
+        Simulator with the saved scents and robots_processed count
+    """
+    simulator = Simulator(checkpoint.max_x, checkpoint.max_y, **simulator_options)
+    for x, y in checkpoint.scents:
+        simulator.grid.add_scent(x, y)
+    simulator.robots_processed = checkpoint.robots_processed
+    return simulator
@@ -0,0 +1,290 @@
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+from .parser import RobotData, stream_input
+from .robot import HEADINGS, format_state, heading_from_orientation
+
+
+# File layouts (little-endian)
+# ----------------------------
+# Mission: header magic b'MRMS', u16 version, i64 max_x, i64 max_y,
+#          u64 robot_count, u64 instruction_bytes
+#          then columns i64 x[n], i64 y[n], u8 heading[n] (0=N, 1=E, 2=S, 3=W),
+#          u64 offsets[n + 1] into the instruction blob, and the blob itself
+# Results: header magic b'MRRS', u16 version, u64 robot_count
+#          then columns i64 x[n], i64 y[n], u8 heading[n], u8 lost[n]
+MISSION_MAGIC = b'MRMS'
+RESULTS_MAGIC = b'MRRS'
+VERSION = 1
+_MISSION_HEADER = struct.Struct('<4sHqqQQ')
+_RESULTS_HEADER = struct.Struct('<4sHQ')
+
+
+class MissionColumns(NamedTuple):
+    """A whole mission as typed columns plus one instruction blob."""
+    max_x: int
+    max_y: int
+    xs: array
+    ys: array
+    headings: array
+    offsets: array
+    instructions: bytes
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def robots(self, start: int = 0) -> Iterator[RobotData]:
+        """
+        Yield robots in the tuple form accepted by Simulator.
+
+        Args:
+            start: Index of the first robot to yield
+        """
+        offsets, blob = self.offsets, self.instructions
+        for index in range(start, len(self.xs)):
+            yield (self.xs[index], self.ys[index], HEADINGS[self.headings[index]],
+                   str(blob[offsets[index]:offsets[index + 1]], 'latin-1'))
+
+
+class ResultColumns(NamedTuple):
+    """Final robot states as typed columns."""
+    xs: array
+    ys: array
+    headings: array
+    lost: array
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def append(self, x: int, y: int, heading: int, is_lost: bool) -> None:
+        """Append one final state."""
+        self.xs.append(x)
+        self.ys.append(y)
+        self.headings.append(heading)
+        self.lost.append(is_lost)
+
+
+def empty_results() -> ResultColumns:
+    """Return an empty set of result columns."""
+    return ResultColumns(array('q'), array('q'), array('B'), array('B'))
+
+
+def write_mission(stream: BinaryIO, mission: MissionColumns) -> None:
+    """
+    Write a mission in the binary columnar format.
+
+    Args:
+        stream: Binary stream to write to
+        mission: Mission columns
+    """
+    stream.write(_MISSION_HEADER.pack(MISSION_MAGIC, VERSION, mission.max_x, mission.max_y,
+                                      len(mission), len(mission.instructions)))
+    for column in (mission.xs, mission.ys, mission.headings, mission.offsets):
+        _write_column(stream, column)
+    stream.write(mission.instructions)
+
+
+def read_mission(stream: BinaryIO) -> MissionColumns:
+    """
+    Read a mission written by write_mission.
+
+    Args:
+        stream: Binary stream to read from
+
+    Returns:
+        Mission columns
+
+    Raises:
+        ValueError: If the data is not a valid mission file
+    """
+    header = stream.read(_MISSION_HEADER.size)
+    if len(header) != _MISSION_HEADER.size:
+        raise ValueError("Truncated binary mission")
+    magic, version, max_x, max_y, count, blob_size = _MISSION_HEADER.unpack(header)
+    if magic != MISSION_MAGIC or version != VERSION:
+        raise ValueError("Not a binary mission file")
+
+    xs = _read_column(stream, 'q', count)
+    ys = _read_column(stream, 'q', count)
+    headings = _read_column(stream, 'B', count)
+    offsets = _read_column(stream, 'Q', count + 1)
+    instructions = stream.read(blob_size)
+    if len(instructions) != blob_size:
+        raise ValueError("Truncated binary mission")
+    if offsets[0] != 0 or offsets[-1] != blob_size or any(h > 3 for h in headings):
+        raise ValueError("Corrupt binary mission")
+    return MissionColumns(max_x, max_y, xs, ys, headings, offsets, instructions)
+
+
+def write_results(stream: BinaryIO, results: ResultColumns) -> None:
+    """
+    Write results in the binary columnar format.
+
+    Args:
+        stream: Binary stream to write to
+        results: Result columns
+    """
+    stream.write(_RESULTS_HEADER.pack(RESULTS_MAGIC, VERSION, len(results)))
+    for column in results:
+        _write_column(stream, column)
+
+
+def read_results(stream: BinaryIO) -> ResultColumns:
+    """
+    Read results written by write_results.
+
+    Args:
+        stream: Binary stream to read from
+
+    Returns:
+        Result columns
+
+    Raises:
+        ValueError: If the data is not a valid results file
+    """
+    header = stream.read(_RESULTS_HEADER.size)
+    if len(header) != _RESULTS_HEADER.size:
+        raise ValueError("Truncated binary results")
+    magic, version, count = _RESULTS_HEADER.unpack(header)
+    if magic != RESULTS_MAGIC or version != VERSION:
+        raise ValueError("Not a binary results file")
+    return ResultColumns(*(_read_column(stream, typecode, count) for typecode in 'qqBB'))
+
+
+def mission_from_text(lines: Iterable[str]) -> MissionColumns:
+    """
+    Convert a text mission into columns.
+
+    Args:
+        lines: Mission lines in the stdin format
+
+    Returns:
+        Mission columns
+    """
+    max_x, max_y, robot_data = stream_input(lines)
+    xs, ys, headings, offsets = array('q'), array('q'), array('B'), array('Q', [0])
+    blob = bytearray()
+    for x, y, orientation, instructions in robot_data:
+        xs.append(x)
+        ys.append(y)
+        headings.append(heading_from_orientation(orientation))
+        blob += instructions.encode('latin-1', 'replace')
+        offsets.append(len(blob))
+    return MissionColumns(max_x, max_y, xs, ys, headings, offsets, bytes(blob))
+
+
+def mission_to_text(mission: MissionColumns) -> Iterator[str]:
+    """
+    Convert mission columns back into text lines (without newlines).
+
+    Args:
+        mission: Mission columns
+
+    Yields:
+        The grid line, then a position line and an instruction line per robot
+    """
+    yield f"{mission.max_x} {mission.max_y}"
+    for x, y, orientation, instructions in mission.robots():
+        yield f"{x} {y} {orientation}"
+        yield instructions
+
+
+def results_from_text(lines: Iterable[str]) -> ResultColumns:
+    """
+    Convert result lines such as "3 3 N LOST" into columns.
+
+    Args:
+        lines: Result lines
+
+    Returns:
+        Result columns
+
+    Raises:
+        ValueError: If a line is not a valid result
+    """
+    results = empty_results()
+    for line in lines:
+        fields = line.split()
+        try:
+            x, y, orientation = fields[:3]
+            if fields[3:] not in ([], ['LOST']):
+                raise ValueError
+            results.append(int(x), int(y), heading_from_orientation(orientation), len(fields) == 4)
+        except ValueError:
+            raise ValueError(f"Invalid result line: {line.rstrip()!r}")
+    return results
+
+
+def results_to_text(results: ResultColumns) -> Iterator[str]:
+    """
+    Format result columns as text lines, exactly like Robot.__str__.
+
+    Args:
+        results: Result columns
+
+    Yields:
+        One result line per robot
+    """
+    for state in zip(*results):
+        yield format_state(*state)
+
+
+def convert_file(source: str, destination: str) -> str:
+    """
+    Convert a mission or results file between the text and binary formats.
+
+    The direction is detected from the source: binary files are recognised
+    by their magic bytes and written out as text, anything else is read as
+    text and written out as binary. Text results are told apart from text
+    missions by their first line, which has three or four fields.
+
+    Args:
+        source: File to convert
+        destination: File to write
+
+    Returns:
+        Description of the conversion, e.g. "binary mission -> text"
+    """
+    with open(source, 'rb') as f:
+        magic = f.read(len(MISSION_MAGIC))
+        f.seek(0)
+        if magic == MISSION_MAGIC:
+            lines, kind = mission_to_text(read_mission(f)), "binary mission -> text"
+        elif magic == RESULTS_MAGIC:
+            lines, kind = results_to_text(read_results(f)), "binary results -> text"
+        else:
+            text = f.read().decode('latin-1').splitlines()
+            if text and len(text[0].split()) in (3, 4):
+                data, kind = results_from_text(text), "text results -> binary"
+                writer = write_results
+            else:
+                data, kind = mission_from_text(text), "text mission -> binary"
+                writer = write_mission
+            with open(destination, 'wb') as out:
+                writer(out, data)
+            return kind
+
+        with open(destination, 'w') as out:
+            out.writelines(line + "\n" for line in lines)
+    return kind
+
+
+def _write_column(stream: BinaryIO, column: array) -> None:
+    """Write an array column in little-endian byte order."""
+    if sys.byteorder != 'little' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    stream.write(column.tobytes())
+
+
+def _read_column(stream: BinaryIO, typecode: str, count: int) -> array:
+    """Read count little-endian items into an array."""
+    column = array(typecode)
+    data = stream.read(count * column.itemsize)
+    if len(data) != count * column.itemsize:
+        raise ValueError("Truncated binary column data")
+    column.frombytes(data)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
@@ -0,0 +1,211 @@
+import bz2
+import codecs
+import gzip
+import lzma
+import queue
+import threading
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+
+# Magic bytes opening each supported compressed stream
+MAGIC_BYTES = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+}
+COMPRESSIONS = tuple(MAGIC_BYTES)
+
+# Decompressed bytes per read, and how many chunks the reader thread may
+# run ahead of the parser
+CHUNK_SIZE = 1 << 20
+READ_AHEAD = 8
+
+# zlib's default level; gzip's own default (9) is several times slower for
+# a few percent smaller output
+GZIP_LEVEL = 6
+
+
+def detect_compression(prefix: bytes) -> Optional[str]:
+    """
+    Identify a compressed stream from its first bytes.
+
+    Args:
+        prefix: Leading bytes of the stream (six are enough)
+
+    Returns:
+        Name from COMPRESSIONS, or None for uncompressed data
+    """
+    for compression, magic in MAGIC_BYTES.items():
+        if prefix.startswith(magic):
+            return compression
+    return None
+
+
+def sniff_compression(stream: BinaryIO) -> Optional[str]:
+    """
+    Detect the compression of a buffered binary stream without consuming it.
+
+    Args:
+        stream: Stream supporting peek(), such as an open 'rb' file or
+            sys.stdin.buffer
+
+    Returns:
+        Name from COMPRESSIONS, or None for uncompressed data
+    """
+    return detect_compression(stream.peek(6)[:6])
+
+
+def file_compression(path: str) -> Optional[str]:
+    """Detect the compression of a file from its magic bytes."""
+    with open(path, 'rb') as f:
+        return detect_compression(f.read(6))
+
+
+def open_compressed(stream: BinaryIO, compression: str, mode: str = 'rb') -> BinaryIO:
+    """
+    Wrap a binary stream in a streaming (de)compressor.
+
+    Closing the returned stream finishes the compressed data but leaves
+    the wrapped stream open.
+
+    Args:
+        stream: Underlying binary stream
+        compression: Name from COMPRESSIONS
+        mode: 'rb' to decompress or 'wb' to compress
+
+    Returns:
+        Binary stream reading or writing uncompressed bytes
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode=mode, compresslevel=GZIP_LEVEL)
+    if compression == 'bz2':
+        return bz2.BZ2File(stream, mode)
+    if compression == 'xz':
+        return lzma.LZMAFile(stream, mode)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def decompressed(stream: BinaryIO) -> BinaryIO:
+    """
+    Return a stream of the uncompressed bytes of a possibly compressed stream.
+
+    Args:
+        stream: Buffered binary stream (see sniff_compression)
+
+    Returns:
+        The stream itself, or a decompressor reading from it
+    """
+    compression = sniff_compression(stream)
+    return stream if compression is None else open_compressed(stream, compression)
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                read_ahead: int = READ_AHEAD) -> Iterator[bytes]:
+    """
+    Read a stream in large chunks on a background thread.
+
+    zlib, bz2 and lzma release the GIL while they work, so decompression
+    overlaps with whatever the consumer does with the previous chunks.
+    At most read_ahead chunks are buffered. Errors raised by the reader
+    are re-raised here.
+
+    Args:
+        stream: Binary stream to read
+        chunk_size: Bytes per read
+        read_ahead: Maximum number of chunks buffered ahead of the consumer
+
+    Yields:
+        Non-empty chunks, in order
+    """
+    chunks: 'queue.Queue[object]' = queue.Queue(maxsize=read_ahead)
+    stop = threading.Event()
+    # read1 returns what one underlying read produced, so a slow pipe does
+    # not hold back data that has already arrived
+    read = getattr(stream, 'read1', stream.read)
+
+    def put(item: object) -> None:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def reader() -> None:
+        try:
+            while not stop.is_set():
+                chunk = read(chunk_size)
+                put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            put(e)
+
+    thread = threading.Thread(target=reader, name='mission-reader', daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        # Let an abandoned reader finish its current read before the
+        # stream can be closed under it
+        stop.set()
+        thread.join()
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = 'latin-1') -> Iterator[str]:
+    """
+    Split byte chunks into text lines without their line endings.
+
+    Args:
+        chunks: Byte chunks, in order
+        encoding: Text encoding; latin-1 by default, like the memory-mapped
+            and columnar readers, so any byte decodes
+
+    Yields:
+        Lines as strings
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split('\n')
+        pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def read_lines(source: Union[str, BinaryIO], chunk_size: int = CHUNK_SIZE,
+               read_ahead: int = READ_AHEAD) -> Iterator[str]:
+    """
+    Stream the text lines of a file or binary stream, decompressing transparently.
+
+    gzip, bz2 and xz input is detected from its magic bytes. Reading and
+    decompression run on a background thread (see iter_chunks).
+
+    Args:
+        source: File path, or a buffered binary stream such as sys.stdin.buffer
+        chunk_size: Uncompressed bytes per read
+        read_ahead: Maximum number of chunks buffered ahead of the consumer
+
+    Yields:
+        Lines as strings, without line endings
+    """
+    owned = open(source, 'rb') if isinstance(source, str) else None
+    stream = decompressed(owned if owned is not None else source)
+    chunks = iter_chunks(stream, chunk_size, read_ahead)
+    try:
+        yield from iter_lines(chunks)
+    finally:
+        chunks.close()
+        if stream is not owned and stream is not source:
+            stream.close()
+        if owned is not None:
+            owned.close()
+
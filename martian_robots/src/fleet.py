@@ -0,0 +1,166 @@
+from typing import Iterable, List, Tuple
+from .grid import Grid
+from .robot import DX, DY, HEADINGS, format_state
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# Instruction codes used in the instruction matrix; 0 pads short strings
+# and also stands for any invalid instruction character.
+NOOP, LEFT, RIGHT, FORWARD = 0, 1, 2, 3
+
+
+class Fleet:
+    """
+    Lockstep simulation of a whole fleet of robots.
+
+    Unlike Simulator.process_multiple_robots, which runs robots one after
+    another, every robot executes its i-th instruction on tick i. Robot
+    state is held in NumPy arrays so each tick is a handful of vectorized
+    operations regardless of the fleet size.
+
+    When several robots leave the grid on the same tick they are resolved
+    in input order: the first one to reach an unscented cell is lost and
+    leaves a scent, and any later robot leaving through the same cell on
+    that tick has its move ignored.
+    """
+
+    def __init__(self, grid: Grid, robot_data: Iterable[Tuple[int, int, str, str]]):
+        """
+        Initialize the fleet state arrays.
+
+        Args:
+            grid: Grid shared by all robots (scents are read and written here)
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+        """
+        if np is None:
+            raise ImportError("The lockstep fleet engine requires numpy")
+
+        robot_data = list(robot_data)
+        self.grid = grid
+        self.x = np.array([robot[0] for robot in robot_data], dtype=np.int64)
+        self.y = np.array([robot[1] for robot in robot_data], dtype=np.int64)
+        self.heading = _parse_headings([robot[2] for robot in robot_data])
+        self.lost = np.zeros(len(robot_data), dtype=bool)
+        self.instructions = _instruction_matrix([robot[3] for robot in robot_data])
+        self.tick = 0
+
+    def __len__(self) -> int:
+        """Number of robots in the fleet."""
+        return len(self.lost)
+
+    def step(self) -> bool:
+        """
+        Execute one tick for every robot that is still active.
+
+        Returns:
+            True if there are further ticks to run, False otherwise
+        """
+        if self.tick >= self.instructions.shape[1]:
+            return False
+
+        codes = self.instructions[:, self.tick]
+        self.tick += 1
+        active = ~self.lost
+
+        # Turns: left adds 3 (mod 4), right adds 1
+        turns = _TURN_TABLE[codes] * active
+        self.heading = (self.heading + turns) & 3
+
+        forward = (codes == FORWARD) & active
+        if forward.any():
+            self._move(forward)
+
+        return self.tick < self.instructions.shape[1] and not self.lost.all()
+
+    def run(self) -> List[str]:
+        """
+        Run ticks until every robot has finished or is lost.
+
+        Returns:
+            Final state of each robot, in input order
+        """
+        while self.step():
+            pass
+        return self.results()
+
+    def results(self) -> List[str]:
+        """
+        Format the current fleet state.
+
+        Returns:
+            String representation of each robot's state, in input order
+        """
+        return [
+            format_state(x, y, heading, lost)
+            for x, y, heading, lost in zip(self.x.tolist(), self.y.tolist(),
+                                           self.heading.tolist(), self.lost.tolist())
+        ]
+
+    def _move(self, forward) -> None:
+        """
+        Apply forward moves for the robots selected by the forward mask.
+
+        Args:
+            forward: Boolean array of robots executing an F this tick
+        """
+        grid = self.grid
+        next_x = self.x + _DX[self.heading] * forward
+        next_y = self.y + _DY[self.heading] * forward
+        outside = forward & ((next_x < 0) | (next_x > grid.max_x) |
+                             (next_y < 0) | (next_y > grid.max_y))
+
+        inside = forward & ~outside
+        self.x = np.where(inside, next_x, self.x)
+        self.y = np.where(inside, next_y, self.y)
+
+        # Loss events are rare; resolve them in input order so scents
+        # written by lower-indexed robots are seen by later ones
+        for index in np.flatnonzero(outside).tolist():
+            cell_x, cell_y = int(next_x[index]), int(next_y[index])
+            if grid.is_position_scented(cell_x, cell_y):
+                continue
+            self.lost[index] = True
+            grid.add_scent(cell_x, cell_y)
+
+
+def _parse_headings(orientations: List[str]):
+    """Convert orientation letters into an array of heading codes."""
+    letters = ''.join(orientations)
+    if len(letters) != len(orientations):
+        invalid = next(o for o in orientations if len(o) != 1)
+        raise ValueError(f"{invalid!r} is not a valid Orientation")
+
+    codes = _HEADING_TABLE[np.frombuffer(letters.encode('latin-1', 'replace'), dtype=np.uint8)]
+    if (codes > 3).any():
+        invalid = orientations[int(np.argmax(codes > 3))]
+        raise ValueError(f"{invalid!r} is not a valid Orientation")
+    return codes
+
+
+def _instruction_matrix(instructions: List[str]):
+    """Build an (n_robots, max_length) matrix of instruction codes."""
+    width = max((len(program) for program in instructions), default=0)
+    raw = b''.join(program.encode('latin-1', 'replace').ljust(width, b'\0')
+                   for program in instructions)
+    codes = _INSTRUCTION_TABLE[np.frombuffer(raw, dtype=np.uint8)]
+    # Column-major so each tick reads one contiguous column
+    return np.asfortranarray(codes.reshape(len(instructions), width))
+
+
+if np is not None:
+    _DX = np.array(DX, dtype=np.int64)
+    _DY = np.array(DY, dtype=np.int64)
+    _TURN_TABLE = np.array([0, 3, 1, 0], dtype=np.uint8)
+
+    _INSTRUCTION_TABLE = np.zeros(256, dtype=np.uint8)
+    _INSTRUCTION_TABLE[ord('L')] = LEFT
+    _INSTRUCTION_TABLE[ord('R')] = RIGHT
+    _INSTRUCTION_TABLE[ord('F')] = FORWARD
+
+    _HEADING_TABLE = np.full(256, 255, dtype=np.uint8)
+    for _code, _letter in enumerate(HEADINGS):
+        _HEADING_TABLE[ord(_letter)] = _code
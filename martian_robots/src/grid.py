@@ -1,4 +1,24 @@
-from typing import Set, Tuple
+import copy
+import threading
+from itertools import count
+from typing import List, Optional, Tuple
+from .occupancy import COLLISION_POLICIES, OCCUPANCY_INDEXES
+from .scents import SCENT_STORES, ConcurrentScentStore, LayeredScentStore
+from .terrain import Terrain
+
+
+# Source of scent epochs. Epochs are unique across all grids, so a grid and
+# its forks never share an epoch number once their scents differ. The lock
+# keeps the counter atomic on free-threaded builds; it is only taken when
+# a grid is created or gains a scent.
+_EPOCHS = count()
+_EPOCH_LOCK = threading.Lock()
+
+
+def _next_epoch() -> int:
+    """Return a scent epoch no grid has used before."""
+    with _EPOCH_LOCK:
+        return next(_EPOCHS)
 
 
 class Grid:
@@ -9,17 +29,50 @@ class Grid:
     (scented positions) to prevent future robots from falling off at the same point.
     """
     
-    def __init__(self, max_x: int, max_y: int):
+    def __init__(self, max_x: int, max_y: int, scent_store: str = 'set',
+                 occupancy: Optional[str] = None, collision_policy: str = 'ignore',
+                 terrain: Optional[Terrain] = None, terrain_policy: str = 'ignore'):
         """
         Initialize the grid with maximum coordinates.
         
         Args:
             max_x: Maximum x-coordinate (upper-right corner)
             max_y: Maximum y-coordinate (upper-right corner)
+            scent_store: Name of the scent store in SCENT_STORES; 'perimeter'
+                keeps scents in compact edge bitmaps for very large grids,
+                'concurrent' lets other threads read and add scents safely
+            occupancy: Name of an occupancy index in OCCUPANCY_INDEXES to
+                enable collisions with parked robots ('hash' for sparse
+                fleets, 'bitmap' for dense ones); None disables collisions
+            collision_policy: What a blocked F does, one of COLLISION_POLICIES
+            terrain: Optional obstacle layer with the grid's dimensions
+            terrain_policy: What an F into an obstacle does, one of
+                COLLISION_POLICIES
         """
+        if scent_store not in SCENT_STORES:
+            raise ValueError(f"Unknown scent store: {scent_store}")
+        if occupancy is not None and occupancy not in OCCUPANCY_INDEXES:
+            raise ValueError(f"Unknown occupancy index: {occupancy}")
+        if collision_policy not in COLLISION_POLICIES:
+            raise ValueError(f"Unknown collision policy: {collision_policy}")
+        if terrain_policy not in COLLISION_POLICIES:
+            raise ValueError(f"Unknown terrain policy: {terrain_policy}")
+        if terrain is not None and (terrain.max_x, terrain.max_y) != (max_x, max_y):
+            raise ValueError("Terrain dimensions do not match the grid")
         self.max_x = max_x
         self.max_y = max_y
-        self.scented_positions: Set[Tuple[int, int]] = set()
+        self.scented_positions = SCENT_STORES[scent_store](max_x, max_y)
+        # Replaced by a fresh, globally unique value whenever a new scent appears
+        self.scent_epoch = _next_epoch()
+        self.occupancy = OCCUPANCY_INDEXES[occupancy](max_x, max_y) if occupancy else None
+        self.collision_policy = collision_policy
+        self.terrain = terrain
+        self.terrain_policy = terrain_policy
+    
+    @property
+    def has_obstacles(self) -> bool:
+        """Whether parked robots or terrain can block forward moves."""
+        return self.occupancy is not None or self.terrain is not None
     
     def is_within_bounds(self, x: int, y: int) -> bool:
         """
@@ -58,7 +111,7 @@ class Grid:
         Returns:
             True if the position is scented, False otherwise
         """
-        return (x, y) in self.scented_positions
+        return self.scented_positions.is_scented(x, y)
     
     def add_scent(self, x: int, y: int) -> None:
         """
@@ -68,7 +121,91 @@ class Grid:
             x: X-coordinate of the scented position
             y: Y-coordinate of the scented position
         """
-        self.scented_positions.add((x, y))
+        if not self.scented_positions.is_scented(x, y):
+            self.scented_positions.add_scent(x, y)
+            self.scent_epoch = _next_epoch()
+    
+    def is_occupied(self, x: int, y: int) -> bool:
+        """
+        Check if a parked robot occupies a position.
+        
+        Args:
+            x: X-coordinate to check
+            y: Y-coordinate to check
+            
+        Returns:
+            True if collisions are enabled and the in-bounds position is occupied
+        """
+        return (self.occupancy is not None and self.is_within_bounds(x, y)
+                and self.occupancy.is_occupied(x, y))
+    
+    def is_blocked(self, x: int, y: int) -> bool:
+        """
+        Check if the terrain has an obstacle at a position.
+        
+        Args:
+            x: X-coordinate to check
+            y: Y-coordinate to check
+            
+        Returns:
+            True if terrain is loaded and the in-bounds position is blocked
+        """
+        return (self.terrain is not None and self.is_within_bounds(x, y)
+                and self.terrain.is_blocked(x, y))
+    
+    def park(self, x: int, y: int) -> None:
+        """
+        Record a robot that finished its instructions at a position.
+        
+        Robots parked off the grid (they started there) are not indexed,
+        since no other robot can move onto such a cell without being lost.
+        
+        Args:
+            x: X-coordinate of the parked robot
+            y: Y-coordinate of the parked robot
+        """
+        if self.occupancy is not None and self.is_within_bounds(x, y):
+            self.occupancy.occupy(x, y)
+    
+    def fork(self) -> 'Grid':
+        """
+        Return an independent copy of the grid in O(1).
+        
+        The first fork moves the existing scent store, without copying it,
+        under a LayeredScentStore. From then on the grid and each fork
+        share frozen scent layers and record their new scents separately,
+        in layers of the original store's class, so a 'perimeter' grid
+        keeps its compact bitmaps.
+        A 'concurrent' store may be in use by other threads and cannot be
+        frozen in place, so it is copied instead.
+        
+        Returns:
+            Grid with the same bounds and scents
+            
+        Raises:
+            ValueError: If collision mode is enabled
+        """
+        if self.occupancy is not None:
+            raise ValueError("Grids in collision mode cannot be forked")
+        store = self.scented_positions
+        if isinstance(store, ConcurrentScentStore):
+            forked = copy.copy(self)
+            forked.scented_positions = store.copy()
+            return forked
+        if not isinstance(store, LayeredScentStore):
+            store = self.scented_positions = LayeredScentStore.on_top_of(store, self.max_x, self.max_y)
+        forked = copy.copy(self)
+        forked.scented_positions = store.fork()
+        return forked
+    
+    def scent_memory_usage(self) -> int:
+        """
+        Report the approximate memory used by the scent store.
+        
+        Returns:
+            Size of the scent store in bytes
+        """
+        return self.scented_positions.nbytes()
     
     def can_move_to_position(self, x: int, y: int) -> bool:
         """
@@ -87,4 +224,59 @@ class Grid:
             return True
         else:
             # If the position is outside bounds, check if it's scented
-            return self.is_position_scented(x, y) 
\ No newline at end of file
+            return self.is_position_scented(x, y) 
+
+class RecordingGrid(Grid):
+    """
+    A view of a Grid that records every scent read and write.
+    
+    Scent lookups and additions are forwarded to the wrapped grid's scent
+    store while being logged, so callers can later check whether a
+    simulation depended on a scent that has since changed.
+    """
+    
+    def __init__(self, grid: Grid):
+        """
+        Wrap an existing grid.
+        
+        Args:
+            grid: Grid whose bounds and scent store are shared
+        """
+        self.grid = grid
+        self.max_x = grid.max_x
+        self.max_y = grid.max_y
+        self.scented_positions = grid.scented_positions
+        self.occupancy = grid.occupancy
+        self.collision_policy = grid.collision_policy
+        self.terrain = grid.terrain
+        self.terrain_policy = grid.terrain_policy
+        self.reads: List[Tuple[int, int, bool]] = []
+        self.writes: List[Tuple[int, int]] = []
+    
+    @property
+    def scent_epoch(self) -> int:
+        """Scent epoch of the wrapped grid."""
+        return self.grid.scent_epoch
+    
+    def is_position_scented(self, x: int, y: int) -> bool:
+        """Check a scent through the wrapped grid and record the outcome."""
+        scented = self.grid.is_position_scented(x, y)
+        self.reads.append((x, y, scented))
+        return scented
+    
+    def add_scent(self, x: int, y: int) -> None:
+        """Add a scent through the wrapped grid and record it."""
+        self.grid.add_scent(x, y)
+        self.writes.append((x, y))
+    
+    def take_log(self) -> Tuple[Tuple[Tuple[int, int, bool], ...], Tuple[Tuple[int, int], ...]]:
+        """
+        Return and clear the recorded accesses.
+        
+        Returns:
+            Tuple of (reads, writes); reads are (x, y, was_scented) triples
+        """
+        log = (tuple(self.reads), tuple(self.writes))
+        self.reads.clear()
+        self.writes.clear()
+        return log
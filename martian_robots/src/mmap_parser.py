@@ -0,0 +1,219 @@
+import mmap
+from contextlib import nullcontext
+from array import array
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+from .parser import RobotData, parse_grid_dimensions
+from .robot import HEADINGS, heading_from_orientation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# Bytes scanned per pass when locating line boundaries
+WINDOW_SIZE = 1 << 24
+
+_WHITESPACE = b' \t\r\n\x0b\x0c'
+
+
+class MissionBatch(NamedTuple):
+    """
+    A run of consecutive robots parsed from a mapped mission file.
+
+    Positions are typed arrays; instructions are memoryview slices of the
+    mapping, so no instruction bytes are copied until a robot is run.
+    """
+    first_robot: int
+    xs: array
+    ys: array
+    headings: array
+    instructions: List[memoryview]
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def robots(self) -> Iterator[RobotData]:
+        """
+        Yield the robots in the tuple form accepted by Simulator.
+
+        Each instruction string is decoded only when its robot is reached.
+        """
+        for x, y, heading, instructions in zip(self.xs, self.ys, self.headings, self.instructions):
+            yield x, y, HEADINGS[heading], str(instructions, 'latin-1')
+
+
+class MappedMission:
+    """
+    Bulk parser for multi-gigabyte mission files.
+
+    The file is memory-mapped and scanned as bytes: line boundaries are
+    located a window at a time (with NumPy when available, otherwise with
+    bytes.find), positions are parsed into array('q') columns and
+    instruction lines stay as memoryview slices of the mapping. Errors use
+    the same messages and line numbers as parse_input.
+
+    Batches hold views of the mapping, so release them before close().
+    offset tracks where the last parsed robot's instruction line ends (its
+    newline, or the end of a file without one); a checkpoint can store it
+    so a resumed run seeks straight to the new robots, even after an
+    append to a file that lacked a final newline.
+    """
+
+    def __init__(self, source: Union[str, BinaryIO]):
+        """
+        Map a mission file and parse its grid dimensions.
+
+        Args:
+            source: Mission file in the stdin text format, as a path or an
+                open regular file (such as a redirected sys.stdin.buffer)
+        """
+        with open(source, 'rb') if isinstance(source, str) else nullcontext(source) as f:
+            try:
+                self._map: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self._map = None
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b'')
+
+        self._lines = self._line_spans()
+        header = next(self._lines, None)
+        if header is None:
+            raise ValueError("No input provided")
+        self.max_x, self.max_y = parse_grid_dimensions(str(self._view[header[0]:header[1]], 'latin-1'))
+        self.offset = header[1]
+
+    def iter_batches(self, batch_size: int = 65536, skip_robots: int = 0,
+                     offset: int = 0) -> Iterator[MissionBatch]:
+        """
+        Parse the remaining robots in batches.
+
+        Args:
+            batch_size: Maximum robots per batch
+            skip_robots: Number of leading robots to skip without parsing
+            offset: Byte offset where the last skipped robot's line ends, as
+                saved in a checkpoint; when given, the skipped lines are not
+                scanned at all
+
+        Yields:
+            MissionBatch objects in input order
+
+        Raises:
+            ValueError: If the input is shorter than the skipped robots, or
+                offset does not fall on a line boundary
+        """
+        view = self._view
+        if offset and skip_robots:
+            if offset > len(view) or (offset < len(view) and view[offset] != 10) \
+                    or offset < self.offset:
+                raise ValueError(f"Checkpoint offset {offset} does not match the input "
+                                 f"after {skip_robots} robots")
+            self._lines.close()
+            self._lines = self._line_spans(min(offset + 1, len(view)))
+            self.offset = offset
+        elif offset:
+            raise ValueError("A checkpoint offset requires the robot count it was saved with")
+        else:
+            for _ in range(2 * skip_robots):
+                span = next(self._lines, None)
+                if span is None:
+                    raise ValueError(f"Input has fewer than {skip_robots} robots to skip")
+                self.offset = span[1]
+        lines = self._lines
+
+        robot = skip_robots
+        while True:
+            xs, ys, headings, instructions = array('q'), array('q'), array('B'), []
+            first_robot = robot
+            for position in lines:
+                line_number = 2 + 2 * robot
+                instruction_line = next(lines, None)
+                if instruction_line is None:
+                    raise ValueError("Incomplete robot data")
+
+                try:
+                    x, y, orientation = bytes(view[position[0]:position[1]]).split()
+                    xs.append(int(x))
+                    ys.append(int(y))
+                except ValueError:
+                    raise ValueError(f"Invalid robot position format at line {line_number}")
+                headings.append(heading_from_orientation(orientation.decode('latin-1')))
+                instructions.append(view[_strip(view, *instruction_line)])
+                end = instruction_line[1]
+
+                robot += 1
+                if robot - first_robot >= batch_size:
+                    break
+
+            if not xs:
+                return
+            self.offset = end
+            yield MissionBatch(first_robot, xs, ys, headings, instructions)
+
+    def load(self) -> MissionBatch:
+        """
+        Parse every remaining robot into a single batch.
+
+        Returns:
+            MissionBatch covering the rest of the file
+        """
+        batches = list(self.iter_batches(batch_size=1 << 62))
+        if not batches:
+            return MissionBatch(0, array('q'), array('q'), array('B'), [])
+        return batches[0]
+
+    def robots(self, skip_robots: int = 0, offset: int = 0) -> Iterator[RobotData]:
+        """
+        Yield the remaining robots one at a time for Simulator.iter_results.
+
+        Args:
+            skip_robots: Number of leading robots to skip without parsing
+            offset: Byte offset where the skipped robots end (see iter_batches)
+        """
+        for batch in self.iter_batches(skip_robots=skip_robots, offset=offset):
+            yield from batch.robots()
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._lines.close()
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+
+    def __enter__(self) -> 'MappedMission':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _line_spans(self, start: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of each line from byte start, excluding the newline."""
+        size = len(self._view)
+        for window_start in range(start, size, WINDOW_SIZE):
+            for newline in _newlines(self._map, window_start, min(window_start + WINDOW_SIZE, size)):
+                yield start, newline
+                start = newline + 1
+        if start < size:
+            yield start, size
+
+
+def _newlines(data: mmap.mmap, start: int, end: int) -> Iterator[int]:
+    """Yield offsets of newline bytes in data[start:end]."""
+    if np is not None:
+        window = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+        yield from (np.flatnonzero(window == 10) + start).tolist()
+        return
+
+    position = data.find(b'\n', start, end)
+    while position != -1:
+        yield position
+        position = data.find(b'\n', position + 1, end)
+
+
+def _strip(view: memoryview, start: int, end: int) -> slice:
+    """Return the slice of view[start:end] without surrounding whitespace."""
+    while start < end and view[start] in _WHITESPACE:
+        start += 1
+    while end > start and view[end - 1] in _WHITESPACE:
+        end -= 1
+    return slice(start, end)
@@ -0,0 +1,94 @@
+import sys
+
+
+class HashOccupancy:
+    """
+    Occupancy index for sparse fleets: a set of packed cell ids.
+
+    Each in-bounds cell (x, y) is stored as the int x * (max_y + 1) + y, so
+    a lookup hashes one int and never builds a tuple. Memory grows with the
+    number of parked robots, not with the grid size.
+    """
+
+    def __init__(self, max_x: int, max_y: int):
+        """
+        Initialize an empty index for a grid.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+        """
+        self.max_x = max_x
+        self.max_y = max_y
+        self._height = max_y + 1
+        self._cells = set()
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        """Check whether a parked robot occupies an in-bounds cell."""
+        return x * self._height + y in self._cells
+
+    def occupy(self, x: int, y: int) -> None:
+        """Mark an in-bounds cell as occupied."""
+        self._cells.add(x * self._height + y)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the set and its ids."""
+        return sys.getsizeof(self._cells) + sum(sys.getsizeof(cell) for cell in self._cells)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+
+class BitmapOccupancy:
+    """
+    Occupancy index for dense fleets: one bit per grid cell.
+
+    The bitmap is allocated up front ((max_x + 1) * (max_y + 1) / 8 bytes),
+    which beats a hash set once more than about one cell in 500 is
+    occupied. Lookups are a shift and a mask.
+    """
+
+    def __init__(self, max_x: int, max_y: int):
+        """
+        Initialize an empty bitmap for a grid.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+        """
+        self.max_x = max_x
+        self.max_y = max_y
+        self._height = max_y + 1
+        self._bits = bytearray(((max_x + 1) * self._height + 7) >> 3)
+        self._count = 0
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        """Check whether a parked robot occupies an in-bounds cell."""
+        cell = x * self._height + y
+        return self._bits[cell >> 3] >> (cell & 7) & 1 == 1
+
+    def occupy(self, x: int, y: int) -> None:
+        """Mark an in-bounds cell as occupied."""
+        cell = x * self._height + y
+        mask = 1 << (cell & 7)
+        if not self._bits[cell >> 3] & mask:
+            self._bits[cell >> 3] |= mask
+            self._count += 1
+
+    def nbytes(self) -> int:
+        """Memory used by the bitmap."""
+        return sys.getsizeof(self._bits)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+# Occupancy index implementations selectable by name from Grid
+OCCUPANCY_INDEXES = {
+    'hash': HashOccupancy,
+    'bitmap': BitmapOccupancy,
+}
+
+# What a robot does when its next F would enter an occupied cell:
+# "ignore" skips that instruction, "stop" ends the robot's run where it is
+COLLISION_POLICIES = ('ignore', 'stop')
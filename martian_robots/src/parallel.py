@@ -0,0 +1,161 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import AbstractSet, Iterable, Iterator, List, Optional, Tuple
+from .grid import RecordingGrid
+from .scents import ConcurrentScentStore, LayeredScentStore
+from .simulator import Simulator
+from .threaded import EXECUTORS, make_executor
+
+
+RobotData = Tuple[int, int, str, str]
+ScentLog = Tuple[Tuple[Tuple[int, int, bool], ...], Tuple[Tuple[int, int], ...]]
+
+
+def _simulate_chunk(max_x: int, max_y: int, engine: str,
+                    snapshot: AbstractSet[Tuple[int, int]],
+                    robots: List[RobotData]) -> List[Tuple[str, ScentLog]]:
+    """
+    Simulate a chunk of robots against a snapshot of the scent set.
+
+    Robots within the chunk run sequentially, so they see each other's
+    scents; scents committed by earlier chunks after the snapshot was
+    taken may be invisible here and are caught by the commit phase.
+
+    Args:
+        max_x: Maximum x-coordinate of the grid
+        max_y: Maximum y-coordinate of the grid
+        engine: Simulator engine to use
+        snapshot: Scented positions at submission time, or in a worker
+            thread the live ConcurrentScentStore of the committed grid
+        robots: Robots to simulate, in input order
+
+    Returns:
+        List of (result, (reads, writes)) per robot
+    """
+    simulator = Simulator(max_x, max_y, engine=engine)
+    if isinstance(snapshot, ConcurrentScentStore):
+        # Read the committed scents in place and keep this chunk's own
+        # scents private; the committer only ever adds scents
+        simulator.grid.scented_positions = LayeredScentStore.on_top_of(snapshot, max_x, max_y)
+    else:
+        for x, y in snapshot:
+            simulator.grid.add_scent(x, y)
+    recorder = RecordingGrid(simulator.grid)
+    simulator.grid = recorder
+
+    results = []
+    for robot in robots:
+        results.append((simulator.process_robot(*robot), recorder.take_log()))
+    return results
+
+
+class SpeculativeRunner:
+    """
+    Optimistic parallel execution of a sequential mission.
+
+    Robots only depend on each other through scents, so chunks of robots
+    are simulated in worker processes against a snapshot of the scent set
+    while each robot's scent reads and writes are recorded. Results are
+    then committed strictly in input order: a robot is accepted if every
+    scent it read still has the value it saw, otherwise it is re-run on the
+    committed grid. The output is therefore identical to
+    Simulator.process_multiple_robots.
+
+    With executor='thread' the workers are threads, which scale across
+    cores on free-threaded (no-GIL) Python. If the grid uses the
+    'concurrent' scent store, worker threads then read the committed
+    scents directly instead of a copied snapshot, so they see scents
+    committed while they run and fewer robots are re-run.
+    """
+
+    def __init__(self, simulator: Simulator, max_workers: Optional[int] = None,
+                 chunk_size: int = 10000, executor: str = 'process'):
+        """
+        Initialize the runner.
+
+        Args:
+            simulator: Simulator whose grid holds the committed scents
+            max_workers: Number of workers (defaults to the CPU count)
+            chunk_size: Number of robots simulated per task
+            executor: Worker pool, one of threaded.EXECUTORS
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        if simulator.grid.has_obstacles:
+            # Parked robots and terrain are not part of the speculated scent snapshot
+            raise ValueError("Speculative runs do not support collision mode or terrain")
+        self.simulator = simulator
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.robots_accepted = 0
+        self.robots_rerun = 0
+
+    def iter_results(self, robot_data: Iterable[RobotData]) -> Iterator[str]:
+        """
+        Process robots in parallel and yield results in input order.
+
+        At most two chunks per worker are in flight at a time, so memory
+        stays bounded and each new chunk starts from the most recently
+        committed scent set.
+
+        Args:
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+
+        Yields:
+            Final state of each robot, in input order
+        """
+        grid = self.simulator.grid
+        robots = iter(robot_data)
+        pending = deque()
+        shared = self.executor == 'thread' and isinstance(grid.scented_positions, ConcurrentScentStore)
+
+        with make_executor(self.executor, self.max_workers) as executor:
+            def submit() -> bool:
+                chunk = list(islice(robots, self.chunk_size))
+                if not chunk:
+                    return False
+                snapshot = grid.scented_positions if shared else frozenset(grid.scented_positions)
+                pending.append((chunk, executor.submit(
+                    _simulate_chunk, grid.max_x, grid.max_y,
+                    self.simulator.engine, snapshot, chunk)))
+                return True
+
+            while len(pending) < 2 * self.max_workers and submit():
+                pass
+
+            while pending:
+                chunk, future = pending.popleft()
+                speculative = future.result()
+                yield from self._commit(chunk, speculative)
+                submit()
+
+    def process_multiple_robots(self, robot_data: Iterable[RobotData]) -> List[str]:
+        """
+        Process robots in parallel.
+
+        Args:
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+
+        Returns:
+            List of final states for each robot
+        """
+        return list(self.iter_results(robot_data))
+
+    def _commit(self, chunk: List[RobotData],
+                speculative: List[Tuple[str, ScentLog]]) -> Iterator[str]:
+        """Validate speculative results against the committed grid, in order."""
+        grid = self.simulator.grid
+        for robot, (result, (reads, writes)) in zip(chunk, speculative):
+            if all(grid.is_position_scented(x, y) == scented for x, y, scented in reads):
+                for x, y in writes:
+                    grid.add_scent(x, y)
+                self.robots_accepted += 1
+                self.simulator.robots_processed += 1
+                yield result
+            else:
+                self.robots_rerun += 1
+                yield self.simulator.process_robot(*robot)
@@ -0,0 +1,126 @@
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+from .compression import read_lines
+
+
+RobotData = Tuple[int, int, str, str]
+
+
+def parse_grid_dimensions(line: str) -> Tuple[int, int]:
+    """
+    Parse the first input line into grid dimensions.
+
+    Args:
+        line: Line containing the upper-right coordinates (e.g. "5 3")
+
+    Returns:
+        Tuple of (max_x, max_y)
+    """
+    try:
+        max_x, max_y = map(int, line.strip().split())
+    except ValueError:
+        raise ValueError("Invalid grid dimensions format")
+    return max_x, max_y
+
+
+def iter_robot_data(lines: Iterable[str], first_line_number: int = 2) -> Iterator[RobotData]:
+    """
+    Lazily parse robot line pairs as they arrive.
+
+    Only one pair of lines is held at a time, so memory stays flat
+    regardless of how many robots the input contains.
+
+    Args:
+        lines: Iterable of input lines following the grid dimensions line
+        first_line_number: 1-based line number of the first line in lines
+
+    Yields:
+        Tuples of (start_x, start_y, orientation, instructions)
+    """
+    line_number = first_line_number
+    iterator = iter(lines)
+
+    for position_line in iterator:
+        instructions_line = next(iterator, None)
+        if instructions_line is None:
+            raise ValueError("Incomplete robot data")
+
+        # Parse robot position and orientation
+        try:
+            x, y, orientation = position_line.strip().split()
+            x, y = int(x), int(y)
+        except ValueError:
+            raise ValueError(f"Invalid robot position format at line {line_number}")
+
+        yield x, y, orientation, instructions_line.strip()
+        line_number += 2
+
+
+def stream_input(input_lines: Iterable[str], skip_robots: int = 0) -> Tuple[int, int, Iterator[RobotData]]:
+    """
+    Parse the grid dimensions eagerly and the robots lazily.
+
+    Args:
+        input_lines: Iterable of input strings (e.g. a file object)
+        skip_robots: Number of leading robots to skip without parsing
+
+    Returns:
+        Tuple of (max_x, max_y, robot_data_iterator)
+    """
+    iterator = iter(input_lines)
+    first_line = next(iterator, None)
+    if first_line is None:
+        raise ValueError("No input provided")
+
+    max_x, max_y = parse_grid_dimensions(first_line)
+    if skip_robots:
+        skipped_lines = sum(1 for _ in islice(iterator, 2 * skip_robots))
+        if skipped_lines < 2 * skip_robots:
+            raise ValueError(f"Input has fewer than {skip_robots} robots to skip")
+    return max_x, max_y, iter_robot_data(iterator, 2 + 2 * skip_robots)
+
+
+def parse_input(input_lines: Iterable[str]) -> Tuple[int, int, List[RobotData]]:
+    """
+    Parse input lines into grid dimensions and robot data.
+
+    Args:
+        input_lines: List of input strings
+
+    Returns:
+        Tuple of (max_x, max_y, robot_data_list)
+    """
+    max_x, max_y, robot_data = stream_input(input_lines)
+    return max_x, max_y, list(robot_data)
+
+
+def stream_file(source: Union[str, BinaryIO], skip_robots: int = 0) -> Tuple[int, int, Iterator[RobotData]]:
+    """
+    Stream a mission from a file path or binary stream, like stream_input.
+
+    gzip, bz2 and xz missions are detected from their magic bytes and
+    decompressed on a reader thread while robots are parsed (see
+    compression.read_lines).
+
+    Args:
+        source: Mission file path, or a buffered binary stream such as sys.stdin.buffer
+        skip_robots: Number of leading robots to skip without parsing
+
+    Returns:
+        Tuple of (max_x, max_y, robot_data_iterator)
+    """
+    return stream_input(read_lines(source), skip_robots)
+
+
+def parse_file(source: Union[str, BinaryIO]) -> Tuple[int, int, List[RobotData]]:
+    """
+    Parse a possibly compressed mission file, like parse_input.
+
+    Args:
+        source: Mission file path, or a buffered binary stream
+
+    Returns:
+        Tuple of (max_x, max_y, robot_data_list)
+    """
+    max_x, max_y, robot_data = stream_file(source)
+    return max_x, max_y, list(robot_data)
@@ -0,0 +1,205 @@
+import heapq
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+from .grid import Grid
+from .robot import DX, DY, TURN_LEFT, TURN_RIGHT, heading_from_orientation
+
+
+# A robot state as (x, y, orientation letter)
+State = Tuple[int, int, str]
+
+
+def _turn_table() -> List[List[List[int]]]:
+    """
+    Precompute the fewest quarter turns needed to start at one heading,
+    face every heading in a set at some point and finish at another.
+
+    Returns:
+        table[start][finish][mask], where bit h of mask is heading h
+    """
+    table = [[[0] * 16 for _ in range(4)] for _ in range(4)]
+    for start in range(4):
+        # Breadth-first search over (heading, headings faced so far)
+        distance = {(start, 1 << start): 0}
+        frontier = [(start, 1 << start)]
+        while frontier:
+            next_frontier = []
+            for heading, faced in frontier:
+                for turned in (TURN_LEFT[heading], TURN_RIGHT[heading]):
+                    state = (turned, faced | 1 << turned)
+                    if state not in distance:
+                        distance[state] = distance[(heading, faced)] + 1
+                        next_frontier.append(state)
+            frontier = next_frontier
+        for finish in range(4):
+            for mask in range(16):
+                table[start][finish][mask] = min(
+                    turns for (heading, faced), turns in distance.items()
+                    if heading == finish and faced & mask == mask)
+    return table
+
+
+_TURNS = _turn_table()
+
+
+class Planner:
+    """
+    Shortest L/R/F programs between robot states on a grid.
+
+    Searches (x, y, heading) states with A*. Every instruction costs one.
+    The heuristic is the Manhattan distance to the target plus the fewest
+    turns needed to face each direction the robot still has to travel and
+    then the target heading. It never overestimates and never drops by
+    more than one per instruction, so the first path found is shortest.
+    On an open grid only states on optimal paths are expanded, so queries
+    stay fast on grids with millions of cells.
+
+    A forward move off the grid either loses the robot or, from a scented
+    position, does nothing. Neither can be part of a shortest safe
+    program, so planned programs never leave the grid. Terrain obstacles
+    and cells occupied by parked robots (collision mode) are impassable.
+    """
+
+    def __init__(self, grid: Grid):
+        """
+        Initialize a planner for a grid.
+
+        Args:
+            grid: Grid providing bounds, terrain and parked robots
+        """
+        self.grid = grid
+        self._height = grid.max_y + 1
+
+    def plan(self, start: State, target: State) -> Optional[str]:
+        """
+        Find the shortest instruction string from start to target.
+
+        Args:
+            start: Starting (x, y, orientation)
+            target: Target (x, y, orientation)
+
+        Returns:
+            Shortest instructions reaching the target without being lost,
+            or None if the target cannot be reached
+        """
+        start_x, start_y, start_heading = start[0], start[1], heading_from_orientation(start[2])
+        target_x, target_y, target_heading = target[0], target[1], heading_from_orientation(target[2])
+        if (start_x, start_y) == (target_x, target_y):
+            # Turning in place is optimal; any detour costs at least two moves more
+            return _turns_between(start_heading, target_heading)
+        if not self._passable(target_x, target_y):
+            return None
+
+        grid = self.grid
+        height = self._height
+        turns = _TURNS
+
+        def estimate(x: int, y: int, heading: int) -> int:
+            dx, dy = target_x - x, target_y - y
+            mask = (dx > 0) << 1 | (dx < 0) << 3 | (dy > 0) | (dy < 0) << 2
+            return abs(dx) + abs(dy) + turns[heading][target_heading][mask]
+
+        # Queue entries: (f, -g, tie, state id, x, y, heading); deeper states first on ties
+        tie = count()
+        queue = []
+        parents: Dict[int, Tuple[int, str]] = {}
+        best: Dict[int, int] = {}
+        prefixes: Dict[int, str] = {}
+
+        if grid.is_within_bounds(start_x, start_y):
+            state = (start_x * height + start_y) * 4 + start_heading
+            best[state] = 0
+            prefixes[state] = ''
+            heapq.heappush(queue, (estimate(start_x, start_y, start_heading), 0, next(tie),
+                                   state, start_x, start_y, start_heading))
+        else:
+            # Off the grid, the only safe forward move is onto the grid
+            for heading in range(4):
+                x, y = start_x + DX[heading], start_y + DY[heading]
+                if self._passable(x, y):
+                    prefix = _turns_between(start_heading, heading) + 'F'
+                    state = (x * height + y) * 4 + heading
+                    best[state] = len(prefix)
+                    prefixes[state] = prefix
+                    heapq.heappush(queue, (len(prefix) + estimate(x, y, heading), -len(prefix),
+                                           next(tie), state, x, y, heading))
+
+        goal = (target_x * height + target_y) * 4 + target_heading
+        while queue:
+            _, negative_cost, _, state, x, y, heading = heapq.heappop(queue)
+            cost = -negative_cost
+            if cost > best[state]:
+                continue
+            if state == goal:
+                return self._path(state, parents, prefixes)
+
+            cost += 1
+            successors = [(x, y, TURN_LEFT[heading], 'L'), (x, y, TURN_RIGHT[heading], 'R')]
+            next_x, next_y = x + DX[heading], y + DY[heading]
+            if self._passable(next_x, next_y):
+                successors.append((next_x, next_y, heading, 'F'))
+            for next_x, next_y, next_heading, instruction in successors:
+                successor = (next_x * height + next_y) * 4 + next_heading
+                if cost < best.get(successor, cost + 1):
+                    best[successor] = cost
+                    parents[successor] = (state, instruction)
+                    prefixes.pop(successor, None)
+                    heapq.heappush(queue, (cost + estimate(next_x, next_y, next_heading), -cost,
+                                           next(tie), successor, next_x, next_y, next_heading))
+        return None
+
+    def plan_many(self, queries: Iterable[Tuple[State, State]]) -> List[Optional[str]]:
+        """
+        Answer many (start, target) queries against the same grid.
+
+        Repeated queries are answered once.
+
+        Args:
+            queries: Iterable of (start, target) pairs
+
+        Returns:
+            Planned instructions (or None) for each query, in order
+        """
+        answers: Dict[Tuple[State, State], Optional[str]] = {}
+        results = []
+        for start, target in queries:
+            key = (tuple(start), tuple(target))
+            if key not in answers:
+                answers[key] = self.plan(start, target)
+            results.append(answers[key])
+        return results
+
+    def _passable(self, x: int, y: int) -> bool:
+        """Check whether a robot may stand on a cell."""
+        grid = self.grid
+        return grid.is_within_bounds(x, y) and not grid.is_blocked(x, y) and not grid.is_occupied(x, y)
+
+    @staticmethod
+    def _path(state: int, parents: Dict[int, Tuple[int, str]], prefixes: Dict[int, str]) -> str:
+        """Rebuild the instructions leading to a state."""
+        instructions = []
+        while state not in prefixes:
+            state, instruction = parents[state]
+            instructions.append(instruction)
+        return prefixes[state] + ''.join(reversed(instructions))
+
+
+def _turns_between(heading: int, target: int) -> str:
+    """Return the shortest turn sequence from one heading to another."""
+    return ('', 'R', 'RR', 'L')[(target - heading) & 3]
+
+
+def plan(grid: Grid, start: State, target: State) -> Optional[str]:
+    """
+    Find the shortest instruction string from start to target on a grid.
+
+    Args:
+        grid: Grid providing bounds, terrain and parked robots
+        start: Starting (x, y, orientation)
+        target: Target (x, y, orientation)
+
+    Returns:
+        Shortest safe instructions, or None if the target is unreachable
+    """
+    return Planner(grid).plan(start, target)
+
@@ -0,0 +1,134 @@
+import re
+from typing import Optional, Protocol, Tuple
+from .grid import Grid
+from .robot import DX, DY
+
+
+# A segment is (net_turn, forwards): rotate by net_turn quarter turns
+# clockwise (0-3), then attempt `forwards` consecutive F moves.
+Segment = Tuple[int, int]
+Program = Tuple[Segment, ...]
+
+_SEGMENT_PATTERN = re.compile(r'([^F]*)(F*)')
+
+
+def compile_instructions(instructions: str) -> Program:
+    """
+    Compile an instruction string into run-length segments.
+    
+    Each segment holds the net turn (mod 4) of a block of L/R
+    instructions followed by the length of the F run after it. Invalid
+    characters are ignored, exactly like the per-character engine.
+    
+    Args:
+        instructions: String of instructions ('L', 'R', 'F')
+        
+    Returns:
+        Tuple of (net_turn, forwards) segments
+    """
+    segments = []
+    for match in _SEGMENT_PATTERN.finditer(instructions):
+        turns, forwards = match.group(1), match.group(2)
+        if not turns and not forwards:
+            continue
+        
+        turn = (turns.count('R') - turns.count('L')) & 3
+        if turn == 0 and segments:
+            # Nothing rotates in between, so the F runs simply join
+            previous_turn, previous_forwards = segments[-1]
+            segments[-1] = (previous_turn, previous_forwards + len(forwards))
+        else:
+            segments.append((turn, len(forwards)))
+    return tuple(segments)
+
+
+class ProgramObserver(Protocol):
+    """Receives the events of run_program; see analytics.TrafficAnalytics."""
+    
+    def moved(self, x: int, y: int, heading: int, steps: int) -> None:
+        """A run of steps forward moves from (x, y), all staying on the grid."""
+    
+    def scent_hit(self, x: int, y: int, count: int) -> None:
+        """count forward moves onto the scented off-grid cell (x, y) were ignored."""
+    
+    def lost(self, x: int, y: int) -> None:
+        """The robot fell off onto the off-grid cell (x, y)."""
+
+
+def steps_to_edge(grid: Grid, x: int, y: int, heading: int) -> int:
+    """
+    Count how many forward steps stay on the grid from a position.
+    
+    Args:
+        grid: Grid providing the boundaries
+        x: Current x-coordinate
+        y: Current y-coordinate
+        heading: Heading code (0=N, 1=E, 2=S, 3=W)
+        
+    Returns:
+        Number of consecutive F moves that land within bounds
+    """
+    if grid.would_fall_off(x + DX[heading], y + DY[heading]):
+        return 0
+    if heading == 0:
+        return grid.max_y - y
+    if heading == 1:
+        return grid.max_x - x
+    if heading == 2:
+        return y
+    return x
+
+
+def run_program(grid: Grid, x: int, y: int, heading: int, program: Program,
+                observer: Optional[ProgramObserver] = None) -> Tuple[int, int, int, bool]:
+    """
+    Execute a compiled program against a grid.
+    
+    Each F run is executed as a single jump clamped to the last cell
+    before the edge; the scent check only happens at that boundary cell.
+    Scents are read and written through the grid exactly as the
+    per-character engine does, so results and scent state are identical.
+    
+    Args:
+        grid: Grid providing boundaries and scents
+        x: Starting x-coordinate
+        y: Starting y-coordinate
+        heading: Starting heading code
+        program: Compiled program from compile_instructions
+        observer: Optional ProgramObserver told about every F run, scent
+            hit and loss (one call per segment, not per step)
+        
+    Returns:
+        Tuple of (x, y, heading, is_lost)
+    """
+    for turn, forwards in program:
+        heading = (heading + turn) & 3
+        if not forwards:
+            continue
+        
+        dx, dy = DX[heading], DY[heading]
+        steps = steps_to_edge(grid, x, y, heading)
+        if forwards <= steps:
+            if observer is not None:
+                observer.moved(x, y, heading, forwards)
+            x += dx * forwards
+            y += dy * forwards
+            continue
+        
+        # Walk up to the edge; the next step would fall off
+        if observer is not None and steps:
+            observer.moved(x, y, heading, steps)
+        x += dx * steps
+        y += dy * steps
+        next_x, next_y = x + dx, y + dy
+        if grid.is_position_scented(next_x, next_y):
+            # Every remaining F in this run is ignored at the same cell
+            if observer is not None:
+                observer.scent_hit(next_x, next_y, forwards - steps)
+            continue
+        grid.add_scent(next_x, next_y)
+        if observer is not None:
+            observer.lost(next_x, next_y)
+        return x, y, heading, True
+    
+    return x, y, heading, False
@@ -0,0 +1,298 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from .checkpoint import load_checkpoint, save_checkpoint
+from .simulator import Simulator
+
+
+# Spill files use the checkpoint format (dimensions, robot count, scents)
+SPILL_SUFFIX = '.ckpt'
+
+# Estimated bytes per new scent in a grid measured with no scents: a
+# ScentSet slot plus its (x, y) tuple and two ints
+SCENT_BYTES = 160
+
+
+class _Entry:
+    """
+    A resident simulator with its lock, lease count and estimated size.
+
+    The scent store is measured exactly when the grid is loaded and when a
+    lease is released. In between, growth is estimated from the scent
+    count in O(1), because measuring a large ScentSet walks every scent.
+    """
+
+    __slots__ = ('simulator', 'lock', 'leases', 'spills', 'nbytes', 'measured_len', 'measured_bytes')
+
+    def __init__(self, simulator: Simulator):
+        self.simulator = simulator
+        self.lock = threading.Lock()
+        self.leases = 0
+        self.spills = 0
+        self.record(*self.measure())
+
+    def measure(self) -> Tuple[int, int]:
+        """Return the scent count and exact scent memory of the grid."""
+        grid = self.simulator.grid
+        return len(grid.scented_positions), grid.scent_memory_usage()
+
+    def record(self, count: int, nbytes: int) -> None:
+        """Store an exact measurement taken at the given scent count."""
+        self.measured_len = count
+        self.measured_bytes = self.nbytes = nbytes
+
+    def estimate(self) -> None:
+        """Update nbytes for scents added since the last measurement."""
+        grown = len(self.simulator.grid.scented_positions) - self.measured_len
+        if grown > 0:
+            per_scent = self.measured_bytes // self.measured_len if self.measured_len else SCENT_BYTES
+            self.nbytes = self.measured_bytes + grown * per_scent
+
+
+class GridRegistry:
+    """
+    Named simulators with LRU eviction to disk.
+
+    At most max_grids simulators (and, optionally, about max_bytes of
+    scent state) stay in memory. The least recently used ones are written
+    to spill_dir as checkpoints and transparently reloaded on their next
+    access, so a grid's scents and robot count survive eviction without
+    replaying its history. Spill files left by an earlier registry on the
+    same directory are picked up as well.
+
+    The registry's own methods are thread-safe, and spill files are
+    written outside the registry lock, so spilling a large grid does not
+    hold up the others. Use lease() to work on a grid from several
+    threads: a leased grid is locked to its holder and never evicted while
+    in use, while different grids can be used concurrently. get() hands
+    out an unlocked simulator and is only safe from a single thread.
+    """
+
+    def __init__(self, spill_dir: str, max_grids: int = 64, max_bytes: Optional[int] = None,
+                 **simulator_options):
+        """
+        Initialize the registry.
+
+        Args:
+            spill_dir: Directory for evicted grids (created if missing)
+            max_grids: Maximum number of resident simulators
+            max_bytes: Optional budget for resident scent memory in bytes
+            **simulator_options: Extra keyword arguments for new Simulators
+                (e.g. engine, scent_store); occupancy and cache are not supported
+
+        Raises:
+            ValueError: If max_grids is not positive, or occupancy or a cache is given
+        """
+        if max_grids < 1:
+            raise ValueError("max_grids must be positive")
+        if simulator_options.get('occupancy') is not None:
+            # Spill files hold scents and the robot count, not parked robots
+            raise ValueError("Registry grids do not support collision mode")
+        if simulator_options.get('cache') is not None:
+            # One ResultCache instance would be shared, unlocked, by every grid
+            raise ValueError("Registry grids cannot share a result cache")
+        os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = spill_dir
+        self.max_grids = max_grids
+        self.max_bytes = max_bytes
+        self.simulator_options = simulator_options
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        # Evicted grids whose spill files are still being written
+        self._spilling: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, max_x: int, max_y: int) -> Simulator:
+        """
+        Return the simulator for a named grid, creating or reloading it.
+
+        The returned simulator is not locked and may be evicted by later
+        calls, so use get() from a single thread only; hold a lease()
+        instead while other threads use the registry.
+
+        Args:
+            name: Grid name
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+
+        Returns:
+            Simulator for the grid
+
+        Raises:
+            ValueError: If the grid exists with different dimensions
+        """
+        with self._lock:
+            entry = self._acquire(name, max_x, max_y)
+            victims = self._enforce_budget()
+        self._write_spills(victims)
+        return entry.simulator
+
+    @contextmanager
+    def lease(self, name: str, max_x: int, max_y: int) -> Iterator[Simulator]:
+        """
+        Hold a named grid exclusively; it is not evicted until released.
+
+        Args:
+            name: Grid name
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+
+        Yields:
+            Simulator for the grid
+        """
+        with self._lock:
+            entry = self._acquire(name, max_x, max_y)
+            entry.leases += 1
+        measurement = None
+        try:
+            with entry.lock:
+                try:
+                    yield entry.simulator
+                finally:
+                    # Measure outside the registry lock, so other grids stay available
+                    if self.max_bytes is not None:
+                        measurement = entry.measure()
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                if measurement is not None:
+                    entry.record(*measurement)
+                victims = self._enforce_budget()
+            self._write_spills(victims)
+
+    def evict(self, name: str) -> bool:
+        """
+        Spill a resident grid to disk now.
+
+        Args:
+            name: Grid name
+
+        Returns:
+            True if the grid was resident and unleased, and was spilled
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.leases:
+                return False
+            victims = [self._detach(name)]
+        self._write_spills(victims)
+        return True
+
+    def spill_all(self) -> None:
+        """Spill every unleased resident grid, e.g. before shutting down."""
+        with self._lock:
+            victims = [self._detach(name) for name, entry in list(self._entries.items())
+                       if not entry.leases]
+        self._write_spills(victims)
+
+    def resident_bytes(self) -> int:
+        """
+        Scent memory of resident grids, as last measured or estimated.
+
+        Grids are measured when loaded and, with a byte budget, when a
+        lease is released; other accesses estimate growth from the
+        number of new scents.
+        """
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, load and eviction counters and residency."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'loads': self.loads,
+                'evictions': self.evictions,
+                'resident': len(self._entries),
+                'resident_bytes': sum(entry.nbytes for entry in self._entries.values()),
+            }
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a grid is resident in memory."""
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self) -> int:
+        """Number of resident grids."""
+        with self._lock:
+            return len(self._entries)
+
+    def spill_path(self, name: str) -> str:
+        """Return the spill file for a grid name."""
+        return os.path.join(self.spill_dir, quote(name, safe='') + SPILL_SUFFIX)
+
+    def _acquire(self, name: str, max_x: int, max_y: int) -> _Entry:
+        """Return the entry for a grid, loading or creating it (registry lock held)."""
+        entry = self._entries.get(name)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(name)
+            if self.max_bytes is not None:
+                entry.estimate()
+        elif name in self._spilling:
+            # Still being written out: take it back rather than read a
+            # file that is not complete yet. Its entry lock is held until
+            # the write finishes, so leases wait for it.
+            self.hits += 1
+            entry = self._entries[name] = self._spilling.pop(name)
+        else:
+            self.misses += 1
+            path = self.spill_path(name)
+            if os.path.exists(path):
+                simulator = load_checkpoint(path, **self.simulator_options)
+                os.remove(path)
+                self.loads += 1
+            else:
+                simulator = Simulator(max_x, max_y, **self.simulator_options)
+            entry = self._entries[name] = _Entry(simulator)
+
+        grid = entry.simulator.grid
+        if (grid.max_x, grid.max_y) != (max_x, max_y):
+            raise ValueError(f"Grid {name} already exists with different dimensions")
+        return entry
+
+    def _enforce_budget(self) -> List[Tuple[str, _Entry, int]]:
+        """
+        Detach least recently used grids until within budget (registry lock held).
+
+        Returns:
+            Detached grids, to be passed to _write_spills after releasing the lock
+        """
+        victims = []
+        while len(self._entries) > 1:
+            over_count = len(self._entries) > self.max_grids
+            over_bytes = (self.max_bytes is not None
+                          and sum(entry.nbytes for entry in self._entries.values()) > self.max_bytes)
+            if not over_count and not over_bytes:
+                break
+            # Never spill the most recently used grid or a leased one
+            names = list(self._entries)[:-1]
+            victim = next((name for name in names if not self._entries[name].leases), None)
+            if victim is None:
+                break
+            victims.append(self._detach(victim))
+        return victims
+
+    def _detach(self, name: str) -> Tuple[str, _Entry, int]:
+        """Move a resident grid to the spilling set (registry lock held)."""
+        entry = self._spilling[name] = self._entries.pop(name)
+        entry.spills += 1
+        self.evictions += 1
+        return name, entry, entry.spills
+
+    def _write_spills(self, victims: List[Tuple[str, _Entry, int]]) -> None:
+        """Write detached grids to disk without holding the registry lock."""
+        for name, entry, spill in victims:
+            with entry.lock:
+                save_checkpoint(entry.simulator, self.spill_path(name))
+            with self._lock:
+                # A grid taken back and detached again has a newer write pending
+                if self._spilling.get(name) is entry and entry.spills == spill:
+                    del self._spilling[name]
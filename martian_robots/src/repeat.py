@@ -0,0 +1,310 @@
+import re
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Tuple, Union
+from .grid import Grid
+from .robot import DX, DY, TURN_LEFT, TURN_RIGHT
+
+
+# Grouping syntax: "(FRFRF)1000000" repeats the bracketed instructions;
+# groups nest and a missing count means once. Characters other than L, R,
+# F, brackets and a group's count are ignored, as in plain instructions,
+# and so are brackets that do not pair up.
+_TOKEN_PATTERN = re.compile(r'\(|\)(\d*)|[^()]+')
+
+
+class Summary(NamedTuple):
+    """
+    Net effect of running instructions on an unbounded grid.
+
+    Coordinates are relative to the start, for a robot starting north;
+    rotate() gives the summary for other start headings. The envelope is
+    the bounding box of every position visited, start included.
+    """
+    dx: int
+    dy: int
+    turn: int
+    min_x: int
+    max_x: int
+    min_y: int
+    max_y: int
+
+
+class Group(NamedTuple):
+    """A bracketed run of items repeated count times."""
+    body: Tuple['Item', ...]
+    count: int
+    unit: Summary  # one repetition, starting north
+
+
+Item = Union[str, Group]
+RepeatProgram = Tuple[Item, ...]
+
+_IDENTITY = Summary(0, 0, 0, 0, 0, 0, 0)
+
+
+@lru_cache(maxsize=1024)
+def parse_repeats(instructions: str) -> RepeatProgram:
+    """
+    Parse instructions that may contain repeat groups.
+
+    Args:
+        instructions: Instructions such as "F(FRFRF)1000000L"
+
+    An unmatched bracket is ignored like any other invalid instruction:
+    a stray ")3" is kept as literal text (which runs as nothing) and the
+    contents of an unclosed "(" run once in place.
+
+    Returns:
+        Tuple of literal instruction strings and Group items
+    """
+    stack = [[]]
+    for match in _TOKEN_PATTERN.finditer(instructions):
+        token = match.group(0)
+        if token == '(':
+            stack.append([])
+        elif token[0] == ')' and len(stack) > 1:
+            body = tuple(stack.pop())
+            count = int(match.group(1)) if match.group(1) else 1
+            stack[-1].append(Group(body, count, summarize(body)))
+        else:
+            stack[-1].append(token)
+    while len(stack) > 1:
+        unclosed = stack.pop()
+        stack[-1].extend(unclosed)
+    return tuple(stack[0])
+
+
+def summarize(items: RepeatProgram) -> Summary:
+    """
+    Compose the summary of a sequence of items, starting north.
+
+    Args:
+        items: Literal strings and groups
+
+    Returns:
+        Summary of the whole sequence
+    """
+    total = _IDENTITY
+    for item in items:
+        if isinstance(item, str):
+            part = _summarize_literal(item)
+        else:
+            part = repeat_summary(item.unit, item.count)
+        total = _compose(total, part)
+    return total
+
+
+def repeat_summary(unit: Summary, count: int) -> Summary:
+    """
+    Summarize count repetitions of a unit without iterating them.
+
+    Repetition i starts with heading i * unit.turn, so headings cycle with
+    a period of 1, 2 or 4 repetitions. Within each residue class r the
+    start offsets grow linearly with the number of whole periods, so the
+    envelope is the union of that class's first and last repetition.
+
+    Args:
+        unit: Summary of one repetition, starting north
+        count: Number of repetitions
+
+    Returns:
+        Summary of all repetitions, starting north
+    """
+    if count <= 0:
+        return _IDENTITY
+    period = 1 if unit.turn == 0 else 2 if unit.turn == 2 else 4
+
+    offsets = [(0, 0)]
+    rotated = []
+    for r in range(period):
+        part = rotate(unit, r * unit.turn & 3)
+        rotated.append(part)
+        x, y = offsets[-1]
+        offsets.append((x + part.dx, y + part.dy))
+    period_dx, period_dy = offsets[period]
+
+    min_x = max_x = min_y = max_y = 0
+    for r in range(min(period, count)):
+        part, (x, y) = rotated[r], offsets[r]
+        last = (count - 1 - r) // period
+        for q in (0, last):
+            base_x, base_y = x + q * period_dx, y + q * period_dy
+            min_x = min(min_x, base_x + part.min_x)
+            max_x = max(max_x, base_x + part.max_x)
+            min_y = min(min_y, base_y + part.min_y)
+            max_y = max(max_y, base_y + part.max_y)
+
+    whole, rest = divmod(count, period)
+    return Summary(whole * period_dx + offsets[rest][0], whole * period_dy + offsets[rest][1],
+                   count * unit.turn & 3, min_x, max_x, min_y, max_y)
+
+
+def rotate(summary: Summary, heading: int) -> Summary:
+    """
+    Return the summary for a robot starting with the given heading.
+
+    Args:
+        summary: Summary starting north
+        heading: Start heading code (0=N, 1=E, 2=S, 3=W)
+    """
+    dx, dy, turn, min_x, max_x, min_y, max_y = summary
+    for _ in range(heading):
+        # A quarter turn clockwise maps (x, y) to (y, -x)
+        dx, dy = dy, -dx
+        min_x, max_x, min_y, max_y = min_y, max_y, -max_x, -min_x
+    return Summary(dx, dy, turn, min_x, max_x, min_y, max_y)
+
+
+def run_repeated(grid: Grid, x: int, y: int, heading: int,
+                 program: RepeatProgram) -> Tuple[int, int, int, bool]:
+    """
+    Execute a parsed repeat program on a grid without expanding it.
+
+    Whole repetitions are fast-forwarded while their envelope stays
+    inside the grid, where no scent or edge can affect them. Repetitions
+    that reach the edge are stepped normally; because scents only change
+    when the robot is lost, a start state seen before within a group means
+    the remaining repetitions cycle and can be skipped in whole cycles.
+
+    Args:
+        grid: Grid providing boundaries and scents
+        x: Starting x-coordinate
+        y: Starting y-coordinate
+        heading: Starting heading code
+        program: Items from parse_repeats
+
+    Returns:
+        Tuple of (x, y, heading, is_lost), identical to expanding the groups
+    """
+    for item in program:
+        if isinstance(item, str):
+            x, y, heading, lost = _run_literal(grid, x, y, heading, item)
+        else:
+            x, y, heading, lost = _run_group(grid, x, y, heading, item)
+        if lost:
+            return x, y, heading, True
+    return x, y, heading, False
+
+
+def iter_instructions(instructions: str) -> Union[str, Iterator[str]]:
+    """
+    Return instructions as single characters, expanding groups lazily.
+
+    Used by the step-by-step modes (stats, trajectories, collisions) that
+    must see every instruction.
+
+    Args:
+        instructions: Instructions, possibly with repeat groups
+
+    Returns:
+        The string itself when it has no groups, otherwise an iterator
+    """
+    if '(' not in instructions:
+        return instructions
+    return _expand(parse_repeats(instructions))
+
+
+def _expand(items: RepeatProgram) -> Iterator[str]:
+    """Yield the instructions of items one character at a time."""
+    for item in items:
+        if isinstance(item, str):
+            yield from item
+        else:
+            for _ in range(item.count):
+                yield from _expand(item.body)
+
+
+def _run_group(grid: Grid, x: int, y: int, heading: int,
+               group: Group) -> Tuple[int, int, int, bool]:
+    """Run one group, fast-forwarding and skipping cycles."""
+    remaining = group.count
+    seen = {}
+    while remaining:
+        skip = _safe_repetitions(grid, x, y, heading, group.unit, remaining)
+        if skip:
+            summary = rotate(repeat_summary(group.unit, skip), heading)
+            x, y = x + summary.dx, y + summary.dy
+            heading = (heading + summary.turn) & 3
+            remaining -= skip
+            if not remaining:
+                break
+
+        state = (x, y, heading)
+        if state in seen:
+            remaining %= seen[state] - remaining
+            seen.clear()
+            if not remaining:
+                break
+        seen[state] = remaining
+
+        x, y, heading, lost = run_repeated(grid, x, y, heading, group.body)
+        if lost:
+            return x, y, heading, True
+        remaining -= 1
+    return x, y, heading, False
+
+
+def _safe_repetitions(grid: Grid, x: int, y: int, heading: int, unit: Summary, limit: int) -> int:
+    """Return the most repetitions (up to limit) whose envelope stays inside the grid."""
+    def inside(count: int) -> bool:
+        summary = rotate(repeat_summary(unit, count), heading)
+        return (x + summary.min_x >= 0 and x + summary.max_x <= grid.max_x
+                and y + summary.min_y >= 0 and y + summary.max_y <= grid.max_y)
+
+    if not inside(1):
+        return 0
+    low, high = 1, 2
+    while high <= limit and inside(high):
+        low, high = high, high * 2
+    high = min(high, limit + 1)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if inside(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def _run_literal(grid: Grid, x: int, y: int, heading: int,
+                 instructions: str) -> Tuple[int, int, int, bool]:
+    """Run plain instructions with the scent rules."""
+    max_x, max_y = grid.max_x, grid.max_y
+    for instruction in instructions:
+        if instruction == 'F':
+            next_x, next_y = x + DX[heading], y + DY[heading]
+            if 0 <= next_x <= max_x and 0 <= next_y <= max_y:
+                x, y = next_x, next_y
+            elif not grid.is_position_scented(next_x, next_y):
+                grid.add_scent(next_x, next_y)
+                return x, y, heading, True
+        elif instruction == 'L':
+            heading = TURN_LEFT[heading]
+        elif instruction == 'R':
+            heading = TURN_RIGHT[heading]
+    return x, y, heading, False
+
+
+def _summarize_literal(instructions: str) -> Summary:
+    """Summarize plain instructions on an unbounded grid, starting north."""
+    x = y = heading = 0
+    min_x = max_x = min_y = max_y = 0
+    for instruction in instructions:
+        if instruction == 'F':
+            x += DX[heading]
+            y += DY[heading]
+            min_x, max_x = min(min_x, x), max(max_x, x)
+            min_y, max_y = min(min_y, y), max(max_y, y)
+        elif instruction == 'L':
+            heading = TURN_LEFT[heading]
+        elif instruction == 'R':
+            heading = TURN_RIGHT[heading]
+    return Summary(x, y, heading, min_x, max_x, min_y, max_y)
+
+
+def _compose(first: Summary, second: Summary) -> Summary:
+    """Summary of running first and then second (both starting north)."""
+    part = rotate(second, first.turn)
+    return Summary(first.dx + part.dx, first.dy + part.dy, (first.turn + part.turn) & 3,
+                   min(first.min_x, first.dx + part.min_x), max(first.max_x, first.dx + part.max_x),
+                   min(first.min_y, first.dy + part.min_y), max(first.max_y, first.dy + part.max_y))
@@ -10,14 +10,72 @@ class Orientation(Enum):
     WEST = 'W'
 
 
+# Integer heading codes, clockwise from north: turning right adds one
+# (mod 4) and turning left subtracts one. DX/DY give the unit step for
+# each heading, and TURN_LEFT/TURN_RIGHT map a heading to its successor.
+HEADINGS = 'NESW'
+DX = (0, 1, 0, -1)
+DY = (1, 0, -1, 0)
+TURN_LEFT = (3, 0, 1, 2)
+TURN_RIGHT = (1, 2, 3, 0)
+
+_HEADING_CODES = {letter: code for code, letter in enumerate(HEADINGS)}
+_ORIENTATIONS = tuple(Orientation(letter) for letter in HEADINGS)
+
+
+def heading_from_orientation(orientation: str) -> int:
+    """
+    Convert an orientation letter into an integer heading code.
+    
+    Args:
+        orientation: Orientation ('N', 'S', 'E', 'W')
+        
+    Returns:
+        Heading code (0=N, 1=E, 2=S, 3=W)
+        
+    Raises:
+        ValueError: If the orientation is not valid
+    """
+    try:
+        return _HEADING_CODES[orientation]
+    except (KeyError, TypeError):
+        if isinstance(orientation, Orientation):
+            return _HEADING_CODES[orientation.value]
+        raise ValueError(f"{orientation!r} is not a valid Orientation")
+
+
+def format_state(x: int, y: int, heading: int, is_lost: bool) -> str:
+    """
+    Format a final robot state exactly like Robot.__str__.
+    
+    Args:
+        x: X-coordinate of the robot
+        y: Y-coordinate of the robot
+        heading: Heading code (0=N, 1=E, 2=S, 3=W)
+        is_lost: Whether the robot fell off the grid
+        
+    Returns:
+        String representation of the robot's state
+    """
+    if is_lost:
+        return f"{x} {y} {HEADINGS[heading]} LOST"
+    return f"{x} {y} {HEADINGS[heading]}"
+
+
 class Robot:
     """
     Represents a robot on the Martian surface.
     
     A robot has a position (x, y coordinates) and an orientation (N, S, E, W).
     The robot can move forward, turn left, or turn right.
+    
+    Internally the orientation is a small-int heading, so turns and moves
+    are table lookups; the orientation property exposes it as an
+    Orientation for compatibility.
     """
     
+    __slots__ = ('x', 'y', 'heading', 'is_lost')
+    
     def __init__(self, x: int, y: int, orientation: str):
         """
         Initialize a robot with position and orientation.
@@ -29,30 +87,25 @@ class Robot:
         """
         self.x = x
         self.y = y
-        self.orientation = Orientation(orientation)
+        self.heading = heading_from_orientation(orientation)
         self.is_lost = False
     
+    @property
+    def orientation(self) -> Orientation:
+        """The robot's orientation as an Orientation member."""
+        return _ORIENTATIONS[self.heading]
+    
+    @orientation.setter
+    def orientation(self, orientation: Orientation) -> None:
+        self.heading = heading_from_orientation(orientation)
+    
     def turn_left(self) -> None:
         """Turn the robot 90 degrees to the left."""
-        if self.orientation == Orientation.NORTH:
-            self.orientation = Orientation.WEST
-        elif self.orientation == Orientation.WEST:
-            self.orientation = Orientation.SOUTH
-        elif self.orientation == Orientation.SOUTH:
-            self.orientation = Orientation.EAST
-        elif self.orientation == Orientation.EAST:
-            self.orientation = Orientation.NORTH
+        self.heading = TURN_LEFT[self.heading]
     
     def turn_right(self) -> None:
         """Turn the robot 90 degrees to the right."""
-        if self.orientation == Orientation.NORTH:
-            self.orientation = Orientation.EAST
-        elif self.orientation == Orientation.EAST:
-            self.orientation = Orientation.SOUTH
-        elif self.orientation == Orientation.SOUTH:
-            self.orientation = Orientation.WEST
-        elif self.orientation == Orientation.WEST:
-            self.orientation = Orientation.NORTH
+        self.heading = TURN_RIGHT[self.heading]
     
     def get_next_position(self) -> Tuple[int, int]:
         """
@@ -61,20 +114,12 @@ class Robot:
         Returns:
             Tuple of (x, y) coordinates for the next position
         """
-        if self.orientation == Orientation.NORTH:
-            return (self.x, self.y + 1)
-        elif self.orientation == Orientation.SOUTH:
-            return (self.x, self.y - 1)
-        elif self.orientation == Orientation.EAST:
-            return (self.x + 1, self.y)
-        elif self.orientation == Orientation.WEST:
-            return (self.x - 1, self.y)
+        return (self.x + DX[self.heading], self.y + DY[self.heading])
     
     def move_forward(self) -> None:
         """Move the robot forward one grid point in the current direction."""
-        next_x, next_y = self.get_next_position()
-        self.x = next_x
-        self.y = next_y
+        self.x += DX[self.heading]
+        self.y += DY[self.heading]
     
     def get_position(self) -> Tuple[int, int]:
         """Get the current position of the robot."""
@@ -82,7 +127,7 @@ class Robot:
     
     def get_orientation(self) -> str:
         """Get the current orientation of the robot."""
-        return self.orientation.value
+        return HEADINGS[self.heading]
     
     def mark_as_lost(self) -> None:
         """Mark the robot as lost (fell off the grid)."""
@@ -90,7 +135,4 @@ class Robot:
     
     def __str__(self) -> str:
         """String representation of the robot's current state."""
-        status = f"{self.x} {self.y} {self.orientation.value}"
-        if self.is_lost:
-            status += " LOST"
-        return status 
\ No newline at end of file
+        return format_state(self.x, self.y, self.heading, self.is_lost)
\ No newline at end of file
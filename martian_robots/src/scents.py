@@ -0,0 +1,380 @@
+import sys
+import threading
+from collections.abc import Set as AbstractSet
+from itertools import chain
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple
+
+
+class ScentSet(set):
+    """
+    Default scent store: a plain set of (x, y) tuples.
+
+    Every scent store exposes is_scented/add_scent/nbytes alongside the
+    usual set protocol, so Grid can switch stores without changing callers
+    that read Grid.scented_positions directly.
+    """
+
+    def __init__(self, max_x: int = 0, max_y: int = 0):
+        """
+        Initialize an empty scent set.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid (unused)
+            max_y: Maximum y-coordinate of the grid (unused)
+        """
+        super().__init__()
+
+    def is_scented(self, x: int, y: int) -> bool:
+        """Check whether a position is scented."""
+        return (x, y) in self
+
+    def add_scent(self, x: int, y: int) -> None:
+        """Add a scent at a position."""
+        self.add((x, y))
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the set, its tuples and coordinates."""
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(position) + sys.getsizeof(position[0]) + sys.getsizeof(position[1])
+            for position in self
+        )
+
+
+class PerimeterScentStore(AbstractSet):
+    """
+    Compact scent store for large grids.
+
+    Robots leave their scent on the off-grid cell just past the edge, so in
+    practice every scent lies on one of the four lines bordering the grid:
+    y = max_y + 1 and y = -1 for 0 <= x <= max_x, and x = max_x + 1 and
+    x = -1 for 0 <= y <= max_y. Each line is a packed bit vector indexed
+    by coordinate and allocated on first use, making lookups O(1) without
+    building tuples. Any other cell (e.g. from robots starting off the
+    grid) falls back to a small overflow set, so the store behaves exactly
+    like ScentSet.
+    """
+
+    def __init__(self, max_x: int, max_y: int):
+        """
+        Initialize an empty store for a grid.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+        """
+        self.max_x = max_x
+        self.max_y = max_y
+        self._north: Optional[bytearray] = None
+        self._south: Optional[bytearray] = None
+        self._east: Optional[bytearray] = None
+        self._west: Optional[bytearray] = None
+        self._overflow: ScentSet = ScentSet()
+        self._count = 0
+
+    def _edge(self, x: int, y: int) -> Tuple[Optional[str], int]:
+        """Return the edge attribute name and index for a cell, if any."""
+        if 0 <= x <= self.max_x:
+            if y == self.max_y + 1:
+                return '_north', x
+            if y == -1:
+                return '_south', x
+        elif 0 <= y <= self.max_y:
+            if x == self.max_x + 1:
+                return '_east', y
+            if x == -1:
+                return '_west', y
+        return None, 0
+
+    def is_scented(self, x: int, y: int) -> bool:
+        """Check whether a position is scented."""
+        if 0 <= x <= self.max_x:
+            if y == self.max_y + 1:
+                bits = self._north
+            elif y == -1:
+                bits = self._south
+            else:
+                return self._overflow.is_scented(x, y)
+            return bits is not None and bits[x >> 3] >> (x & 7) & 1 == 1
+        if 0 <= y <= self.max_y:
+            if x == self.max_x + 1:
+                bits = self._east
+            elif x == -1:
+                bits = self._west
+            else:
+                return self._overflow.is_scented(x, y)
+            return bits is not None and bits[y >> 3] >> (y & 7) & 1 == 1
+        return self._overflow.is_scented(x, y)
+
+    def add_scent(self, x: int, y: int) -> None:
+        """Add a scent at a position."""
+        name, index = self._edge(x, y)
+        if name is None:
+            if not self._overflow.is_scented(x, y):
+                self._overflow.add_scent(x, y)
+                self._count += 1
+            return
+
+        bits = getattr(self, name)
+        if bits is None:
+            length = self.max_x + 1 if name in ('_north', '_south') else self.max_y + 1
+            bits = bytearray((length + 7) >> 3)
+            setattr(self, name, bits)
+        mask = 1 << (index & 7)
+        if not bits[index >> 3] & mask:
+            bits[index >> 3] |= mask
+            self._count += 1
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the bit vectors and overflow set."""
+        edges = (self._north, self._south, self._east, self._west)
+        return (sys.getsizeof(self)
+                + sum(sys.getsizeof(bits) for bits in edges if bits is not None)
+                + self._overflow.nbytes())
+
+    def __contains__(self, position) -> bool:
+        x, y = position
+        return self.is_scented(x, y)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        edges = (
+            (self._north, lambda i: (i, self.max_y + 1)),
+            (self._south, lambda i: (i, -1)),
+            (self._east, lambda i: (self.max_x + 1, i)),
+            (self._west, lambda i: (-1, i)),
+        )
+        for bits, position in edges:
+            if bits is None:
+                continue
+            for byte_index, byte in enumerate(bits):
+                while byte:
+                    low_bit = byte & -byte
+                    yield position((byte_index << 3) + low_bit.bit_length() - 1)
+                    byte ^= low_bit
+        yield from self._overflow
+
+
+class _Layer(NamedTuple):
+    """An immutable layer of scents shared by LayeredScentStore forks."""
+    scents: AbstractSet
+    parent: Optional['_Layer']
+    count: int  # scents in this layer and every ancestor
+
+
+class LayeredScentStore(AbstractSet):
+    """
+    Copy-on-write scent store for cheap what-if forks.
+
+    New scents go into a small private store on top of a chain of frozen
+    layers. fork() freezes the private store (without copying it) and
+    gives the fork its own empty one on top of the same chain, so forking
+    is O(1) and every fork records only the scents it adds itself. Layers
+    are never mutated once frozen. When a layer is frozen, it is merged
+    with smaller ancestors of the same class, so chains stay logarithmic
+    in the number of scents. Private stores are of layer_store's class,
+    so layering a PerimeterScentStore keeps every layer compact.
+    """
+
+    def __init__(self, max_x: int = 0, max_y: int = 0, parent: Optional[_Layer] = None,
+                 layer_store: Callable[[int, int], AbstractSet] = ScentSet):
+        """
+        Initialize a store on top of frozen layers.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+            parent: Frozen layers shared with other forks, if any
+            layer_store: Scent store class for the private layer
+        """
+        self.max_x = max_x
+        self.max_y = max_y
+        self._parent = parent
+        self._layer_store = layer_store
+        self._own = layer_store(max_x, max_y)
+
+    @classmethod
+    def on_top_of(cls, store: AbstractSet, max_x: int, max_y: int) -> 'LayeredScentStore':
+        """
+        Wrap an existing scent store as the bottom frozen layer.
+
+        The store is used in place, not copied, and must not be changed
+        afterwards. New layers use the same store class, except that a
+        ConcurrentScentStore gets plain ScentSet layers: layers are
+        private until frozen, so they need no locks.
+
+        Args:
+            store: Any scent store from SCENT_STORES
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+
+        Returns:
+            Layered store holding the same scents
+        """
+        layer_store = ScentSet if isinstance(store, ConcurrentScentStore) else type(store)
+        return cls(max_x, max_y, _Layer(store, None, len(store)), layer_store)
+
+    def fork(self) -> 'LayeredScentStore':
+        """
+        Freeze the scents added so far and return an independent fork.
+
+        Returns:
+            Store that sees the same scents now and records its own from here on
+        """
+        if self._own:
+            self._parent = _freeze(self._own, self._parent, self.max_x, self.max_y)
+            self._own = self._layer_store(self.max_x, self.max_y)
+        return LayeredScentStore(self.max_x, self.max_y, self._parent, self._layer_store)
+
+    def own_scents(self) -> AbstractSet:
+        """Scents added to this store since it was created or last forked."""
+        return self._own
+
+    def is_scented(self, x: int, y: int) -> bool:
+        """Check whether a position is scented in this store or its layers."""
+        if self._own.is_scented(x, y):
+            return True
+        layer = self._parent
+        while layer is not None:
+            if layer.scents.is_scented(x, y):
+                return True
+            layer = layer.parent
+        return False
+
+    def add_scent(self, x: int, y: int) -> None:
+        """Add a scent to this store only."""
+        if not self.is_scented(x, y):
+            self._own.add_scent(x, y)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the private set and every layer it sees."""
+        total = sys.getsizeof(self) + self._own.nbytes()
+        layer = self._parent
+        while layer is not None:
+            total += layer.scents.nbytes()
+            layer = layer.parent
+        return total
+
+    def __contains__(self, position) -> bool:
+        x, y = position
+        return self.is_scented(x, y)
+
+    def __len__(self) -> int:
+        return len(self._own) + (self._parent.count if self._parent is not None else 0)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        yield from self._own
+        layer = self._parent
+        while layer is not None:
+            yield from layer.scents
+            layer = layer.parent
+
+
+class ConcurrentScentStore(AbstractSet):
+    """
+    Thread-safe scent store for multi-threaded (including free-threaded) runs.
+
+    Scents are spread over a power-of-two number of stripes by cell, each
+    a ScentSet guarded by its own lock, so writers on different stripes
+    never contend. Lookups take no lock: a set membership test is atomic
+    on both GIL and free-threaded CPython, and scents are never removed,
+    so a scent seen once stays visible. claim() is an atomic test-and-set
+    for writers racing to leave the same scent.
+    """
+
+    def __init__(self, max_x: int = 0, max_y: int = 0, stripes: int = 64):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid (unused)
+            max_y: Maximum y-coordinate of the grid (unused)
+            stripes: Number of independently locked stripes (a power of two)
+        """
+        if stripes < 1 or stripes & (stripes - 1):
+            raise ValueError("stripes must be a power of two")
+        self.max_x = max_x
+        self.max_y = max_y
+        self._mask = stripes - 1
+        self._stripes = [ScentSet() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def is_scented(self, x: int, y: int) -> bool:
+        """Check whether a position is scented."""
+        return (x, y) in self._stripes[(x * 31 + y) & self._mask]
+
+    def claim(self, x: int, y: int) -> bool:
+        """
+        Add a scent unless it is already present, atomically.
+
+        Returns:
+            True if this call added the scent
+        """
+        index = (x * 31 + y) & self._mask
+        scents = self._stripes[index]
+        with self._locks[index]:
+            if (x, y) in scents:
+                return False
+            scents.add((x, y))
+            return True
+
+    def add_scent(self, x: int, y: int) -> None:
+        """Add a scent at a position."""
+        self.claim(x, y)
+
+    def copy(self) -> 'ConcurrentScentStore':
+        """Return an independent store with the same scents and striping."""
+        copied = ConcurrentScentStore(self.max_x, self.max_y, len(self._stripes))
+        for index, lock in enumerate(self._locks):
+            with lock:
+                copied._stripes[index] |= self._stripes[index]
+        return copied
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the stripes and their locks."""
+        total = sys.getsizeof(self) + sys.getsizeof(self._stripes) + sys.getsizeof(self._locks)
+        for scents, lock in zip(self._stripes, self._locks):
+            with lock:
+                total += scents.nbytes() + sys.getsizeof(lock)
+        return total
+
+    def __contains__(self, position) -> bool:
+        x, y = position
+        return self.is_scented(x, y)
+
+    def __len__(self) -> int:
+        return sum(len(scents) for scents in self._stripes)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        # Copy each stripe under its lock so concurrent writers cannot
+        # change a set while it is being iterated
+        for scents, lock in zip(self._stripes, self._locks):
+            with lock:
+                positions = tuple(scents)
+            yield from positions
+
+
+def _freeze(scents: AbstractSet, parent: Optional[_Layer], max_x: int, max_y: int) -> _Layer:
+    """Push scents as a frozen layer, merging ancestors of its class that are not much larger."""
+    while (parent is not None and type(parent.scents) is type(scents)
+           and len(parent.scents) <= 2 * len(scents)):
+        if isinstance(scents, ScentSet):
+            merged = ScentSet()
+            merged |= parent.scents
+            merged |= scents
+        else:
+            merged = type(scents)(max_x, max_y)
+            for x, y in chain(parent.scents, scents):
+                merged.add_scent(x, y)
+        scents, parent = merged, parent.parent
+    return _Layer(scents, parent, len(scents) + (parent.count if parent is not None else 0))
+
+
+# Scent store implementations selectable by name from Grid
+SCENT_STORES = {
+    'set': ScentSet,
+    'perimeter': PerimeterScentStore,
+    'layered': LayeredScentStore,
+    'concurrent': ConcurrentScentStore,
+}
@@ -0,0 +1,301 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple
+from .parser import parse_grid_dimensions
+from .robot import heading_from_orientation
+from .simulator import Simulator
+
+
+# Protocol
+# --------
+# A connection carries one mission in the stdin format. The first line is
+# "max_x max_y" optionally followed by a grid name ("5 3 alpha"); robots
+# sent under the same name share one warm Simulator and therefore its
+# scents. Every following pair of lines is a robot, answered with one
+# result line in order. A malformed request is answered with a single
+# "ERROR <message>" line, after which the connection is closed.
+
+RobotData = Tuple[int, int, str, str]
+
+# Longest request line accepted, in bytes. asyncio's default StreamReader
+# limit (64 KiB) would reject long instruction strings.
+LINE_LIMIT = 1 << 28
+
+
+class GridWorker:
+    """
+    Serializes robots for one named grid and batches them.
+
+    Robots from every connection using the grid go through a single bounded
+    queue. One task drains it, handing up to max_batch queued robots at a
+    time to Simulator.process_multiple_robots in a worker thread, so scents
+    behave exactly as if the robots had been sent in one stdin mission.
+    The warm simulator stays in this process; batches are not shipped to
+    worker processes, because that would copy the grid's scents each time.
+    """
+
+    def __init__(self, simulator: Simulator, max_batch: int, queue_size: int):
+        """
+        Initialize the worker.
+
+        Args:
+            simulator: Warm simulator for the grid
+            max_batch: Maximum number of robots per process_multiple_robots call
+            queue_size: Maximum number of queued robots before senders wait
+        """
+        self.simulator = simulator
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.batches = 0
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, robot: RobotData) -> asyncio.Future:
+        """
+        Queue a robot, waiting while the queue is full.
+
+        Args:
+            robot: Tuple of (start_x, start_y, orientation, instructions)
+
+        Returns:
+            Future resolved with the robot's result string
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((robot, future))
+        return future
+
+    async def _run(self) -> None:
+        """Drain the queue in batches, one batch at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            robots = [robot for robot, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    None, self.simulator.process_multiple_robots, robots)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class MissionServer:
+    """
+    Asyncio mission service keeping warm simulators per named grid.
+
+    Each grid runs its batches on the event loop's default thread pool, so
+    a long batch never blocks other connections. Batches for different
+    grids only run in parallel on free-threaded (no-GIL) builds (see
+    threaded.gil_enabled); under the GIL they take turns, so run several
+    servers to use more cores. Robots on the same grid are serialized
+    through its GridWorker. Backpressure is applied at two
+    points: a connection stops reading once max_pending of its results are
+    outstanding, and senders wait while a grid's queue is full.
+    """
+
+    def __init__(self, engine: str = 'reference', max_batch: int = 1024,
+                 queue_size: int = 4096, max_pending: int = 1024, line_limit: int = LINE_LIMIT):
+        """
+        Initialize the server.
+
+        Args:
+            engine: Simulator engine for new grids
+            max_batch: Maximum robots per simulator call
+            queue_size: Maximum queued robots per grid
+            max_pending: Maximum unanswered robots per connection
+            line_limit: Longest request line accepted, in bytes
+        """
+        self.engine = engine
+        self.line_limit = line_limit
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.max_pending = max_pending
+        self.workers: Dict[str, GridWorker] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0) -> Tuple[str, int]:
+        """
+        Listen on a TCP socket.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+
+        Returns:
+            The bound (host, port)
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=self.line_limit)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path: str) -> None:
+        """
+        Listen on a Unix domain socket.
+
+        Args:
+            path: Socket file path
+        """
+        self._servers.append(await asyncio.start_unix_server(self.handle_connection, path,
+                                                             limit=self.line_limit))
+
+    async def close(self) -> None:
+        """Stop listening and shut down the grid workers."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        for worker in self.workers.values():
+            worker.task.cancel()
+        await asyncio.gather(*(worker.task for worker in self.workers.values()),
+                             return_exceptions=True)
+
+    def get_worker(self, name: str, max_x: int, max_y: int) -> GridWorker:
+        """
+        Return the worker for a named grid, creating it on first use.
+
+        Args:
+            name: Grid name
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+
+        Returns:
+            GridWorker for the grid
+
+        Raises:
+            ValueError: If the grid exists with different dimensions
+        """
+        worker = self.workers.get(name)
+        if worker is None:
+            simulator = Simulator(max_x, max_y, engine=self.engine)
+            worker = GridWorker(simulator, self.max_batch, self.queue_size)
+            self.workers[name] = worker
+        elif (worker.simulator.grid.max_x, worker.simulator.grid.max_y) != (max_x, max_y):
+            raise ValueError(f"Grid {name} already exists with different dimensions")
+        return worker
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve one mission connection."""
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        responder = asyncio.get_running_loop().create_task(self._respond(pending, writer))
+        try:
+            await self._read_mission(reader, pending)
+        except ValueError as e:
+            await pending.put(f"ERROR {e}")
+        except ConnectionError:
+            pass
+        await pending.put(None)
+        try:
+            await responder
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_mission(self, reader: asyncio.StreamReader, pending: asyncio.Queue) -> None:
+        """Parse a mission from the connection and queue its robots."""
+        header = (await self._readline(reader)).decode()
+        if not header:
+            raise ValueError("No input provided")
+        tokens = header.split()
+        max_x, max_y = parse_grid_dimensions(' '.join(tokens[:2]))
+        name = tokens[2] if len(tokens) > 2 else f"{max_x}x{max_y}"
+        if len(tokens) > 3:
+            raise ValueError("Invalid grid dimensions format")
+        worker = self.get_worker(name, max_x, max_y)
+
+        line_number = 2
+        while True:
+            position_line = await self._readline(reader)
+            if not position_line:
+                return
+            instructions_line = await self._readline(reader)
+            if not instructions_line:
+                raise ValueError("Incomplete robot data")
+
+            try:
+                x, y, orientation = position_line.decode().split()
+                robot = (int(x), int(y), orientation, instructions_line.decode().strip())
+                heading_from_orientation(orientation)
+            except ValueError:
+                raise ValueError(f"Invalid robot position format at line {line_number}")
+
+            await pending.put(await worker.submit(robot))
+            line_number += 2
+
+    async def _readline(self, reader: asyncio.StreamReader) -> bytes:
+        """Read one request line, reporting lines over the limit clearly."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            # StreamReader.readline reports an overrun as a bare ValueError
+            raise ValueError(f"Line longer than {self.line_limit} bytes")
+
+    async def _respond(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """Write results back in request order."""
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            if isinstance(item, str):
+                writer.write(f"{item}\n".encode())
+            else:
+                try:
+                    result = await item
+                except Exception as e:
+                    result = f"ERROR {e}"
+                writer.write(f"{result}\n".encode())
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+        await writer.drain()
+
+
+async def send_mission(lines: Iterable[str], host: str = '127.0.0.1', port: Optional[int] = None,
+                       path: Optional[str] = None) -> List[str]:
+    """
+    Local test client: send one mission and collect the result lines.
+
+    Requests are written while responses are being read, so the client
+    keeps working when the server applies backpressure.
+
+    Args:
+        lines: Mission lines in the stdin format
+        host: Server host for TCP
+        port: Server port for TCP
+        path: Unix socket path (used instead of host/port when given)
+
+    Returns:
+        Result lines returned by the server
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def send() -> None:
+        for line in lines:
+            writer.write(line.encode() if line.endswith('\n') else f"{line}\n".encode())
+            await writer.drain()
+        writer.write_eof()
+
+    sender = asyncio.get_running_loop().create_task(send())
+    results = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        results.append(line.decode().rstrip('\n'))
+    try:
+        await sender
+    except ConnectionError:
+        pass
+    writer.close()
+    return results
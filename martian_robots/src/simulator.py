@@ -1,6 +1,24 @@
-from typing import List, Tuple
-from .robot import Robot
-from .grid import Grid
+import copy
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .robot import DX, DY, TURN_LEFT, TURN_RIGHT, Robot, format_state, heading_from_orientation
+from .cache import CacheEntry, ResultCache
+from .columnar import MissionColumns, ResultColumns, empty_results
+from .grid import Grid, RecordingGrid
+from .fleet import Fleet
+from .program import Program, compile_instructions, run_program
+from .repeat import iter_instructions, parse_repeats, run_repeated
+from .stats import SimulationStats
+from .terrain import Terrain
+from .analytics import TrafficAnalytics
+from .trajectory import BLOCKED, LOST, MOVE, START, TURN, TrajectoryRecorder
+from .vectorized import VECTORIZE_THRESHOLD, np, run_vectorized
+
+
+# Available execution engines. "reference" walks instructions one character
+# at a time through Robot; "compiled" runs run-length compiled segments;
+# "fast" walks characters with plain int state and table lookups.
+ENGINES = ('reference', 'compiled', 'fast')
 
 
 class Simulator:
@@ -12,15 +30,58 @@ class Simulator:
     scented positions.
     """
     
-    def __init__(self, max_x: int, max_y: int):
+    def __init__(self, max_x: int, max_y: int, engine: str = 'reference',
+                 scent_store: str = 'set', stats: Optional[SimulationStats] = None,
+                 cache: Optional[ResultCache] = None,
+                 vectorize_threshold: Optional[int] = VECTORIZE_THRESHOLD,
+                 recorder: Optional[TrajectoryRecorder] = None,
+                 occupancy: Optional[str] = None, collision_policy: str = 'ignore',
+                 analytics: Optional[TrafficAnalytics] = None,
+                 terrain: Optional[Terrain] = None, terrain_policy: str = 'ignore'):
         """
         Initialize the simulator with grid dimensions.
         
         Args:
             max_x: Maximum x-coordinate of the grid
             max_y: Maximum y-coordinate of the grid
+            engine: Execution engine, one of ENGINES
+            scent_store: Scent store used by the grid (see Grid)
+            stats: Optional metrics collector; when given, robots run
+                through an instrumented reference loop
+            cache: Optional result cache for repeated start states and
+                instruction strings
+            vectorize_threshold: Instruction strings at least this long use
+                the NumPy engine when numpy is installed (None disables it)
+            recorder: Optional trajectory recorder receiving every state
+                each robot passes through
+            occupancy: Occupancy index enabling collisions with parked
+                robots ('hash' or 'bitmap', see Grid); None disables them
+            collision_policy: 'ignore' skips an F into an occupied cell,
+                'stop' ends the robot's run there
+            analytics: Optional traffic analytics; when given, robots run
+                through the compiled engine, which reports every F run
+            terrain: Optional obstacle layer (see terrain.Terrain)
+            terrain_policy: 'ignore' skips an F into an obstacle, 'stop'
+                ends the robot's run there
         """
-        self.grid = Grid(max_x, max_y)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if (occupancy is not None or terrain is not None) and (
+                stats is not None or cache is not None or recorder is not None or analytics is not None):
+            raise ValueError("Collision mode and terrain cannot be combined with stats, cache, "
+                             "trajectory recording or analytics")
+        if analytics is not None and (stats is not None or recorder is not None or cache is not None):
+            # The stats and recording loops run before, and instead of, the analytics
+            # engine; the analytics engine in turn runs before the cache
+            raise ValueError("Analytics cannot be combined with stats, cache or trajectory recording")
+        self.grid = Grid(max_x, max_y, scent_store, occupancy, collision_policy, terrain, terrain_policy)
+        self.engine = engine
+        self.robots_processed = 0
+        self.stats = stats
+        self.cache = cache
+        self.vectorize_threshold = vectorize_threshold if np is not None else None
+        self.recorder = recorder
+        self.analytics = analytics
     
     def process_robot(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
         """
@@ -30,11 +91,63 @@ class Simulator:
             start_x: Starting x-coordinate of the robot
             start_y: Starting y-coordinate of the robot
             orientation: Starting orientation ('N', 'S', 'E', 'W')
-            instructions: String of instructions ('L', 'R', 'F')
+            instructions: String of instructions ('L', 'R', 'F'), optionally
+                with repeat groups such as '(FRFRF)1000000' (see repeat.py)
             
         Returns:
             String representation of the robot's final state
         """
+        self.robots_processed += 1
+        if self.stats is not None:
+            return self._run_with_stats(start_x, start_y, orientation, iter_instructions(instructions))
+        if self.recorder is not None:
+            return self._run_recorded(start_x, start_y, orientation, iter_instructions(instructions))
+        if self.analytics is not None:
+            return self._run_with_analytics(start_x, start_y, orientation, instructions)
+        if self.cache is not None:
+            return self._run_cached(start_x, start_y, orientation, instructions)
+        if self.grid.has_obstacles:
+            return self._run_with_obstacles(start_x, start_y, orientation,
+                                            iter_instructions(instructions))
+        return self._run_engine(start_x, start_y, orientation, instructions)
+    
+    def _run_engine(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run instructions with the selected engine."""
+        if '(' in instructions:
+            heading = heading_from_orientation(orientation)
+            return format_state(*run_repeated(self.grid, start_x, start_y, heading,
+                                              parse_repeats(instructions)))
+        if self.vectorize_threshold is not None and len(instructions) >= self.vectorize_threshold:
+            heading = heading_from_orientation(orientation)
+            return format_state(*run_vectorized(self.grid, start_x, start_y, heading, instructions))
+        if self.engine == 'fast':
+            return self._run_fast(start_x, start_y, orientation, instructions)
+        if self.engine == 'compiled':
+            return self._run_program(start_x, start_y, orientation,
+                                     compile_instructions(instructions))
+        return self._run_reference(start_x, start_y, orientation, instructions)
+    
+    def _run_cached(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Serve a robot from the result cache, recording its scent accesses on a miss."""
+        grid = self.grid
+        key = (grid.max_x, grid.max_y, start_x, start_y, orientation, instructions)
+        entry = self.cache.lookup(grid, key)
+        if entry is not None:
+            for x, y in entry.writes:
+                grid.add_scent(x, y)
+            return entry.result
+        
+        epoch = grid.scent_epoch
+        self.grid = recorder = RecordingGrid(grid)
+        try:
+            result = self._run_engine(start_x, start_y, orientation, instructions)
+        finally:
+            self.grid = grid
+        self.cache.store(key, CacheEntry(result, epoch, *recorder.take_log()))
+        return result
+    
+    def _run_reference(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run instructions one character at a time through a Robot."""
         robot = Robot(start_x, start_y, orientation)
         
         for instruction in instructions:
@@ -51,6 +164,280 @@ class Simulator:
         
         return str(robot)
     
+    def _run_fast(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run instructions with local int state, rotation tables and inlined bounds."""
+        heading = heading_from_orientation(orientation)
+        return format_state(*self._fast_state(start_x, start_y, heading, instructions))
+    
+    def _fast_state(self, x: int, y: int, heading: int, instructions: str) -> Tuple[int, int, int, bool]:
+        """Run the fast engine and return (x, y, heading, is_lost) unformatted."""
+        grid = self.grid
+        max_x, max_y = grid.max_x, grid.max_y
+        
+        for instruction in instructions:
+            if instruction == 'F':
+                next_x, next_y = x + DX[heading], y + DY[heading]
+                if 0 <= next_x <= max_x and 0 <= next_y <= max_y:
+                    x, y = next_x, next_y
+                elif not grid.is_position_scented(next_x, next_y):
+                    grid.add_scent(next_x, next_y)
+                    return x, y, heading, True
+            elif instruction == 'L':
+                heading = TURN_LEFT[heading]
+            elif instruction == 'R':
+                heading = TURN_RIGHT[heading]
+        
+        return x, y, heading, False
+    
+    def _run_with_obstacles(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run the fast loop with terrain and occupancy checks, then park the robot if it survived."""
+        grid = self.grid
+        is_blocked = grid.terrain.is_blocked if grid.terrain is not None else None
+        is_occupied = grid.occupancy.is_occupied if grid.occupancy is not None else None
+        stop_at_terrain = grid.terrain_policy == 'stop'
+        stop_at_robot = grid.collision_policy == 'stop'
+        max_x, max_y = grid.max_x, grid.max_y
+        x, y = start_x, start_y
+        heading = heading_from_orientation(orientation)
+        
+        for instruction in instructions:
+            if instruction == 'F':
+                next_x, next_y = x + DX[heading], y + DY[heading]
+                if 0 <= next_x <= max_x and 0 <= next_y <= max_y:
+                    if is_blocked is not None and is_blocked(next_x, next_y):
+                        if stop_at_terrain:
+                            break
+                    elif is_occupied is not None and is_occupied(next_x, next_y):
+                        if stop_at_robot:
+                            break
+                    else:
+                        x, y = next_x, next_y
+                elif not grid.is_position_scented(next_x, next_y):
+                    grid.add_scent(next_x, next_y)
+                    return format_state(x, y, heading, True)
+            elif instruction == 'L':
+                heading = TURN_LEFT[heading]
+            elif instruction == 'R':
+                heading = TURN_RIGHT[heading]
+        
+        grid.park(x, y)
+        return format_state(x, y, heading, False)
+    
+    def _run_with_stats(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run the reference loop while recording metrics into self.stats."""
+        stats = self.stats
+        counts = stats.instructions
+        started = time.perf_counter()
+        robot = Robot(start_x, start_y, orientation)
+        executed = 0
+        
+        for instruction in instructions:
+            if robot.is_lost:
+                stats.early_exits += 1
+                break
+            executed += 1
+            
+            if instruction == 'L':
+                counts['L'] += 1
+                robot.turn_left()
+            elif instruction == 'R':
+                counts['R'] += 1
+                robot.turn_right()
+            elif instruction == 'F':
+                counts['F'] += 1
+                position = robot.get_position()
+                self._process_forward_movement(robot)
+                if robot.is_lost:
+                    stats.losses += 1
+                elif robot.get_position() == position:
+                    stats.scent_hits += 1
+                else:
+                    stats.forward_moves += 1
+            else:
+                counts['other'] += 1
+        
+        simulated = time.perf_counter()
+        result = str(robot)
+        stats.record_robot(executed, simulated - started, time.perf_counter() - simulated)
+        return result
+    
+    def _run_recorded(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run instructions one at a time, streaming each state to self.recorder."""
+        grid = self.grid
+        record = self.recorder.record
+        x, y = start_x, start_y
+        heading = heading_from_orientation(orientation)
+        is_lost = False
+        
+        self.recorder.begin_robot()
+        record(x, y, heading, START)
+        for instruction in instructions:
+            if instruction == 'L':
+                heading = TURN_LEFT[heading]
+                record(x, y, heading, TURN)
+            elif instruction == 'R':
+                heading = TURN_RIGHT[heading]
+                record(x, y, heading, TURN)
+            elif instruction == 'F':
+                next_x, next_y = x + DX[heading], y + DY[heading]
+                if not grid.would_fall_off(next_x, next_y):
+                    x, y = next_x, next_y
+                    record(x, y, heading, MOVE)
+                elif grid.is_position_scented(next_x, next_y):
+                    record(x, y, heading, BLOCKED)
+                else:
+                    grid.add_scent(next_x, next_y)
+                    record(x, y, heading, LOST)
+                    is_lost = True
+                    break
+        self.recorder.end_robot()
+        
+        return format_state(x, y, heading, is_lost)
+    
+    def fork(self) -> 'Simulator':
+        """
+        Return a what-if copy of the simulator in O(1).
+        
+        The fork starts with the same scents and robot count but commits
+        nothing back (see Grid.fork). It keeps the engine and shares the
+        result cache, which stays correct because scent epochs are unique
+        across grids, so entries are revalidated on the grid they are
+        replayed on. Stats, analytics
+        and the trajectory recorder are not carried over.
+        
+        Returns:
+            Independent Simulator
+        """
+        forked = copy.copy(self)
+        forked.grid = self.grid.fork()
+        forked.stats = None
+        forked.recorder = None
+        forked.analytics = None
+        return forked
+    
+    def dry_run(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """
+        Process a robot without committing its scent or counting it.
+        
+        Args:
+            start_x: Starting x-coordinate of the robot
+            start_y: Starting y-coordinate of the robot
+            orientation: Starting orientation ('N', 'S', 'E', 'W')
+            instructions: String of instructions, as for process_robot
+            
+        Returns:
+            The final state process_robot would return now
+        """
+        return self.fork().process_robot(start_x, start_y, orientation, instructions)
+    
+    def _run_with_analytics(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Run a compiled program that reports its F runs to self.analytics."""
+        if '(' in instructions:
+            instructions = ''.join(iter_instructions(instructions))
+        heading = heading_from_orientation(orientation)
+        self.analytics.start(start_x, start_y)
+        return format_state(*run_program(self.grid, start_x, start_y, heading,
+                                         compile_instructions(instructions), self.analytics))
+    
+    def process_program(self, start_x: int, start_y: int, orientation: str, program: Program) -> str:
+        """
+        Process a single robot running a precompiled program.
+        
+        Compiling once with compile_instructions and reusing the program
+        avoids recompiling instruction strings shared by many robots.
+        
+        Args:
+            start_x: Starting x-coordinate of the robot
+            start_y: Starting y-coordinate of the robot
+            orientation: Starting orientation ('N', 'S', 'E', 'W')
+            program: Segments from compile_instructions
+            
+        Returns:
+            String representation of the robot's final state
+            
+        Raises:
+            ValueError: If collision or terrain mode is enabled
+        """
+        if self.grid.has_obstacles:
+            raise ValueError("Compiled programs do not support collision mode or terrain")
+        self.robots_processed += 1
+        return self._run_program(start_x, start_y, orientation, program)
+    
+    def _run_program(self, start_x: int, start_y: int, orientation: str, program: Program) -> str:
+        """Run a compiled program with segment jumps."""
+        heading = heading_from_orientation(orientation)
+        return format_state(*run_program(self.grid, start_x, start_y, heading, program))
+    
+    def process_columns(self, mission: MissionColumns, start: int = 0) -> ResultColumns:
+        """
+        Process a columnar mission and return columnar results.
+        
+        Robots run on integer state and no result strings are built. The
+        compiled engine runs compiled programs; the other engines share the
+        fast loop, which gives identical results. Stats, cache and
+        trajectory recording are string based, so when any of them is
+        enabled, or obstacles are on, robots go through process_robot
+        instead.
+        
+        Args:
+            mission: Mission columns (see columnar.MissionColumns)
+            start: Index of the first robot to process
+            
+        Returns:
+            Final states of the processed robots
+        """
+        results = empty_results()
+        append = results.append
+        if (self.stats is not None or self.recorder is not None or self.cache is not None
+                or self.analytics is not None or self.grid.has_obstacles):
+            for line in self.iter_results(mission.robots(start)):
+                x, y, orientation = line.split()[:3]
+                append(int(x), int(y), heading_from_orientation(orientation), line.endswith('LOST'))
+            return results
+        
+        grid = self.grid
+        offsets, blob = mission.offsets, mission.instructions
+        threshold = self.vectorize_threshold
+        compiled = self.engine == 'compiled'
+        for index in range(start, len(mission)):
+            x, y, heading = mission.xs[index], mission.ys[index], mission.headings[index]
+            instructions = str(blob[offsets[index]:offsets[index + 1]], 'latin-1')
+            if '(' in instructions:
+                append(*run_repeated(grid, x, y, heading, parse_repeats(instructions)))
+            elif threshold is not None and len(instructions) >= threshold:
+                append(*run_vectorized(grid, x, y, heading, instructions))
+            elif compiled:
+                append(*run_program(grid, x, y, heading, compile_instructions(instructions)))
+            else:
+                append(*self._fast_state(x, y, heading, instructions))
+        self.robots_processed += len(results)
+        return results
+    
+    def process_lockstep(self, robot_data: Iterable[Tuple[int, int, str, str]]) -> List[str]:
+        """
+        Process robots simultaneously, one instruction per robot per tick.
+        
+        Requires numpy. See fleet.Fleet for how same-tick losses are ordered.
+        Repeat groups are expanded, since every robot advances one
+        instruction per tick.
+        
+        Args:
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+            
+        Returns:
+            List of final states for each robot
+            
+        Raises:
+            ValueError: If collision or terrain mode is enabled
+        """
+        if self.grid.has_obstacles:
+            raise ValueError("Lockstep processing does not support collision mode or terrain")
+        robot_data = ((start_x, start_y, orientation, ''.join(iter_instructions(instructions)))
+                      for start_x, start_y, orientation, instructions in robot_data)
+        results = Fleet(self.grid, robot_data).run()
+        self.robots_processed += len(results)
+        return results
+    
     def _process_forward_movement(self, robot: Robot) -> None:
         """
         Process a forward movement instruction for a robot.
@@ -78,7 +465,24 @@ class Simulator:
             # Safe to move
             robot.move_forward()
     
-    def process_multiple_robots(self, robot_data: List[Tuple[int, int, str, str]]) -> List[str]:
+    def iter_results(self, robot_data: Iterable[Tuple[int, int, str, str]]) -> Iterator[str]:
+        """
+        Lazily process robots and yield each final state as soon as it is known.
+        
+        Robots are still processed strictly in order, so the scent mechanism
+        behaves exactly as in process_multiple_robots.
+        
+        Args:
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+            
+        Yields:
+            Final state of each robot, in input order
+        """
+        process_robot = self.process_robot
+        for start_x, start_y, orientation, instructions in robot_data:
+            yield process_robot(start_x, start_y, orientation, instructions)
+    
+    def process_multiple_robots(self, robot_data: Iterable[Tuple[int, int, str, str]]) -> List[str]:
         """
         Process multiple robots sequentially.
         
@@ -88,8 +492,4 @@ class Simulator:
         Returns:
             List of final states for each robot
         """
-        results = []
-        for start_x, start_y, orientation, instructions in robot_data:
-            result = self.process_robot(start_x, start_y, orientation, instructions)
-            results.append(result)
-        return results 
\ No newline at end of file
+        return list(self.iter_results(robot_data))
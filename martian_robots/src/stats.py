@@ -0,0 +1,166 @@
+import json
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Sequence, TypeVar
+
+
+T = TypeVar('T')
+
+# Histogram upper bounds: robot latency in seconds, and instructions
+# executed per robot. A final +Inf bucket is implied.
+LATENCY_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 1e-1, 1.0)
+INSTRUCTION_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class Histogram:
+    """Cumulative-friendly histogram with fixed upper bounds."""
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds: Sorted bucket upper bounds
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return bucket bounds, per-bucket counts, sum and count."""
+        return {
+            'bounds': list(self.bounds),
+            'counts': list(self.counts),
+            'sum': self.total,
+            'count': self.count,
+        }
+
+
+class SimulationStats:
+    """
+    Opt-in runtime metrics for a Simulator.
+
+    Pass an instance as Simulator(stats=...) to collect instruction counts,
+    forward-move outcomes, losses, early exits from lost robots, phase
+    timings and per-robot histograms. A simulator without stats never
+    touches this class, so there is no cost when metrics are disabled.
+    """
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.robots = 0
+        self.instructions: Dict[str, int] = {'L': 0, 'R': 0, 'F': 0, 'other': 0}
+        self.forward_moves = 0
+        self.scent_hits = 0
+        self.losses = 0
+        self.early_exits = 0
+        self.phase_seconds: Dict[str, float] = {'parse': 0.0, 'simulate': 0.0, 'format': 0.0}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.instructions_per_robot = Histogram(INSTRUCTION_BUCKETS)
+
+    def record_robot(self, instructions: int, simulate_seconds: float, format_seconds: float) -> None:
+        """
+        Record the totals for one finished robot.
+
+        Args:
+            instructions: Number of instructions executed
+            simulate_seconds: Time spent executing instructions
+            format_seconds: Time spent formatting the result
+        """
+        self.robots += 1
+        self.phase_seconds['simulate'] += simulate_seconds
+        self.phase_seconds['format'] += format_seconds
+        self.latency.observe(simulate_seconds + format_seconds)
+        self.instructions_per_robot.observe(instructions)
+
+    def timed(self, items: Iterable[T], phase: str = 'parse') -> Iterator[T]:
+        """
+        Wrap an iterable, charging the time spent producing items to a phase.
+
+        Args:
+            items: Iterable to wrap (e.g. a lazy robot parser)
+            phase: Name of the phase to charge
+
+        Yields:
+            The items of the iterable
+        """
+        iterator = iter(items)
+        self.phase_seconds.setdefault(phase, 0.0)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.phase_seconds[phase] += time.perf_counter() - start
+                return
+            self.phase_seconds[phase] += time.perf_counter() - start
+            yield item
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return every metric as plain Python data."""
+        return {
+            'robots': self.robots,
+            'instructions': dict(self.instructions),
+            'forward_moves': self.forward_moves,
+            'scent_hits': self.scent_hits,
+            'losses': self.losses,
+            'early_exits': self.early_exits,
+            'phase_seconds': dict(self.phase_seconds),
+            'latency_seconds': self.latency.as_dict(),
+            'instructions_per_robot': self.instructions_per_robot.as_dict(),
+        }
+
+    def to_json(self) -> str:
+        """Dump the metrics as JSON."""
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = 'martian_robots') -> str:
+        """
+        Dump the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+
+        def counter(name: str, help_text: str, samples: Dict[str, float]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in samples.items():
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        counter('robots_total', "Robots simulated.", {'': self.robots})
+        counter('instructions_total', "Instructions executed by type.",
+                {f'{{type="{kind}"}}': count for kind, count in self.instructions.items()})
+        counter('forward_moves_total', "Forward moves that changed position.", {'': self.forward_moves})
+        counter('scent_hits_total', "Forward moves ignored because of a scent.", {'': self.scent_hits})
+        counter('losses_total', "Robots lost off the grid.", {'': self.losses})
+        counter('early_exits_total', "Lost robots with instructions left unexecuted.",
+                {'': self.early_exits})
+        counter('phase_seconds_total', "Time spent per phase.",
+                {f'{{phase="{phase}"}}': seconds for phase, seconds in self.phase_seconds.items()})
+
+        for name, help_text, histogram in (
+            ('robot_latency_seconds', "Time to simulate and format one robot.", self.latency),
+            ('robot_instructions', "Instructions executed per robot.", self.instructions_per_robot),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            cumulative = 0
+            for bound, count in zip(list(histogram.bounds) + ['+Inf'], histogram.counts):
+                cumulative += count
+                lines.append(f'{prefix}_{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_{name}_sum {histogram.total}")
+            lines.append(f"{prefix}_{name}_count {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,194 @@
+import mmap
+import struct
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# Binary terrain layout (little-endian): magic b'MRTR', u16 version,
+# i64 max_x, i64 max_y, then one bit per cell, cell = x * (max_y + 1) + y,
+# least significant bit first within each byte; a set bit is an obstacle
+MAGIC = b'MRTR'
+VERSION = 1
+_HEADER = struct.Struct('<4sHqq')
+
+# ASCII maps: one line per row, north (y = max_y) first; '#' marks an
+# obstacle and '.' open ground
+BLOCKED = '#'
+OPEN = '.'
+
+
+class Terrain:
+    """
+    Read-only obstacle layer stored as a packed bitmap.
+
+    One bit per cell keeps a grid with hundreds of millions of cells
+    within tens of megabytes. Binary terrain files are memory-mapped, so
+    only the pages robots actually touch are read from disk. A lookup is
+    one index computation, one byte read and a shift.
+    """
+
+    def __init__(self, max_x: int, max_y: int, bits, source: Optional[mmap.mmap] = None):
+        """
+        Wrap a packed bitmap.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+            bits: Bytes-like bitmap of at least ((max_x + 1) * (max_y + 1) + 7) // 8 bytes
+            source: Mapping backing bits, released by close()
+        """
+        self.max_x = max_x
+        self.max_y = max_y
+        self._height = max_y + 1
+        if len(bits) < ((max_x + 1) * self._height + 7) >> 3:
+            raise ValueError("Terrain bitmap is smaller than the grid")
+        self._bits = bits
+        self._source = source
+
+    @classmethod
+    def from_cells(cls, max_x: int, max_y: int, cells: Iterable[Tuple[int, int]]) -> 'Terrain':
+        """
+        Build terrain from obstacle positions.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+            cells: Blocked (x, y) positions within the grid
+
+        Returns:
+            Terrain with those cells blocked
+        """
+        height = max_y + 1
+        bits = bytearray(((max_x + 1) * height + 7) >> 3)
+        for x, y in cells:
+            if not (0 <= x <= max_x and 0 <= y <= max_y):
+                raise ValueError(f"Obstacle ({x}, {y}) is outside the grid")
+            cell = x * height + y
+            bits[cell >> 3] |= 1 << (cell & 7)
+        return cls(max_x, max_y, bits)
+
+    @classmethod
+    def from_array(cls, blocked) -> 'Terrain':
+        """
+        Build terrain from a NumPy bool array indexed as blocked[x, y].
+
+        Args:
+            blocked: Array of shape (max_x + 1, max_y + 1)
+
+        Returns:
+            Terrain packing the array into bits
+        """
+        if np is None:
+            raise ImportError("Building terrain from arrays requires numpy")
+        width, height = blocked.shape
+        bits = np.packbits(np.ascontiguousarray(blocked, dtype=bool).ravel(), bitorder='little')
+        return cls(width - 1, height - 1, bytearray(bits.tobytes()))
+
+    @classmethod
+    def from_ascii(cls, lines: Iterable[str]) -> 'Terrain':
+        """
+        Parse an ASCII map; its size gives the grid dimensions.
+
+        Args:
+            lines: Map rows, north first
+
+        Returns:
+            Parsed terrain
+
+        Raises:
+            ValueError: If rows differ in length or contain other characters
+        """
+        rows = [line.rstrip('\r\n') for line in lines if line.strip()]
+        if not rows:
+            raise ValueError("Empty terrain map")
+        width = len(rows[0])
+        cells: List[Tuple[int, int]] = []
+        for row_number, row in enumerate(rows):
+            if len(row) != width or row.strip(BLOCKED + OPEN):
+                raise ValueError(f"Invalid terrain map row {row_number + 1}")
+            y = len(rows) - 1 - row_number
+            cells.extend((x, y) for x, cell in enumerate(row) if cell == BLOCKED)
+        return cls.from_cells(width - 1, len(rows) - 1, cells)
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Check whether an in-bounds cell holds an obstacle."""
+        cell = x * self._height + y
+        return self._bits[cell >> 3] >> (cell & 7) & 1 == 1
+
+    def count(self) -> int:
+        """Number of blocked cells."""
+        size = ((self.max_x + 1) * self._height + 7) >> 3
+        if np is not None:
+            return int(np.unpackbits(np.frombuffer(self._bits, dtype=np.uint8, count=size)).sum())
+        return sum(bin(byte).count('1') for byte in self._bits[:size])
+
+    def nbytes(self) -> int:
+        """Size of the bitmap in bytes (mapped, not necessarily resident)."""
+        return len(self._bits)
+
+    def close(self) -> None:
+        """Release a memory-mapped bitmap."""
+        if self._source is not None:
+            self._bits.release()
+            self._source.close()
+            self._source = None
+
+    def __enter__(self) -> 'Terrain':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_terrain(path: str, terrain: Terrain) -> None:
+    """
+    Write terrain in the binary format.
+
+    Args:
+        path: Destination file
+        terrain: Terrain to write
+    """
+    size = ((terrain.max_x + 1) * (terrain.max_y + 1) + 7) >> 3
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, terrain.max_x, terrain.max_y))
+        f.write(terrain._bits[:size])
+
+
+def load_terrain(path: str) -> Terrain:
+    """
+    Load a terrain file, memory-mapping binary bitmaps.
+
+    Binary files are recognised by their magic bytes; anything else is
+    read as an ASCII map.
+
+    Args:
+        path: Terrain file
+
+    Returns:
+        Terrain for the file
+
+    Raises:
+        ValueError: If the file is not valid terrain
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if not header.startswith(MAGIC):
+            f.seek(0)
+            return Terrain.from_ascii(f.read().decode('latin-1').splitlines())
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Truncated terrain file: {path}")
+        magic, version, max_x, max_y = _HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"Unsupported terrain version: {path}")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    bits = memoryview(mapping)[_HEADER.size:]
+    try:
+        return Terrain(max_x, max_y, bits, mapping)
+    except ValueError:
+        bits.release()
+        mapping.close()
+        raise ValueError(f"Truncated terrain file: {path}")
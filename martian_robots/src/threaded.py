@@ -0,0 +1,112 @@
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Tuple
+from .columnar import MissionColumns, ResultColumns
+from .program import Program
+from .simulator import Simulator
+
+
+# Worker pools for independent work. Processes sidestep the GIL on regular
+# CPython; threads share memory and scale across cores on free-threaded
+# (no-GIL) builds.
+EXECUTORS = ('process', 'thread')
+
+
+def gil_enabled() -> bool:
+    """Whether the running interpreter serializes Python threads with a GIL."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def make_executor(executor: str, max_workers: int) -> Executor:
+    """
+    Create a worker pool by name.
+
+    Args:
+        executor: One of EXECUTORS
+        max_workers: Number of workers
+
+    Returns:
+        New ProcessPoolExecutor or ThreadPoolExecutor
+    """
+    if executor == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if executor == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor: {executor}")
+
+
+class ThreadSafeSimulator(Simulator):
+    """
+    Simulator that can be shared between threads, by serializing them.
+
+    Every call runs under one lock, so threads sharing the simulator take
+    turns: it makes sharing safe but adds no parallelism to the robots
+    themselves. Each robot sees every scent left by the robots before it,
+    so results always equal a sequential run in the order the calls took
+    the lock. The grid uses the 'concurrent' scent store, so other threads
+    (such as speculative workers or a checkpoint writer) may read scents
+    without taking the lock. For parallel throughput use SpeculativeRunner
+    with executor='thread'.
+    """
+
+    def __init__(self, max_x: int, max_y: int, **options):
+        """
+        Initialize the simulator.
+
+        Args:
+            max_x: Maximum x-coordinate of the grid
+            max_y: Maximum y-coordinate of the grid
+            **options: Other Simulator options; scent_store is always 'concurrent'
+        """
+        if options.setdefault('scent_store', 'concurrent') != 'concurrent':
+            raise ValueError("Thread-safe simulators require the 'concurrent' scent store")
+        super().__init__(max_x, max_y, **options)
+        self._lock = threading.RLock()
+
+    def process_robot(self, start_x: int, start_y: int, orientation: str, instructions: str) -> str:
+        """Process a single robot; see Simulator.process_robot."""
+        with self._lock:
+            return super().process_robot(start_x, start_y, orientation, instructions)
+
+    def process_program(self, start_x: int, start_y: int, orientation: str, program: Program) -> str:
+        """Process a robot running a precompiled program; see Simulator.process_program."""
+        with self._lock:
+            return super().process_program(start_x, start_y, orientation, program)
+
+    def process_columns(self, mission: MissionColumns, start: int = 0) -> ResultColumns:
+        """Process a columnar mission as one uninterrupted run; see Simulator.process_columns."""
+        with self._lock:
+            return super().process_columns(mission, start)
+
+    def process_lockstep(self, robot_data: Iterable[Tuple[int, int, str, str]]) -> List[str]:
+        """Process robots in lockstep as one uninterrupted run; see Simulator.process_lockstep."""
+        with self._lock:
+            return super().process_lockstep(robot_data)
+
+    def process_batch(self, robot_data: Iterable[Tuple[int, int, str, str]]) -> List[str]:
+        """
+        Process robots back to back without other threads interleaving.
+
+        Args:
+            robot_data: Iterable of tuples (start_x, start_y, orientation, instructions)
+
+        Returns:
+            List of final states for each robot
+        """
+        with self._lock:
+            return self.process_multiple_robots(robot_data)
+
+    def fork(self) -> 'ThreadSafeSimulator':
+        """
+        Return a what-if copy with its own lock; see Simulator.fork.
+
+        The concurrent scent store is copied rather than layered, so this
+        fork costs O(scents).
+        """
+        with self._lock:
+            forked = super().fork()
+        forked._lock = threading.RLock()
+        return forked
+
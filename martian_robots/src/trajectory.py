@@ -0,0 +1,177 @@
+import mmap
+import struct
+from typing import Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# File layout
+# -----------
+# <path>      append-only fixed-width records, little-endian:
+#             i64 x, i64 y, u8 heading (0=N, 1=E, 2=S, 3=W), u8 event flags
+# <path>.idx  one (u64 first_record, u64 record_count) pair per robot
+RECORD = struct.Struct('<qqBB')
+INDEX_ENTRY = struct.Struct('<QQ')
+INDEX_SUFFIX = '.idx'
+
+# Event flags
+START = 1
+MOVE = 2
+TURN = 4
+BLOCKED = 8  # forward move ignored because of a scent
+LOST = 16
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([('x', '<i8'), ('y', '<i8'), ('heading', 'u1'), ('flags', 'u1')])
+
+
+class TrajectoryRecorder:
+    """
+    Streams every robot's visited states to a binary file.
+
+    Records are packed into a buffer and written out in large chunks, so
+    memory stays bounded no matter how many paths are recorded. Pass an
+    instance as Simulator(recorder=...) and close it when done.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        """
+        Create (or truncate) the trajectory and index files.
+
+        Args:
+            path: Trajectory file path; the index goes to path + '.idx'
+            buffer_size: Bytes buffered before writing to disk
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._data = open(path, 'wb')
+        self._index = open(path + INDEX_SUFFIX, 'wb')
+        self._buffer = bytearray()
+        self._records = 0
+        self._robot_start = 0
+        self.robots = 0
+
+    def begin_robot(self) -> None:
+        """Start a new robot's path."""
+        self._robot_start = self._records
+
+    def record(self, x: int, y: int, heading: int, flags: int) -> None:
+        """
+        Append one state to the current robot's path.
+
+        Args:
+            x: X-coordinate
+            y: Y-coordinate
+            heading: Heading code
+            flags: Event flags (START, MOVE, TURN, BLOCKED, LOST)
+        """
+        self._buffer += RECORD.pack(x, y, heading, flags)
+        self._records += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._data.write(self._buffer)
+            self._buffer.clear()
+
+    def end_robot(self) -> None:
+        """Finish the current robot's path and index it."""
+        self._index.write(INDEX_ENTRY.pack(self._robot_start, self._records - self._robot_start))
+        self.robots += 1
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        self._data.write(self._buffer)
+        self._buffer.clear()
+        self._data.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        """Flush and close the files."""
+        if not self._data.closed:
+            self.flush()
+            self._data.close()
+            self._index.close()
+
+    def __enter__(self) -> 'TrajectoryRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Memory-mapped reader for files written by TrajectoryRecorder.
+
+    Paths are returned as zero-copy NumPy structured arrays over the
+    mapping (fields x, y, heading, flags), or as tuples without NumPy.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a trajectory file and its index.
+
+        Args:
+            path: Trajectory file path
+        """
+        self._data = _map(path)
+        self._index = _map(path + INDEX_SUFFIX)
+
+    def __len__(self) -> int:
+        """Number of recorded robots."""
+        return len(self._index) // INDEX_ENTRY.size if self._index is not None else 0
+
+    def _span(self, robot: int) -> Tuple[int, int]:
+        """Return (first_record, record_count) for a robot."""
+        if not 0 <= robot < len(self):
+            raise IndexError("robot index out of range")
+        return INDEX_ENTRY.unpack_from(self._index, robot * INDEX_ENTRY.size)
+
+    def path(self, robot: int):
+        """
+        Return a robot's path as a zero-copy NumPy view.
+
+        Args:
+            robot: Robot index in processing order
+
+        Returns:
+            Structured array with fields x, y, heading and flags
+        """
+        if np is None:
+            raise ImportError("Zero-copy trajectory views require numpy")
+        first, count = self._span(robot)
+        return np.frombuffer(self._data, dtype=RECORD_DTYPE, count=count,
+                             offset=first * RECORD.size)
+
+    def records(self, robot: int) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Iterate over a robot's path as (x, y, heading, flags) tuples.
+
+        Args:
+            robot: Robot index in processing order
+        """
+        first, count = self._span(robot)
+        start = first * RECORD.size
+        return RECORD.iter_unpack(memoryview(self._data)[start:start + count * RECORD.size])
+
+    def close(self) -> None:
+        """Release the mappings."""
+        for mapping in (self._data, self._index):
+            if mapping is not None:
+                mapping.close()
+
+    def __enter__(self) -> 'TrajectoryReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    """Map a file read-only; empty files cannot be mapped and give None."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from src.analytics import TrafficAnalytics, np
+from src.cache import ResultCache
+from src.robot import DX, DY, HEADINGS
+from src.simulator import Simulator
+from src.stats import SimulationStats
+from src.trajectory import TrajectoryRecorder
+from tests.test_program import random_robots
+
+
+def count_by_stepping(max_x, max_y, robots):
+    """Count visits, losses and scent hits one step at a time."""
+    visits, losses, hits = Counter(), Counter(), Counter()
+    scents = set()
+    for x, y, orientation, instructions in robots:
+        heading = HEADINGS.index(orientation)
+        if 0 <= x <= max_x and 0 <= y <= max_y:
+            visits[x, y] += 1
+        for instruction in instructions:
+            if instruction == 'L':
+                heading = (heading + 3) & 3
+            elif instruction == 'R':
+                heading = (heading + 1) & 3
+            elif instruction == 'F':
+                next_x, next_y = x + DX[heading], y + DY[heading]
+                if 0 <= next_x <= max_x and 0 <= next_y <= max_y:
+                    x, y = next_x, next_y
+                    visits[x, y] += 1
+                elif (next_x, next_y) in scents:
+                    hits[next_x, next_y] += 1
+                else:
+                    scents.add((next_x, next_y))
+                    losses[next_x, next_y] += 1
+                    break
+    return visits, losses, hits
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTrafficAnalytics(unittest.TestCase):
+    """Test cases for the coverage heatmap and edge counts."""
+    
+    def test_counts_match_stepping(self):
+        """Test batched counts against a per-step count, across several flushes."""
+        robots = random_robots(random.Random(6), 7, 5, 400, 40)
+        analytics = TrafficAnalytics(7, 5, buffer_size=64)
+        results = Simulator(7, 5, analytics=analytics).process_multiple_robots(robots)
+        self.assertEqual(results, Simulator(7, 5).process_multiple_robots(robots))
+        
+        visits, losses, hits = count_by_stepping(7, 5, robots)
+        heatmap = analytics.visits
+        self.assertEqual({(x, y): int(heatmap[x, y]) for x, y in zip(*np.nonzero(heatmap))},
+                         dict(visits))
+        edges = analytics.edge_counts()
+        self.assertEqual(int(edges['north'][0][3]), losses[3, 6])
+        self.assertEqual(int(edges['west'][1][2]), hits[-1, 2])
+        self.assertEqual(sum(int(a.sum()) for a, _ in edges.values()) + analytics.other_losses,
+                         sum(losses.values()))
+        self.assertEqual(sum(int(b.sum()) for _, b in edges.values()) + analytics.other_scent_hits,
+                         sum(hits.values()))
+        self.assertEqual(analytics.robots, 400)
+    
+    def test_long_runs(self):
+        """Test rows and columns folded from runs much longer than the buffer."""
+        analytics = TrafficAnalytics(999, 599, buffer_size=8)
+        simulator = Simulator(999, 599, analytics=analytics)
+        for _ in range(50):
+            simulator.process_robot(0, 7, 'E', 'F' * 999 + 'L' + 'F' * 400)
+        visits = analytics.visits
+        self.assertEqual(int(visits[:, 7].sum()), 50 * 1000)
+        self.assertEqual(int(visits[999].sum()), 50 * 401)
+        self.assertEqual(int(visits.sum()), 50 * 1400)
+        self.assertEqual(int(visits[999, 7]), 50)
+    
+    def test_exports(self):
+        """Test the CSV and PGM exports."""
+        analytics = TrafficAnalytics(5, 3)
+        simulator = Simulator(5, 3, analytics=analytics)
+        simulator.process_multiple_robots([(1, 1, 'E', "RFRFRFRF"), (3, 2, 'N', "FRRFLLFFRRFLL"),
+                                           (0, 3, 'W', "LLFFFLFLFL")])
+        with tempfile.TemporaryDirectory() as directory:
+            cells, edges, image = (os.path.join(directory, name)
+                                   for name in ('cells.csv', 'edges.csv', 'heat.pgm'))
+            analytics.write_cells_csv(cells)
+            analytics.write_edges_csv(edges)
+            analytics.write_pgm(image)
+            with open(cells) as f:
+                self.assertIn("3,3,3\n", f.read())
+            with open(edges) as f:
+                self.assertEqual(f.read(), "edge,x,y,losses,scent_hits\nnorth,3,4,1,1\n")
+            with open(image, 'rb') as f:
+                data = f.read()
+        self.assertTrue(data.startswith(b"P5\n6 4\n255\n"))
+        pixels = data[len(b"P5\n6 4\n255\n"):]
+        # Top row is y = 3; the busiest cell (3, 3) is white
+        self.assertEqual(len(pixels), 24)
+        self.assertEqual(pixels[3], 255)
+    
+    def test_rejected_with_collisions(self):
+        """Test that collision mode cannot report to analytics."""
+        with self.assertRaises(ValueError):
+            Simulator(5, 3, occupancy='hash', analytics=TrafficAnalytics(5, 3))
+    
+    def test_rejected_with_stats_and_recording(self):
+        """Test that modes which bypass the analytics engine are rejected."""
+        with self.assertRaisesRegex(ValueError, "Analytics"):
+            Simulator(5, 3, stats=SimulationStats(), analytics=TrafficAnalytics(5, 3))
+        with self.assertRaisesRegex(ValueError, "Analytics"):
+            Simulator(5, 3, cache=ResultCache(), analytics=TrafficAnalytics(5, 3))
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = TrajectoryRecorder(os.path.join(directory, 'paths.bin'))
+            with self.assertRaisesRegex(ValueError, "Analytics"):
+                Simulator(5, 3, recorder=recorder, analytics=TrafficAnalytics(5, 3))
+            recorder.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
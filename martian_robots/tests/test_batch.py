@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from src.batch import collect_mission_files, run_batch, run_mission_file
+
+
+SAMPLE_MISSION = "5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n0 3 W\nLLFFFLFLFL\n"
+
+
+class TestBatch(unittest.TestCase):
+    """Test cases for the batch mission runner."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def test_collect_from_directory_and_manifest(self):
+        """Test listing missions from a directory and from a manifest."""
+        first = self.write('a.txt', SAMPLE_MISSION)
+        second = self.write('b.txt', SAMPLE_MISSION)
+        self.write('a.txt.out', '')
+        self.assertEqual(collect_mission_files(self.directory.name), [first, second])
+        
+        manifest = self.write('missions.lst', "# nightly\nb.txt\n\na.txt\n")
+        self.assertEqual(collect_mission_files(manifest), [second, first])
+    
+    def test_run_mission_file(self):
+        """Test running a single mission and returning its results."""
+        mission = run_mission_file(self.write('a.txt', SAMPLE_MISSION))
+        self.assertIsNone(mission.error)
+        self.assertEqual(mission.robots, 3)
+        self.assertEqual(mission.results, ["1 1 E", "3 3 N LOST", "2 3 S"])
+    
+    def test_malformed_mission_is_isolated(self):
+        """Test that a bad file is reported without aborting the batch."""
+        good = self.write('a.txt', SAMPLE_MISSION)
+        bad = self.write('b.txt', "5 3\n1 1 E\n")
+        missions = list(run_batch([good, bad, good], max_workers=2))
+        
+        self.assertEqual([m.path for m in missions], [good, bad, good])
+        self.assertEqual(missions[1].error, "Incomplete robot data")
+        self.assertFalse(os.path.exists(bad + '.out'))
+        with open(good + '.out') as f:
+            self.assertEqual(f.read(), "1 1 E\n3 3 N LOST\n2 3 S\n")
+    
+    def test_results_returned_for_combined_output(self):
+        """Test collecting results instead of writing them next to inputs."""
+        path = self.write('a.txt', SAMPLE_MISSION)
+        (mission,) = run_batch([path], max_workers=1, write_next_to_input=False)
+        self.assertEqual(mission.results, ["1 1 E", "3 3 N LOST", "2 3 S"])
+        self.assertFalse(os.path.exists(path + '.out'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from benchmarks.run import compare_reports, run_benchmarks
+from benchmarks.workloads import WORKLOADS, generate_mission, mission_lines
+from src.parser import parse_input
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark workloads and runner."""
+    
+    def test_workloads_are_seeded_and_valid(self):
+        """Test that workloads are reproducible and parse back unchanged."""
+        for name in WORKLOADS:
+            mission = generate_mission(name, seed=1, scale=0.001)
+            self.assertEqual(mission, generate_mission(name, seed=1, scale=0.001))
+            self.assertEqual(parse_input(list(mission_lines(mission))), mission)
+        self.assertNotEqual(generate_mission('realistic', seed=1, scale=0.001),
+                            generate_mission('realistic', seed=2, scale=0.001))
+    
+    def test_unknown_workload(self):
+        """Test that an unknown workload is rejected."""
+        with self.assertRaises(ValueError):
+            generate_mission('lunar')
+    
+    def test_run_and_compare(self):
+        """Test a tiny benchmark run and regression detection."""
+        report = run_benchmarks(['realistic'], ['parse_input', 'main'], scale=0.001,
+                                repeat=1)
+        self.assertEqual([r['target'] for r in report['results']], ['parse_input', 'main'])
+        for result in report['results']:
+            self.assertGreater(result['robots_per_second'], 0)
+            self.assertGreater(result['peak_memory_bytes'], 0)
+        
+        self.assertEqual(compare_reports(report, report), [])
+        slower = {'results': [dict(r, robots_per_second=r['robots_per_second'] / 2)
+                              for r in report['results']]}
+        self.assertEqual(len(compare_reports(report, slower)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
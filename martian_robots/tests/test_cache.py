@@ -0,0 +1,85 @@
+import random
+import unittest
+from src.cache import CacheEntry, ResultCache
+from src.simulator import Simulator
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the robot result cache."""
+    
+    def test_hits_for_repeated_robots(self):
+        """Test that a repeated robot is served from the cache."""
+        cache = ResultCache(16)
+        simulator = Simulator(5, 3, cache=cache)
+        self.assertEqual(simulator.process_robot(1, 1, 'E', 'RFRFRFRF'), "1 1 E")
+        self.assertEqual(simulator.process_robot(1, 1, 'E', 'RFRFRFRF'), "1 1 E")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+    
+    def test_relevant_scent_invalidates(self):
+        """Test that only scents a run consulted invalidate its entry."""
+        cache = ResultCache(16)
+        simulator = Simulator(5, 3, cache=cache)
+        self.assertEqual(simulator.process_robot(1, 3, 'N', 'F'), "1 3 N LOST")
+        # The run scented the cell it read, so the entry is now stale
+        self.assertEqual(simulator.process_robot(1, 3, 'N', 'F'), "1 3 N")
+        self.assertEqual(cache.invalidations, 1)
+        
+        self.assertEqual(simulator.process_robot(2, 1, 'N', 'F'), "2 2 N")
+        simulator.process_robot(0, 0, 'S', 'F')  # unrelated scent, new epoch
+        self.assertEqual(simulator.process_robot(2, 1, 'N', 'F'), "2 2 N")
+        self.assertEqual(cache.invalidations, 1)
+        self.assertEqual(cache.hits, 1)
+    
+    def test_hit_replays_scent_writes(self):
+        """Test that a cached lost robot still leaves its scent."""
+        cache = ResultCache(16)
+        simulator = Simulator(5, 3, cache=cache)
+        epoch = simulator.grid.scent_epoch
+        simulator.process_robot(5, 1, 'E', 'LLF')
+        simulator.grid.scented_positions.clear()  # forget the scent but keep the epoch
+        simulator.grid.scent_epoch = epoch
+        self.assertEqual(simulator.process_robot(5, 1, 'E', 'LLF'), "4 1 W")
+        self.assertEqual(cache.hits, 1)
+        
+        simulator.process_robot(5, 1, 'E', 'F')
+        self.assertEqual(simulator.process_robot(5, 1, 'E', 'F'), "5 1 E")
+    
+    def test_shared_cache_keeps_grids_apart(self):
+        """Test that a cache shared by different grid sizes never crosses them."""
+        cache = ResultCache(16)
+        self.assertEqual(Simulator(5, 3, cache=cache).process_robot(0, 0, 'N', 'FFFFF'), "0 3 N LOST")
+        large = Simulator(10, 10, cache=cache)
+        self.assertEqual(large.process_robot(0, 0, 'N', 'FFFFF'), "0 5 N")
+        self.assertEqual(set(large.grid.scented_positions), set())
+        self.assertEqual(cache.hits, 0)
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResultCache(2)
+        grid = Simulator(5, 3).grid
+        for key in ['a', 'b', 'a', 'c']:
+            if cache.lookup(grid, (5, 3, 0, 0, 'N', key)) is None:
+                cache.store((5, 3, 0, 0, 'N', key), CacheEntry(key, 0, (), ()))
+        self.assertEqual(list(cache.entries), [(5, 3, 0, 0, 'N', 'a'), (5, 3, 0, 0, 'N', 'c')])
+        self.assertEqual(cache.evictions, 1)
+        with self.assertRaises(ValueError):
+            ResultCache(0)
+    
+    def test_matches_uncached_results(self):
+        """Test that caching never changes results or scents."""
+        rng = random.Random(11)
+        programs = ['FFRFF', 'LFFFFF', 'RRFFFFFFF', 'FLFLFLFL', 'FFFFFFFFFF']
+        robots = [(rng.randint(0, 6), rng.randint(0, 4), rng.choice('NESW'), rng.choice(programs))
+                  for _ in range(2000)]
+        for engine in ('reference', 'compiled'):
+            cache = ResultCache(1024)
+            cached = Simulator(6, 4, engine=engine, cache=cache)
+            plain = Simulator(6, 4)
+            self.assertEqual(cached.process_multiple_robots(robots),
+                             plain.process_multiple_robots(robots))
+            self.assertEqual(cached.grid.scented_positions, plain.grid.scented_positions)
+            self.assertGreater(cache.hits, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
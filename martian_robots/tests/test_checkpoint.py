@@ -0,0 +1,126 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+from src.checkpoint import load_checkpoint, read_checkpoint, save_checkpoint
+from src.mmap_parser import MappedMission
+from src.parser import stream_input
+from src.simulator import Simulator
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test cases for checkpoint and resume."""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'mission.ckpt')
+    
+    def test_round_trip(self):
+        """Test that dimensions, scents and robot count survive a save."""
+        simulator = Simulator(5, 3)
+        simulator.process_multiple_robots([(1, 3, 'N', 'F'), (0, 0, 'S', 'F'), (2, 2, 'E', 'F')])
+        save_checkpoint(simulator, self.path)
+        
+        self.assertEqual(read_checkpoint(self.path)[:3], (5, 3, 3))
+        restored = load_checkpoint(self.path, scent_store='perimeter')
+        self.assertEqual(restored.robots_processed, 3)
+        self.assertEqual(restored.grid.scented_positions, {(1, 4), (0, -1)})
+    
+    def test_invalid_file(self):
+        """Test that a file that is not a checkpoint is rejected."""
+        with open(self.path, 'wb') as f:
+            f.write(b'5 3\n1 1 E\nF\n' * 4)
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+    
+    def test_append_matches_full_run(self):
+        """Test that resuming on a grown log matches a full re-run."""
+        rng = random.Random(7)
+        lines = ["4 4\n"]
+        for _ in range(400):
+            lines.append(f"{rng.randint(0, 4)} {rng.randint(0, 4)} {rng.choice('NESW')}\n")
+            lines.append(''.join(rng.choice('LRFF') for _ in range(12)) + "\n")
+        
+        max_x, max_y, robots = stream_input(lines)
+        expected = Simulator(max_x, max_y).process_multiple_robots(robots)
+        
+        # First run covers the first 150 robots of the log
+        max_x, max_y, robots = stream_input(lines[:301])
+        simulator = Simulator(max_x, max_y)
+        first = simulator.process_multiple_robots(robots)
+        save_checkpoint(simulator, self.path)
+        
+        # The log grows; only the tail is simulated after resuming
+        resumed = load_checkpoint(self.path)
+        _, _, tail = stream_input(lines, skip_robots=resumed.robots_processed)
+        rest = resumed.process_multiple_robots(tail)
+        
+        self.assertEqual(len(rest), 250)
+        self.assertEqual(first + rest, expected)
+        self.assertEqual(resumed.robots_processed, 400)
+    
+    def test_resume_seeks_to_offset(self):
+        """Test that a mapped log resumes at the saved offset without rescanning."""
+        log = os.path.join(os.path.dirname(self.path), 'mission.txt')
+        with open(log, 'w') as f:
+            f.write("5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n")
+        simulator = Simulator(5, 3)
+        with MappedMission(log) as mission:
+            self.assertEqual(simulator.process_multiple_robots(mission.robots()), ["1 1 E", "3 3 N LOST"])
+            save_checkpoint(simulator, self.path, mission.offset)
+        self.assertEqual(read_checkpoint(self.path).input_offset, os.path.getsize(log) - 1)
+        
+        # Three lines before the offset would derail line skipping
+        with open(log, 'r+') as f:
+            f.write("5 3\n" + "X" * (os.path.getsize(log) - 9) + "\nX\nX\n")
+            f.write("0 3 W\nLLFFFLFLFL\n")
+        checkpoint = read_checkpoint(self.path)
+        resumed = load_checkpoint(self.path)
+        with MappedMission(log) as mission:
+            robots = mission.robots(checkpoint.robots_processed, checkpoint.input_offset)
+            self.assertEqual(resumed.process_multiple_robots(robots), ["2 3 S"])
+            self.assertEqual(mission.offset, os.path.getsize(log) - 1)
+        
+        # The offset must land on a line boundary within the input
+        with MappedMission(log) as mission:
+            with self.assertRaisesRegex(ValueError, "offset"):
+                list(mission.robots(2, checkpoint.input_offset - 1))
+            with self.assertRaisesRegex(ValueError, "offset"):
+                list(mission.robots(2, os.path.getsize(log) + 1))
+    
+    def test_resume_after_missing_final_newline(self):
+        """Test appending to a log whose last line had no newline."""
+        log = os.path.join(os.path.dirname(self.path), 'mission.txt')
+        with open(log, 'w') as f:
+            f.write("5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n0 3 W\nLLFFFLFLFL")
+        simulator = Simulator(5, 3)
+        with MappedMission(log) as mission:
+            simulator.process_multiple_robots(mission.robots())
+            save_checkpoint(simulator, self.path, mission.offset)
+        
+        with open(log, 'a') as f:
+            f.write("\n1 1 N\nFFFF\n")
+        checkpoint = read_checkpoint(self.path)
+        resumed = load_checkpoint(self.path)
+        with MappedMission(log) as mission:
+            robots = mission.robots(checkpoint.robots_processed, checkpoint.input_offset)
+            self.assertEqual(resumed.process_multiple_robots(robots), ["1 3 N LOST"])
+            self.assertEqual(mission.offset, os.path.getsize(log) - 1)
+    
+    def test_version_1_has_no_offset(self):
+        """Test that checkpoints written before offsets were stored still load."""
+        with open(self.path, 'wb') as f:
+            f.write(struct.pack('<4sHqqQQqq', b'MRCP', 1, 5, 3, 4, 1, 1, 4))
+        self.assertEqual(read_checkpoint(self.path), (5, 3, 4, [(1, 4)], 0))
+        self.assertEqual(load_checkpoint(self.path).robots_processed, 4)
+    
+    def test_skip_beyond_input(self):
+        """Test that skipping more robots than the input has is an error."""
+        with self.assertRaisesRegex(ValueError, "fewer than 2 robots"):
+            stream_input(["5 3\n", "1 1 E\n", "F\n"], skip_robots=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import random
+import os
+import tempfile
+import unittest
+from src.columnar import (
+    convert_file, mission_from_text, mission_to_text, read_mission, read_results,
+    results_from_text, results_to_text, write_mission, write_results
+)
+from src.cache import ResultCache
+from src.simulator import ENGINES, Simulator
+from tests.test_program import random_robots
+
+
+SAMPLE_INPUT = ["5 3", "1 1 E", "RFRFRFRF", "3 2 N", "FRRFLLFFRRFLL", "0 3 W", "LLFFFLFLFL"]
+SAMPLE_OUTPUT = ["1 1 E", "3 3 N LOST", "2 3 S"]
+
+
+class TestColumnar(unittest.TestCase):
+    """Test cases for the binary columnar mission and result format."""
+    
+    def test_mission_round_trip(self):
+        """Test text -> columns -> binary -> columns -> text."""
+        mission = mission_from_text(SAMPLE_INPUT)
+        self.assertEqual(list(mission.headings), [1, 0, 3])
+        self.assertEqual(list(mission.offsets), [0, 8, 21, 31])
+        
+        stream = io.BytesIO()
+        write_mission(stream, mission)
+        stream.seek(0)
+        restored = read_mission(stream)
+        self.assertEqual(restored, mission)
+        self.assertEqual(list(mission_to_text(restored)), SAMPLE_INPUT)
+    
+    def test_results_round_trip(self):
+        """Test result lines through columns and the binary format."""
+        results = results_from_text(SAMPLE_OUTPUT)
+        stream = io.BytesIO()
+        write_results(stream, results)
+        stream.seek(0)
+        self.assertEqual(list(results_to_text(read_results(stream))), SAMPLE_OUTPUT)
+        
+        with self.assertRaisesRegex(ValueError, "Invalid result line"):
+            results_from_text(["1 1 E GONE"])
+    
+    def test_invalid_binary_data(self):
+        """Test truncated and foreign data."""
+        stream = io.BytesIO()
+        write_mission(stream, mission_from_text(SAMPLE_INPUT))
+        data = stream.getvalue()
+        for broken, message in ((data[:-1], "Truncated"), (data[:10], "Truncated"),
+                                (b'XXXX' + data[4:], "Not a binary mission")):
+            with self.assertRaisesRegex(ValueError, message):
+                read_mission(io.BytesIO(broken))
+    
+    def test_process_columns_matches_text(self):
+        """Test that every engine gives the same results from columns as from strings."""
+        robots = random_robots(random.Random(11), 6, 4, 300, 30)
+        lines = ["6 4"]
+        for x, y, orientation, instructions in robots:
+            lines += [f"{x} {y} {orientation}", instructions]
+        mission = mission_from_text(lines)
+        reference = Simulator(6, 4)
+        expected = reference.process_multiple_robots(robots)
+        
+        for engine in ENGINES:
+            simulator = Simulator(6, 4, engine=engine)
+            results = simulator.process_columns(mission)
+            self.assertEqual(list(results_to_text(results)), expected, engine)
+            self.assertEqual(simulator.robots_processed, len(robots))
+            self.assertEqual(simulator.grid.scented_positions, reference.grid.scented_positions)
+        
+        cached = Simulator(6, 4, cache=ResultCache(64))
+        self.assertEqual(list(results_to_text(cached.process_columns(mission))), expected)
+        
+        resumed = Simulator(6, 4)
+        resumed.process_multiple_robots(robots[:100])
+        tail = resumed.process_columns(mission, start=100)
+        self.assertEqual(list(results_to_text(tail)), expected[100:])
+    
+    def test_convert_file_detects_direction(self):
+        """Test the file converter in both directions."""
+        with tempfile.TemporaryDirectory() as directory:
+            text, binary, back = (os.path.join(directory, name) for name in ('m.txt', 'm.bin', 'b.txt'))
+            with open(text, 'w') as f:
+                f.write("\n".join(SAMPLE_INPUT) + "\n")
+            self.assertEqual(convert_file(text, binary), "text mission -> binary")
+            self.assertEqual(convert_file(binary, back), "binary mission -> text")
+            with open(back) as f:
+                self.assertEqual(f.read().splitlines(), SAMPLE_INPUT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import threading
+import unittest
+from src.compression import detect_compression, iter_lines, open_compressed, read_lines
+from src.mmap_parser import MappedMission
+from src.parser import parse_file, parse_input
+
+
+SAMPLE_MISSION = "5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n0 3 W\nLLFFFLFLFL\n"
+COMPRESSORS = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+class TestCompression(unittest.TestCase):
+    """Test cases for transparently compressed streams."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_detect_compression(self):
+        """Test recognising each format by its magic bytes."""
+        for compression, compress in COMPRESSORS.items():
+            self.assertEqual(detect_compression(compress(b"5 3\n")[:6]), compression)
+        self.assertIsNone(detect_compression(b"5 3\n1 "))
+        self.assertIsNone(detect_compression(b""))
+
+    def test_parse_compressed_files(self):
+        """Test that every format parses like the plain text mission."""
+        expected = parse_input(SAMPLE_MISSION.splitlines())
+        data = SAMPLE_MISSION.encode()
+        self.assertEqual(parse_file(self.write('plain.txt', data)), expected)
+        for compression, compress in COMPRESSORS.items():
+            path = self.write(f'mission.{compression}', compress(data))
+            self.assertEqual(parse_file(path), expected)
+            with open(path, 'rb') as f:
+                self.assertEqual(parse_file(f), expected)
+
+    def test_small_chunks_and_multibyte_text(self):
+        """Test lines and characters split across chunk boundaries."""
+        text = "5 3\r\nnyå ☃\nlast line without newline"
+        stream = io.BufferedReader(io.BytesIO(gzip.compress(text.encode())))
+        self.assertEqual(list(read_lines(stream, chunk_size=3, read_ahead=2)),
+                         ["5 3\r", "nyå ☃".encode().decode('latin-1'), "last line without newline"])
+        self.assertEqual(list(iter_lines([b"a\n", b"\n", b"b\n"])), ["a", "", "b"])
+        self.assertEqual(list(iter_lines([b"ny\xc3", b"\xa5\n"], encoding='utf-8')), ["nyå"])
+    
+    def test_non_utf8_mission(self):
+        """Test that bytes invalid in UTF-8 parse the same compressed as plain."""
+        data = b"5 3\n1 1 E\nRF\xe9RF\xffRFRF\n"
+        plain = self.write('plain.txt', data)
+        expected = parse_file(plain)
+        self.assertEqual(expected[2][0][3], "RF\xe9RF\xffRFRF")
+        with MappedMission(plain) as mission:
+            self.assertEqual(list(mission.robots()), expected[2])
+        for compression, compress in COMPRESSORS.items():
+            self.assertEqual(parse_file(self.write(f'mission.{compression}', compress(data))), expected)
+
+    def test_reader_errors_and_early_exit(self):
+        """Test that reader errors surface and abandoned reads stop the thread."""
+        truncated = self.write('truncated.gz', gzip.compress(SAMPLE_MISSION.encode() * 100)[:-20])
+        with self.assertRaises(EOFError):
+            list(read_lines(truncated))
+
+        threads = threading.active_count()
+        path = self.write('big.gz', gzip.compress(SAMPLE_MISSION.encode() * 20000))
+        lines = read_lines(path, chunk_size=1024, read_ahead=2)
+        self.assertEqual(next(lines), "5 3")
+        lines.close()
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_compressed_output(self):
+        """Test writing through a compressor without closing the target."""
+        for compression in COMPRESSORS:
+            target = io.BytesIO()
+            with open_compressed(target, compression, 'wb') as output:
+                output.write(b"1 1 E\n")
+            self.assertFalse(target.closed)
+            target.seek(0)
+            with open_compressed(target, compression) as source:
+                self.assertEqual(source.read(), b"1 1 E\n")
+        with self.assertRaises(ValueError):
+            open_compressed(io.BytesIO(), 'zip')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+from src.fleet import Fleet, np
+from src.grid import Grid
+from src.robot import DX, DY, format_state, heading_from_orientation
+from src.simulator import Simulator
+
+
+def lockstep_reference(grid, robot_data):
+    """Scalar lockstep simulation used as the reference for Fleet."""
+    states = [[x, y, heading_from_orientation(o), False] for x, y, o, _ in robot_data]
+    width = max((len(robot[3]) for robot in robot_data), default=0)
+    for tick in range(width):
+        for state, (_, _, _, instructions) in zip(states, robot_data):
+            if state[3] or tick >= len(instructions):
+                continue
+            instruction = instructions[tick]
+            if instruction == 'L':
+                state[2] = (state[2] + 3) & 3
+            elif instruction == 'R':
+                state[2] = (state[2] + 1) & 3
+            elif instruction == 'F':
+                next_x, next_y = state[0] + DX[state[2]], state[1] + DY[state[2]]
+                if not grid.would_fall_off(next_x, next_y):
+                    state[0], state[1] = next_x, next_y
+                elif not grid.is_position_scented(next_x, next_y):
+                    state[3] = True
+                    grid.add_scent(next_x, next_y)
+    return [format_state(*state) for state in states]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFleet(unittest.TestCase):
+    """Test cases for the lockstep fleet engine."""
+    
+    def test_independent_robots(self):
+        """Test robots that never interact give the sequential results."""
+        simulator = Simulator(5, 3)
+        results = simulator.process_lockstep([
+            (1, 1, 'E', 'RFRFRFRF'),
+            (0, 0, 'N', 'FFRFF'),
+        ])
+        self.assertEqual(results, ["1 1 E", "2 2 E"])
+    
+    def test_same_tick_conflict_order(self):
+        """Test that the first robot in input order wins a same-tick loss."""
+        grid = Grid(5, 3)
+        fleet = Fleet(grid, [
+            (2, 3, 'N', 'FR'),
+            (2, 3, 'N', 'FR'),
+        ])
+        self.assertEqual(fleet.run(), ["2 3 N LOST", "2 3 E"])
+        self.assertEqual(grid.scented_positions, {(2, 4)})
+    
+    def test_existing_scents_respected(self):
+        """Test that scents already on the grid protect fleet robots."""
+        simulator = Simulator(5, 3)
+        simulator.process_robot(5, 1, 'E', 'F')
+        self.assertEqual(simulator.process_lockstep([(5, 1, 'E', 'FL')]), ["5 1 N"])
+    
+    def test_step_by_step(self):
+        """Test advancing the fleet one tick at a time."""
+        fleet = Fleet(Grid(5, 3), [(0, 0, 'N', 'FF'), (0, 0, 'E', 'F')])
+        self.assertTrue(fleet.step())
+        self.assertEqual(fleet.results(), ["0 1 N", "1 0 E"])
+        self.assertFalse(fleet.step())
+        self.assertEqual(fleet.results(), ["0 2 N", "1 0 E"])
+    
+    def test_invalid_orientation(self):
+        """Test that invalid orientations are rejected."""
+        with self.assertRaises(ValueError):
+            Fleet(Grid(5, 3), [(0, 0, 'Q', 'F')])
+    
+    def test_matches_scalar_lockstep(self):
+        """Test the vectorized engine against a scalar lockstep reference."""
+        rng = random.Random(3)
+        for max_x, max_y in [(0, 0), (5, 3), (20, 9)]:
+            robot_data = [
+                (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'),
+                 ''.join(rng.choice('LRFFFX') for _ in range(rng.randint(0, 40))))
+                for _ in range(300)
+            ]
+            grid, reference_grid = Grid(max_x, max_y), Grid(max_x, max_y)
+            self.assertEqual(Fleet(grid, robot_data).run(),
+                             lockstep_reference(reference_grid, robot_data))
+            self.assertEqual(grid.scented_positions, reference_grid.scented_positions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src import mmap_parser
+from src.mmap_parser import MappedMission
+from src.parser import parse_input
+from src.simulator import Simulator
+
+
+SAMPLE_INPUT = "5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n0 3 W\nLLFFFLFLFL\n"
+
+
+class TestMappedMission(unittest.TestCase):
+    """Test cases for the memory-mapped bulk parser."""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'mission.txt')
+    
+    def open(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+        mission = MappedMission(self.path)
+        self.addCleanup(mission.close)
+        return mission
+    
+    def test_matches_parse_input(self):
+        """Test that robots match the line-based parser."""
+        mission = self.open("5 3\r\n 1 1 E \r\n RFRF \r\n3 2 N\nFRRFLLFFRRFLL")
+        max_x, max_y, expected = parse_input(["5 3\r\n", " 1 1 E \r\n", " RFRF \r\n",
+                                              "3 2 N\n", "FRRFLLFFRRFLL"])
+        self.assertEqual((mission.max_x, mission.max_y), (max_x, max_y))
+        self.assertEqual(list(mission.robots()), expected)
+    
+    def test_full_batch_columns(self):
+        """Test the typed columns and zero-copy instruction views."""
+        batch = self.open(SAMPLE_INPUT).load()
+        self.assertEqual(list(batch.xs), [1, 3, 0])
+        self.assertEqual(list(batch.ys), [1, 2, 3])
+        self.assertEqual(list(batch.headings), [1, 0, 3])
+        self.assertIsInstance(batch.instructions[0], memoryview)
+        self.assertEqual(bytes(batch.instructions[2]), b'LLFFFLFLFL')
+        del batch
+    
+    def test_chunked_iteration(self):
+        """Test batches, skipping and simulation over batched robots."""
+        mission = self.open(SAMPLE_INPUT)
+        batches = list(mission.iter_batches(batch_size=2))
+        self.assertEqual([(b.first_robot, len(b)) for b in batches], [(0, 2), (2, 1)])
+        robots = [robot for batch in batches for robot in batch.robots()]
+        self.assertEqual(Simulator(5, 3).process_multiple_robots(robots),
+                         ["1 1 E", "3 3 N LOST", "2 3 S"])
+        del batches
+        
+        skipped = self.open(SAMPLE_INPUT)
+        self.assertEqual([robot[0] for robot in skipped.robots(skip_robots=2)], [0])
+    
+    def test_errors_match_parse_input(self):
+        """Test error messages and line numbers."""
+        cases = [
+            ("", "No input provided"),
+            ("5\n", "Invalid grid dimensions format"),
+            ("5 3\n1 1 E\n", "Incomplete robot data"),
+            ("5 3\n1 1 E\nF\n1 E\nF\n", "Invalid robot position format at line 4"),
+        ]
+        for content, message in cases:
+            with self.assertRaisesRegex(ValueError, message):
+                list(self.open(content).robots())
+    
+    def test_windows_without_numpy(self):
+        """Test line scanning across small windows with the bytes.find fallback."""
+        with mock.patch.object(mmap_parser, 'WINDOW_SIZE', 4), \
+                mock.patch.object(mmap_parser, 'np', None):
+            mission = self.open(SAMPLE_INPUT)
+            self.assertEqual(len(list(mission.robots())), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+from src.cache import ResultCache
+from src.grid import Grid
+from src.occupancy import BitmapOccupancy, HashOccupancy
+from src.parallel import SpeculativeRunner
+from src.simulator import Simulator
+from tests.test_program import random_robots
+
+
+ROBOTS = [(1, 1, 'N', 'F'), (1, 0, 'N', 'FFFRF'), (1, 0, 'N', 'FFFRF')]
+
+
+class TestOccupancyIndexes(unittest.TestCase):
+    """Test cases for the occupancy index implementations."""
+    
+    def test_indexes_agree(self):
+        """Test that the hash and bitmap indexes hold the same cells."""
+        rng = random.Random(5)
+        hashed, bitmap = HashOccupancy(40, 30), BitmapOccupancy(40, 30)
+        for _ in range(300):
+            x, y = rng.randint(0, 40), rng.randint(0, 30)
+            hashed.occupy(x, y)
+            bitmap.occupy(x, y)
+        self.assertEqual(len(hashed), len(bitmap))
+        for x in range(41):
+            for y in range(31):
+                self.assertEqual(hashed.is_occupied(x, y), bitmap.is_occupied(x, y))
+        self.assertEqual(bitmap.nbytes(), BitmapOccupancy(40, 30).nbytes())
+    
+    def test_grid_parks_only_in_bounds(self):
+        """Test parking on and off the grid."""
+        grid = Grid(5, 3, occupancy='hash')
+        grid.park(2, 2)
+        grid.park(-1, 2)
+        self.assertTrue(grid.is_occupied(2, 2))
+        self.assertFalse(grid.is_occupied(-1, 2))
+        self.assertEqual(len(grid.occupancy), 1)
+        self.assertFalse(Grid(5, 3).is_occupied(2, 2))
+        
+        with self.assertRaisesRegex(ValueError, "Unknown occupancy index"):
+            Grid(5, 3, occupancy='tree')
+        with self.assertRaisesRegex(ValueError, "Unknown collision policy"):
+            Grid(5, 3, occupancy='hash', collision_policy='bounce')
+
+
+class TestCollisions(unittest.TestCase):
+    """Test cases for simulating with collisions."""
+    
+    def test_ignore_policy(self):
+        """Test that moves into parked robots are skipped."""
+        for occupancy in ('hash', 'bitmap'):
+            simulator = Simulator(5, 3, occupancy=occupancy)
+            self.assertEqual(simulator.process_multiple_robots(ROBOTS),
+                             ["1 2 N", "2 1 E", "1 1 E"])
+    
+    def test_stop_policy(self):
+        """Test that a blocked move ends the robot's run."""
+        simulator = Simulator(5, 3, occupancy='bitmap', collision_policy='stop')
+        self.assertEqual(simulator.process_multiple_robots(ROBOTS),
+                         ["1 2 N", "1 1 N", "1 0 N"])
+    
+    def test_lost_robots_do_not_park(self):
+        """Test that lost robots leave a scent but no obstacle."""
+        simulator = Simulator(5, 3, occupancy='hash')
+        self.assertEqual(simulator.process_robot(3, 2, 'N', 'FFRF'), "3 3 N LOST")
+        self.assertEqual(len(simulator.grid.occupancy), 0)
+        self.assertEqual(simulator.process_robot(3, 2, 'N', 'FFRF'), "4 3 E")
+    
+    def test_without_parked_robots_matches_reference(self):
+        """Test that collisions only matter where robots are parked."""
+        robots = random_robots(random.Random(8), 1000, 1000, 200, 20)
+        reference = Simulator(1000, 1000).process_multiple_robots(robots)
+        collision = Simulator(1000, 1000, occupancy='hash').process_multiple_robots(robots)
+        self.assertEqual(collision, reference)
+    
+    def test_unsupported_combinations(self):
+        """Test that modes unaware of parked robots are rejected."""
+        with self.assertRaisesRegex(ValueError, "Collision mode"):
+            Simulator(5, 3, cache=ResultCache(8), occupancy='hash')
+        simulator = Simulator(5, 3, occupancy='hash')
+        with self.assertRaisesRegex(ValueError, "collision mode"):
+            simulator.process_program(0, 0, 'N', ((0, 1),))
+        with self.assertRaisesRegex(ValueError, "collision mode"):
+            SpeculativeRunner(simulator)
+
+
+if __name__ == '__main__':
+    unittest.main()
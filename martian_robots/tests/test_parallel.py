@@ -0,0 +1,74 @@
+import random
+import unittest
+from src.grid import Grid, RecordingGrid
+from src.parallel import SpeculativeRunner
+from src.simulator import Simulator
+
+
+def loss_heavy_robots(seed, count, max_x, max_y):
+    """Generate robots that frequently fall off and hit each other's scents."""
+    rng = random.Random(seed)
+    return [
+        (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice('NESW'),
+         ''.join(rng.choice('LRFFF') for _ in range(rng.randint(1, 25))))
+        for _ in range(count)
+    ]
+
+
+class TestRecordingGrid(unittest.TestCase):
+    """Test cases for recording scent accesses."""
+    
+    def test_records_reads_and_writes(self):
+        """Test that scent reads and writes are logged and forwarded."""
+        grid = Grid(5, 3)
+        recorder = RecordingGrid(grid)
+        simulator = Simulator(5, 3)
+        simulator.grid = recorder
+        
+        self.assertEqual(simulator.process_robot(1, 3, 'N', 'F'), "1 3 N LOST")
+        self.assertEqual(recorder.take_log(), (((1, 4, False),), ((1, 4),)))
+        self.assertTrue(grid.is_position_scented(1, 4))
+        
+        self.assertEqual(simulator.process_robot(1, 3, 'N', 'F'), "1 3 N")
+        self.assertEqual(recorder.take_log(), (((1, 4, True),), ()))
+
+
+class TestSpeculativeRunner(unittest.TestCase):
+    """Test cases for speculative parallel execution."""
+    
+    def test_matches_sequential(self):
+        """Test that results are identical to sequential processing."""
+        robots = loss_heavy_robots(6, 2000, 8, 6)
+        expected = Simulator(8, 6).process_multiple_robots(robots)
+        
+        simulator = Simulator(8, 6)
+        runner = SpeculativeRunner(simulator, max_workers=2, chunk_size=150)
+        self.assertEqual(runner.process_multiple_robots(iter(robots)), expected)
+        self.assertEqual(runner.robots_accepted + runner.robots_rerun, len(robots))
+        self.assertGreater(runner.robots_rerun, 0)
+        
+        reference = Simulator(8, 6)
+        reference.process_multiple_robots(robots)
+        self.assertEqual(simulator.grid.scented_positions, reference.grid.scented_positions)
+    
+    def test_compiled_engine_and_existing_scents(self):
+        """Test speculation on top of scents from earlier robots."""
+        simulator = Simulator(5, 3, engine='compiled')
+        simulator.process_robot(3, 3, 'N', 'F')
+        runner = SpeculativeRunner(simulator, max_workers=2, chunk_size=1)
+        results = runner.process_multiple_robots([
+            (3, 2, 'N', 'FFF'),
+            (0, 3, 'W', 'F'),
+            (0, 3, 'W', 'F'),
+        ])
+        self.assertEqual(results, ["3 3 N", "0 3 W LOST", "0 3 W"])
+        self.assertEqual(runner.robots_rerun, 1)
+    
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with self.assertRaises(ValueError):
+            SpeculativeRunner(Simulator(5, 3), chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
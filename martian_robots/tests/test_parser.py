@@ -0,0 +1,65 @@
+import unittest
+from src.parser import iter_robot_data, parse_input, stream_input
+
+
+SAMPLE_INPUT = [
+    "5 3\n",
+    "1 1 E\n",
+    "RFRFRFRF\n",
+    "3 2 N\n",
+    "FRRFLLFFRRFLL\n",
+    "0 3 W\n",
+    "LLFFFLFLFL\n",
+]
+
+
+class TestParser(unittest.TestCase):
+    """Test cases for the input parser."""
+    
+    def test_parse_input(self):
+        """Test parsing the sample input into a list of robots."""
+        max_x, max_y, robot_data = parse_input(SAMPLE_INPUT)
+        self.assertEqual((max_x, max_y), (5, 3))
+        self.assertEqual(robot_data, [
+            (1, 1, 'E', 'RFRFRFRF'),
+            (3, 2, 'N', 'FRRFLLFFRRFLL'),
+            (0, 3, 'W', 'LLFFFLFLFL'),
+        ])
+    
+    def test_parse_errors(self):
+        """Test the error messages for malformed input."""
+        with self.assertRaisesRegex(ValueError, "No input provided"):
+            parse_input([])
+        with self.assertRaisesRegex(ValueError, "Invalid grid dimensions format"):
+            parse_input(["5\n"])
+        with self.assertRaisesRegex(ValueError, "Incomplete robot data"):
+            parse_input(["5 3\n", "1 1 E\n"])
+        with self.assertRaisesRegex(ValueError, "Invalid robot position format at line 4"):
+            parse_input(["5 3\n", "1 1 E\n", "F\n", "1 E\n", "F\n"])
+    
+    def test_stream_input_is_lazy(self):
+        """Test that robots are parsed only as they are requested."""
+        consumed = []
+        
+        def lines():
+            for line in SAMPLE_INPUT:
+                consumed.append(line)
+                yield line
+        
+        max_x, max_y, robot_data = stream_input(lines())
+        self.assertEqual((max_x, max_y), (5, 3))
+        self.assertEqual(len(consumed), 1)
+        
+        self.assertEqual(next(robot_data), (1, 1, 'E', 'RFRFRFRF'))
+        self.assertEqual(len(consumed), 3)
+    
+    def test_iter_robot_data_line_numbers(self):
+        """Test that errors report line numbers relative to the start line."""
+        robots = iter_robot_data(["1 1 E", "F", "bad", "F"], first_line_number=10)
+        self.assertEqual(next(robots), (1, 1, 'E', 'F'))
+        with self.assertRaisesRegex(ValueError, "at line 12"):
+            next(robots)
+
+
+if __name__ == '__main__':
+    unittest.main()
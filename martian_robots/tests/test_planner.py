@@ -0,0 +1,84 @@
+import random
+import unittest
+from collections import deque
+from src.grid import Grid
+from src.planner import Planner, plan
+from src.robot import DX, DY, HEADINGS
+from src.simulator import Simulator
+
+
+def shortest_length(grid, start, target):
+    """Breadth-first search over in-bounds states, for checking optimality."""
+    first = (start[0], start[1], HEADINGS.index(start[2]))
+    goal = (target[0], target[1], HEADINGS.index(target[2]))
+    distance = {first: 0}
+    queue = deque([first])
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            return distance[state]
+        x, y, heading = state
+        successors = [(x, y, (heading + 3) & 3), (x, y, (heading + 1) & 3)]
+        next_x, next_y = x + DX[heading], y + DY[heading]
+        if grid.is_within_bounds(next_x, next_y) and not grid.is_occupied(next_x, next_y):
+            successors.append((next_x, next_y, heading))
+        for successor in successors:
+            if successor not in distance:
+                distance[successor] = distance[state] + 1
+                queue.append(successor)
+    return None
+
+
+class TestPlanner(unittest.TestCase):
+    """Test cases for the shortest-program planner."""
+    
+    def test_simple_plans(self):
+        """Test straight moves, turning in place and off-grid starts."""
+        grid = Grid(5, 3)
+        self.assertEqual(plan(grid, (1, 1, 'N'), (1, 3, 'N')), "FF")
+        self.assertEqual(plan(grid, (1, 1, 'N'), (1, 1, 'S')), "RR")
+        self.assertEqual(plan(grid, (1, 1, 'N'), (1, 1, 'W')), "L")
+        self.assertEqual(plan(grid, (-1, 0, 'E'), (1, 0, 'E')), "FF")
+        self.assertIsNone(plan(grid, (1, 1, 'N'), (6, 1, 'E')))
+    
+    def test_plans_are_shortest_and_safe(self):
+        """Test random queries around parked robots against breadth-first search."""
+        rng = random.Random(2)
+        for _ in range(300):
+            max_x, max_y = rng.randint(0, 6), rng.randint(0, 6)
+            simulator = Simulator(max_x, max_y, occupancy='hash')
+            for _ in range(rng.randint(0, 10)):
+                simulator.grid.park(rng.randint(0, max_x), rng.randint(0, max_y))
+            start = (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice(HEADINGS))
+            target = (rng.randint(0, max_x), rng.randint(0, max_y), rng.choice(HEADINGS))
+            
+            instructions = Planner(simulator.grid).plan(start, target)
+            expected = shortest_length(simulator.grid, start, target)
+            if expected is None:
+                self.assertIsNone(instructions)
+                continue
+            self.assertEqual(len(instructions), expected)
+            self.assertEqual(simulator.process_robot(*start, instructions), "%d %d %s" % target)
+    
+    def test_walls_of_parked_robots(self):
+        """Test routing around a wall with a single gap."""
+        simulator = Simulator(4, 4, occupancy='bitmap')
+        for y in range(4):
+            simulator.grid.park(2, y)
+        instructions = plan(simulator.grid, (0, 0, 'E'), (4, 0, 'E'))
+        self.assertEqual(len(instructions), 16)
+        self.assertEqual(simulator.process_robot(0, 0, 'E', instructions), "4 0 E")
+        # The robot is now parked on the target cell
+        self.assertIsNone(plan(simulator.grid, (0, 0, 'E'), (4, 0, 'E')))
+    
+    def test_large_grid_and_batches(self):
+        """Test a corner-to-corner query on a grid with millions of cells and batch mode."""
+        planner = Planner(Grid(3000, 3000))
+        instructions = planner.plan((0, 0, 'S'), (2999, 2999, 'W'))
+        self.assertEqual(len(instructions), 2 * 2999 + 3)
+        queries = [((0, 0, 'N'), (0, 5, 'N')), ((0, 0, 'N'), (5, 0, 'E'))] * 3
+        self.assertEqual(planner.plan_many(queries), ["FFFFF", "RFFFFF"] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
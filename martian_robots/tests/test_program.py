@@ -0,0 +1,88 @@
+import random
+import unittest
+from src.grid import Grid
+from src.program import compile_instructions, run_program, steps_to_edge
+from src.simulator import Simulator
+
+
+def random_robots(rng, max_x, max_y, count, length, alphabet='LRF'):
+    """Generate random robots, including some starting off the grid."""
+    return [
+        (rng.randint(-2, max_x + 2), rng.randint(-2, max_y + 2), rng.choice('NESW'),
+         ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, length))))
+        for _ in range(count)
+    ]
+
+
+class TestProgram(unittest.TestCase):
+    """Test cases for run-length compiled programs."""
+    
+    def test_compile_instructions(self):
+        """Test compiling instructions into (turn, forwards) segments."""
+        self.assertEqual(compile_instructions(''), ())
+        self.assertEqual(compile_instructions('FFF'), ((0, 3),))
+        self.assertEqual(compile_instructions('RFFLLF'), ((1, 2), (2, 1)))
+        self.assertEqual(compile_instructions('FFRRR'), ((0, 2), (3, 0)))
+        # Net-zero turns and invalid characters join the surrounding runs
+        self.assertEqual(compile_instructions('FLRFXF'), ((0, 3),))
+    
+    def test_steps_to_edge(self):
+        """Test counting the forward steps left before the edge."""
+        grid = Grid(5, 3)
+        self.assertEqual(steps_to_edge(grid, 1, 1, 0), 2)
+        self.assertEqual(steps_to_edge(grid, 1, 1, 1), 4)
+        self.assertEqual(steps_to_edge(grid, 1, 1, 2), 1)
+        self.assertEqual(steps_to_edge(grid, 1, 1, 3), 1)
+        self.assertEqual(steps_to_edge(grid, 5, 3, 0), 0)
+        # Entering the grid from just outside
+        self.assertEqual(steps_to_edge(grid, -1, 2, 1), 6)
+    
+    def test_run_program_scent(self):
+        """Test that a run stops at the edge and respects scents."""
+        grid = Grid(5, 3)
+        program = compile_instructions('FFFFFRF')
+        self.assertEqual(run_program(grid, 1, 1, 0, program), (1, 3, 0, True))
+        self.assertTrue(grid.is_position_scented(1, 4))
+        self.assertEqual(run_program(grid, 1, 1, 0, program), (2, 3, 1, False))
+    
+    def test_sample_data(self):
+        """Test the compiled engine on the sample data."""
+        simulator = Simulator(5, 3, engine='compiled')
+        results = simulator.process_multiple_robots([
+            (1, 1, 'E', 'RFRFRFRF'),
+            (3, 2, 'N', 'FRRFLLFFRRFLL'),
+            (0, 3, 'W', 'LLFFFLFLFL')
+        ])
+        self.assertEqual(results, ["1 1 E", "3 3 N LOST", "2 3 S"])
+    
+    def test_matches_reference_engine(self):
+        """Test that compiled results and scents match the reference engine."""
+        rng = random.Random(2018)
+        for max_x, max_y in [(0, 0), (5, 3), (12, 7), (40, 40)]:
+            robots = random_robots(rng, max_x, max_y, 200, 60, alphabet='LRFFFFX')
+            reference = Simulator(max_x, max_y)
+            compiled = Simulator(max_x, max_y, engine='compiled')
+            self.assertEqual(compiled.process_multiple_robots(robots),
+                             reference.process_multiple_robots(robots))
+            self.assertEqual(compiled.grid.scented_positions,
+                             reference.grid.scented_positions)
+    
+    def test_fast_engine_matches_reference(self):
+        """Test that the integer fast engine matches the reference engine."""
+        rng = random.Random(14)
+        for max_x, max_y in [(0, 0), (5, 3), (12, 7)]:
+            robots = random_robots(rng, max_x, max_y, 200, 60, alphabet='LRFFX')
+            reference = Simulator(max_x, max_y)
+            fast = Simulator(max_x, max_y, engine='fast')
+            self.assertEqual(fast.process_multiple_robots(robots),
+                             reference.process_multiple_robots(robots))
+            self.assertEqual(fast.grid.scented_positions, reference.grid.scented_positions)
+    
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected."""
+        with self.assertRaises(ValueError):
+            Simulator(5, 3, engine='warp')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from src.cache import ResultCache
+from src.checkpoint import save_checkpoint
+from src.registry import GridRegistry
+
+
+class TestGridRegistry(unittest.TestCase):
+    """Test cases for the multi-grid registry."""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spill_dir = os.path.join(directory.name, 'spill')
+    
+    def test_lru_eviction_and_reload(self):
+        """Test that evicted grids come back with their scents and robot count."""
+        registry = GridRegistry(self.spill_dir, max_grids=2)
+        registry.get('alpha', 5, 3).process_robot(3, 2, 'N', 'FRRFLLFFRRFLL')
+        registry.get('beta', 5, 3)
+        registry.get('gamma/1', 5, 3)
+        
+        self.assertNotIn('alpha', registry)
+        self.assertTrue(os.path.exists(registry.spill_path('alpha')))
+        alpha = registry.get('alpha', 5, 3)
+        self.assertEqual(set(alpha.grid.scented_positions), {(3, 4)})
+        self.assertEqual(alpha.robots_processed, 1)
+        self.assertEqual(alpha.process_robot(3, 2, 'N', 'FF'), "3 3 N")
+        self.assertNotIn('beta', registry)
+        self.assertEqual(registry.stats(), {'hits': 0, 'misses': 4, 'loads': 1, 'evictions': 2,
+                                            'resident': 2,
+                                            'resident_bytes': registry.resident_bytes()})
+    
+    def test_byte_budget(self):
+        """Test eviction driven by resident scent memory."""
+        registry = GridRegistry(self.spill_dir, max_grids=100, max_bytes=2000)
+        for name in ('a', 'b', 'c'):
+            simulator = registry.get(name, 50, 50)
+            for x in range(10):
+                simulator.grid.add_scent(x, 51)
+            registry.get(name, 50, 50)
+        self.assertLess(len(registry), 3)
+        self.assertLessEqual(registry.resident_bytes(), 2000)
+        self.assertEqual(len(registry.get('a', 50, 50).grid.scented_positions), 10)
+    
+    def test_sizes_estimated_between_leases(self):
+        """Test that get() estimates growth and releasing a lease measures exactly."""
+        registry = GridRegistry(self.spill_dir, max_bytes=10 ** 9)
+        simulator = registry.get('a', 50, 50)
+        empty = registry.resident_bytes()
+        for x in range(50):
+            simulator.grid.add_scent(x, 51)
+        simulator.grid.scent_memory_usage = None  # get() must not measure
+        registry.get('a', 50, 50)
+        self.assertGreater(registry.resident_bytes(), empty)
+        del simulator.grid.scent_memory_usage
+        with registry.lease('a', 50, 50):
+            pass
+        self.assertEqual(registry.resident_bytes(), simulator.grid.scent_memory_usage())
+    
+    def test_dimension_mismatch_and_restart(self):
+        """Test dimension checks and picking up spill files from an earlier registry."""
+        registry = GridRegistry(self.spill_dir)
+        registry.get('alpha', 5, 3).process_robot(0, 0, 'S', 'F')
+        with self.assertRaisesRegex(ValueError, "different dimensions"):
+            registry.get('alpha', 6, 3)
+        registry.spill_all()
+        
+        restarted = GridRegistry(self.spill_dir)
+        self.assertEqual(restarted.get('alpha', 5, 3).process_robot(0, 0, 'S', 'F'), "0 0 S")
+        self.assertEqual(restarted.loads, 1)
+        
+        with self.assertRaisesRegex(ValueError, "collision mode"):
+            GridRegistry(self.spill_dir, occupancy='hash')
+        with self.assertRaisesRegex(ValueError, "result cache"):
+            GridRegistry(self.spill_dir, cache=ResultCache())
+    
+    def test_concurrent_leases(self):
+        """Test that leased grids are serialized per grid and never evicted while held."""
+        registry = GridRegistry(self.spill_dir, max_grids=1)
+        
+        def worker(name):
+            for _ in range(50):
+                with registry.lease(name, 5, 3) as simulator:
+                    simulator.process_robot(0, 0, 'N', 'F')
+        
+        threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b', 'c') * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name in ('a', 'b', 'c'):
+            with registry.lease(name, 5, 3) as simulator:
+                self.assertEqual(simulator.robots_processed, 100)
+    
+    def test_spill_outside_registry_lock(self):
+        """Test that a slow spill blocks neither the registry nor the grid's return."""
+        registry = GridRegistry(self.spill_dir, max_grids=1)
+        with registry.lease('a', 5, 3) as simulator:
+            simulator.process_robot(0, 0, 'S', 'F')
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_save(simulator, path):
+            if path == registry.spill_path('a'):
+                started.set()
+                release.wait(5)
+            save_checkpoint(simulator, path)
+        
+        def lease(name, results):
+            with registry.lease(name, 5, 3) as simulator:
+                results.append(simulator.process_robot(0, 0, 'S', 'F'))
+        
+        results = []
+        with mock.patch('src.registry.save_checkpoint', slow_save):
+            spiller = threading.Thread(target=lease, args=('b', []))
+            spiller.start()
+            self.assertTrue(started.wait(5))
+            # The registry lock is free while 'a' is being written
+            self.assertEqual(registry.stats()['resident'], 1)
+            reader = threading.Thread(target=lease, args=('a', results))
+            reader.start()
+            while 'a' not in registry:
+                time.sleep(0.001)
+            release.set()
+            spiller.join()
+            reader.join()
+        # 'a' was taken back from memory, scent included, not reloaded
+        self.assertEqual(results, ["0 0 S"])
+        self.assertEqual(registry.loads, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+from src.grid import Grid
+from src.repeat import Group, iter_instructions, parse_repeats, repeat_summary, run_repeated, summarize
+from src.simulator import ENGINES, Simulator
+from src.stats import SimulationStats
+
+
+def random_grouped(rng, depth=0):
+    """Generate random instructions with nested repeat groups."""
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        if depth < 2 and rng.random() < 0.4:
+            parts.append(f"({random_grouped(rng, depth + 1)}){rng.randint(0, 12)}")
+        else:
+            parts.append(''.join(rng.choice('LRFFF') for _ in range(rng.randint(0, 5))))
+    return ''.join(parts)
+
+
+class TestRepeatParsing(unittest.TestCase):
+    """Test cases for the repeat group syntax."""
+    
+    def test_parse_nested_groups(self):
+        """Test literals, counts, nesting and the default count."""
+        program = parse_repeats("F(R(FL)3)2(F)")
+        self.assertEqual(program[0], "F")
+        self.assertIsInstance(program[1], Group)
+        self.assertEqual(program[1].count, 2)
+        self.assertEqual(program[1].body[1].count, 3)
+        self.assertEqual(program[2].count, 1)
+        self.assertEqual(''.join(iter_instructions("F(R(FL)3)2(F)")), "FRFLFLFLRFLFLFLF")
+    
+    def test_unbalanced_brackets(self):
+        """Test that unmatched brackets are ignored like invalid instructions."""
+        for instructions, expanded in (("(FF", "FF"), ("FF)2", "FF"), ("((F)2R", "FFR"),
+                                       ("F(F", "FF"), ("L)(R", "LR")):
+            self.assertEqual(''.join(c for c in iter_instructions(instructions) if c in "LRF"),
+                             expanded)
+            for engine in ENGINES:
+                self.assertEqual(Simulator(5, 3, engine=engine).process_robot(1, 1, 'E', instructions),
+                                 Simulator(5, 3).process_robot(1, 1, 'E', expanded))
+        self.assertEqual(Simulator(5, 3).process_robot(1, 1, 'E', "F(F"), "3 1 E")
+    
+    def test_repeat_summary_matches_expansion(self):
+        """Test the closed-form summary against summarizing the expansion."""
+        rng = random.Random(3)
+        for _ in range(200):
+            instructions = random_grouped(rng)
+            expanded = ''.join(iter_instructions(instructions))
+            self.assertEqual(summarize(parse_repeats(instructions)), summarize((expanded,)))
+        unit = summarize(("FRF",))
+        self.assertEqual(repeat_summary(unit, 4), summarize(("FRF" * 4,)))
+
+
+class TestRepeatExecution(unittest.TestCase):
+    """Test cases for running repeat programs without expanding them."""
+    
+    def test_matches_expanded_instructions(self):
+        """Test random grouped missions against the reference engine."""
+        rng = random.Random(1)
+        for _ in range(300):
+            max_x, max_y = rng.randint(0, 8), rng.randint(0, 8)
+            grouped, expanded = Simulator(max_x, max_y), Simulator(max_x, max_y)
+            for _ in range(3):
+                instructions = random_grouped(rng)
+                start = (rng.randint(-1, max_x + 1), rng.randint(-1, max_y + 1), rng.choice('NESW'))
+                self.assertEqual(grouped.process_robot(*start, instructions),
+                                 expanded.process_robot(*start, ''.join(iter_instructions(instructions))),
+                                 instructions)
+            self.assertEqual(set(grouped.grid.scented_positions), set(expanded.grid.scented_positions))
+    
+    def test_huge_counts(self):
+        """Test fast-forwarding and cycle skipping on astronomically long programs."""
+        self.assertEqual(run_repeated(Grid(5, 3), 1, 1, 0, parse_repeats("(FRFRF)1000000")),
+                         (1, 1, 0, False))
+        self.assertEqual(run_repeated(Grid(10 ** 9, 10 ** 9), 0, 0, 0,
+                                      parse_repeats("((F)1000R(F)1000L)100000000000")),
+                         (10 ** 9, 10 ** 9, 0, True))
+        
+        grid = Grid(5, 3)
+        grid.add_scent(6, 0)
+        # Pinned against a scented edge for 10**12 repetitions, then lost
+        self.assertEqual(run_repeated(grid, 0, 0, 1, parse_repeats("(F)1000000000000(LFFFFRR)99")),
+                         (5, 3, 0, True))
+    
+    def test_all_modes_accept_groups(self):
+        """Test engines, stats and collision mode with grouped instructions."""
+        robots = [(1, 1, 'E', "(RF)4"), (3, 2, 'N', "FRRFLL(F)2RRFLL"), (0, 3, 'W', "LL(F)3LFLFL")]
+        expected = ["1 1 E", "3 3 N LOST", "2 3 S"]
+        for engine in ENGINES:
+            self.assertEqual(Simulator(5, 3, engine=engine).process_multiple_robots(robots), expected)
+        self.assertEqual(Simulator(5, 3, stats=SimulationStats()).process_multiple_robots(robots),
+                         expected)
+        self.assertEqual(Simulator(5, 3, occupancy='hash').process_multiple_robots(robots), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
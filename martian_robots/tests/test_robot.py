@@ -1,5 +1,5 @@
 import unittest
-from src.robot import Robot, Orientation
+from src.robot import Robot, Orientation, heading_from_orientation
 
 
 class TestRobot(unittest.TestCase):
@@ -135,6 +135,27 @@ class TestRobot(unittest.TestCase):
         robot.mark_as_lost()
         self.assertEqual(str(robot), "2 3 S LOST")
 
+    
+    def test_integer_heading_compatibility(self):
+        """Test that the int heading and the Orientation view stay in sync."""
+        robot = Robot(0, 0, 'N')
+        self.assertEqual(robot.heading, 0)
+        robot.turn_right()
+        self.assertEqual((robot.heading, robot.orientation), (1, Orientation.EAST))
+        
+        robot.orientation = Orientation.WEST
+        self.assertEqual(robot.heading, 3)
+        self.assertEqual(robot.get_next_position(), (-1, 0))
+        
+        with self.assertRaises(AttributeError):
+            robot.speed = 2  # __slots__ keeps robots compact
+    
+    def test_invalid_orientation(self):
+        """Test that invalid orientations are rejected."""
+        with self.assertRaises(ValueError):
+            Robot(0, 0, 'X')
+        self.assertEqual(heading_from_orientation(Orientation.SOUTH), 2)
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
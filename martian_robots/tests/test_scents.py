@@ -0,0 +1,115 @@
+import random
+import unittest
+from src.grid import Grid
+from src.scents import LayeredScentStore, PerimeterScentStore, ScentSet
+from src.simulator import Simulator
+
+
+class TestScentStores(unittest.TestCase):
+    """Test cases for the scent stores."""
+    
+    def test_perimeter_store_matches_set(self):
+        """Test that the perimeter store behaves exactly like a set."""
+        rng = random.Random(4)
+        perimeter, reference = PerimeterScentStore(9, 4), ScentSet(9, 4)
+        for _ in range(500):
+            x, y = rng.randint(-3, 12), rng.randint(-3, 7)
+            self.assertEqual(perimeter.is_scented(x, y), reference.is_scented(x, y))
+            perimeter.add_scent(x, y)
+            reference.add_scent(x, y)
+        
+        self.assertEqual(len(perimeter), len(reference))
+        self.assertEqual(set(perimeter), reference)
+        self.assertEqual(perimeter, reference)
+        self.assertIn((0, 5), perimeter)
+    
+    def test_edge_cells(self):
+        """Test that each bordering line is stored in its bit vector."""
+        store = PerimeterScentStore(5, 3)
+        for position in [(2, 4), (2, -1), (6, 1), (-1, 1)]:
+            store.add_scent(*position)
+        self.assertEqual(len(store._overflow), 0)
+        self.assertEqual(set(store), {(2, 4), (2, -1), (6, 1), (-1, 1)})
+        # Corners beyond the grid never border it directly
+        self.assertFalse(store.is_scented(6, 4))
+        store.add_scent(6, 4)
+        self.assertEqual(store._overflow, {(6, 4)})
+    
+    def test_memory_usage_on_large_grid(self):
+        """Test that scents on a huge grid stay compact."""
+        grid = Grid(10 ** 6, 10 ** 6, scent_store='perimeter')
+        for x in range(0, 10 ** 6, 10):
+            grid.add_scent(x, 10 ** 6 + 1)
+        self.assertEqual(len(grid.scented_positions), 10 ** 5)
+        self.assertLess(grid.scent_memory_usage(), 200 * 1024)
+        self.assertTrue(grid.is_position_scented(500, 10 ** 6 + 1))
+        self.assertFalse(grid.is_position_scented(501, 10 ** 6 + 1))
+    
+    def test_simulator_with_perimeter_store(self):
+        """Test that simulation results do not depend on the scent store."""
+        rng = random.Random(5)
+        robots = [
+            (rng.randint(-1, 8), rng.randint(-1, 6), rng.choice('NESW'),
+             ''.join(rng.choice('LRFF') for _ in range(30)))
+            for _ in range(300)
+        ]
+        reference = Simulator(7, 5)
+        compact = Simulator(7, 5, scent_store='perimeter')
+        self.assertEqual(compact.process_multiple_robots(robots),
+                         reference.process_multiple_robots(robots))
+        self.assertEqual(compact.grid.scented_positions, reference.grid.scented_positions)
+    
+    def test_layered_store_forks(self):
+        """Test that forks share frozen scents and keep their own separate."""
+        base = LayeredScentStore(5, 3)
+        base.add_scent(0, 4)
+        fork = base.fork()
+        fork.add_scent(6, 1)
+        base.add_scent(-1, 2)
+        
+        self.assertEqual(set(base), {(0, 4), (-1, 2)})
+        self.assertEqual(set(fork), {(0, 4), (6, 1)})
+        self.assertEqual(fork.own_scents(), {(6, 1)})
+        self.assertEqual((len(base), len(fork)), (2, 2))
+        self.assertIn((0, 4), fork)
+    
+    def test_layered_store_depth_stays_logarithmic(self):
+        """Test that alternating adds and forks merge small layers."""
+        store = LayeredScentStore(10 ** 6, 10 ** 6)
+        for x in range(1024):
+            store.add_scent(x, -1)
+            store.fork()
+        depth, layer = 0, store._parent
+        while layer is not None:
+            depth, layer = depth + 1, layer.parent
+        self.assertLessEqual(depth, 11)
+        self.assertEqual(len(store), 1024)
+        self.assertEqual(set(store), {(x, -1) for x in range(1024)})
+    
+    def test_fork_keeps_compact_layers(self):
+        """Test that forking a perimeter grid layers perimeter stores, not tuple sets."""
+        grid = Grid(10 ** 5, 10 ** 5, scent_store='perimeter')
+        grid.add_scent(0, 10 ** 5 + 1)
+        fork = grid.fork()
+        for x in range(1, 20001):
+            grid.add_scent(x, -1)
+        fork.add_scent(-1, 7)
+        
+        store = grid.scented_positions
+        self.assertIsInstance(store.own_scents(), PerimeterScentStore)
+        self.assertIsInstance(fork.scented_positions.own_scents(), PerimeterScentStore)
+        self.assertLess(store.nbytes(), 100000)  # a ScentSet would need about 2 MB
+        store.fork()
+        self.assertEqual(len(store), 20001)
+        self.assertEqual(set(fork.scented_positions), {(0, 10 ** 5 + 1), (-1, 7)})
+        self.assertTrue(grid.is_position_scented(20000, -1))
+        self.assertFalse(fork.is_position_scented(20000, -1))
+    
+    def test_unknown_scent_store(self):
+        """Test that an unknown scent store is rejected."""
+        with self.assertRaises(ValueError):
+            Grid(5, 3, scent_store='bloom')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from src.server import MissionServer, send_mission
+
+
+SAMPLE_ROBOTS = ["1 1 E", "RFRFRFRF", "3 2 N", "FRRFLLFFRRFLL", "0 3 W", "LLFFFLFLFL"]
+
+
+class TestMissionServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the asyncio mission service."""
+    
+    async def asyncSetUp(self):
+        self.server = MissionServer(max_batch=4, queue_size=8, max_pending=4)
+        self.host, self.port = await self.server.start_tcp()
+    
+    async def asyncTearDown(self):
+        await self.server.close()
+    
+    async def send(self, lines):
+        return await send_mission(lines, self.host, self.port)
+    
+    async def test_sample_mission(self):
+        """Test that a mission gets the same results as main.py."""
+        results = await self.send(["5 3"] + SAMPLE_ROBOTS)
+        self.assertEqual(results, ["1 1 E", "3 3 N LOST", "2 3 S"])
+    
+    async def test_scents_persist_per_named_grid(self):
+        """Test that requests on one grid share scents and others do not."""
+        self.assertEqual(await self.send(["5 3 alpha", "1 3 N", "F"]), ["1 3 N LOST"])
+        self.assertEqual(await self.send(["5 3 alpha", "1 3 N", "F"]), ["1 3 N"])
+        self.assertEqual(await self.send(["5 3 beta", "1 3 N", "F"]), ["1 3 N LOST"])
+    
+    async def test_concurrent_grids_and_backpressure(self):
+        """Test many robots on several grids at once with small queues."""
+        robots = ["2 2 N", "FFFF"] * 200
+        results = await asyncio.gather(*(
+            self.send([f"5 3 grid{i}"] + robots) for i in range(4)
+        ))
+        for grid_results in results:
+            self.assertEqual(grid_results, ["2 3 N LOST"] + ["2 3 N"] * 199)
+        self.assertGreater(self.server.workers['grid0'].batches, 1)
+    
+    async def test_malformed_request(self):
+        """Test that errors are reported after earlier results."""
+        results = await self.send(["5 3", "1 1 E", "F", "1 1 X", "F"])
+        self.assertEqual(results, ["2 1 E", "ERROR Invalid robot position format at line 4"])
+        results = await self.send(["5 3 alpha", "1 1 E", "F"])
+        results = await self.send(["6 3 alpha", "1 1 E", "F"])
+        self.assertEqual(results, ["ERROR Grid alpha already exists with different dimensions"])
+    
+    async def test_long_instruction_lines(self):
+        """Test lines beyond asyncio's default 64 KiB limit, and the server's own limit."""
+        instructions = "LR" * 50000 + "F"
+        self.assertEqual(await self.send(["5 3", "1 1 E", instructions]), ["2 1 E"])
+        
+        server = MissionServer(line_limit=1000)
+        host, port = await server.start_tcp()
+        try:
+            results = await send_mission(["5 3", "1 1 E", instructions], host, port)
+        finally:
+            await server.close()
+        self.assertEqual(results, ["ERROR Line longer than 1000 bytes"])
+    
+    async def test_unix_socket(self):
+        """Test serving over a Unix domain socket."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'robots.sock')
+            await self.server.start_unix(path)
+            results = await send_mission(["5 3"] + SAMPLE_ROBOTS[:2], path=path)
+        self.assertEqual(results, ["1 1 E"])
+
+
+if __name__ == '__main__':
+    unittest.main()
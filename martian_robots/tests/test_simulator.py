@@ -1,4 +1,5 @@
 import unittest
+from src.cache import ResultCache
 from src.simulator import Simulator
 
 
@@ -100,6 +101,21 @@ class TestSimulator(unittest.TestCase):
         self.assertEqual(results[0], "1 1 E")
         # The other results depend on the exact implementation of the scent mechanism
     
+    def test_iter_results_streams(self):
+        """Test that results are yielded lazily and match the list version."""
+        robot_data = [
+            (1, 1, 'E', 'RFRFRFRF'),
+            (3, 2, 'N', 'FRRFLLFFRRFLL'),
+            (0, 3, 'W', 'LLFFFLFLFL')
+        ]
+        
+        results = Simulator(5, 3).iter_results(iter(robot_data))
+        self.assertEqual(next(results), "1 1 E")
+        self.assertEqual(list(results), ["3 3 N LOST", "2 3 S"])
+        
+        expected = Simulator(5, 3).process_multiple_robots(robot_data)
+        self.assertEqual(expected, ["1 1 E", "3 3 N LOST", "2 3 S"])
+    
     def test_invalid_instructions(self):
         """Test handling of invalid instructions."""
         simulator = Simulator(5, 3)
@@ -128,6 +144,37 @@ class TestSimulator(unittest.TestCase):
         result = simulator.process_robot(5, 2, 'W', 'F')
         self.assertEqual(result, "4 2 W")
 
+    
+    def test_fork_and_dry_run(self):
+        """Test that forks and dry runs never change the original simulator."""
+        simulator = Simulator(5, 3, scent_store='perimeter')
+        simulator.process_robot(3, 2, 'N', 'FRRFLLFFRRFLL')
+        
+        self.assertEqual(simulator.dry_run(0, 0, 'S', 'F'), "0 0 S LOST")
+        self.assertEqual(simulator.dry_run(0, 0, 'S', 'F'), "0 0 S LOST")
+        self.assertEqual(simulator.robots_processed, 1)
+        
+        forks = [simulator.fork() for _ in range(1000)]
+        self.assertEqual(forks[0].process_robot(0, 0, 'S', 'F'), "0 0 S LOST")
+        self.assertEqual(forks[0].process_robot(0, 0, 'S', 'F'), "0 0 S")
+        self.assertEqual(forks[1].process_robot(3, 2, 'N', 'FF'), "3 3 N")
+        self.assertEqual(set(simulator.grid.scented_positions), {(3, 4)})
+        self.assertEqual(set(forks[0].grid.scented_positions), {(3, 4), (0, -1)})
+        self.assertEqual(forks[0].robots_processed, 3)
+        
+        with self.assertRaisesRegex(ValueError, "collision mode"):
+            Simulator(5, 3, occupancy='hash').fork()
+    
+    def test_fork_shares_cache_safely(self):
+        """Test that a shared cache never replays a fork's result on its base."""
+        base = Simulator(5, 3, cache=ResultCache(64))
+        forked = base.fork()
+        self.assertEqual(forked.process_robot(1, 3, 'N', 'F'), "1 3 N LOST")
+        self.assertEqual(forked.process_robot(1, 3, 'N', 'FRF'), "2 3 E")
+        base.process_robot(0, 0, 'S', 'F')
+        self.assertEqual(base.process_robot(1, 3, 'N', 'FRF'), "1 3 N LOST")
+        self.assertTrue(base.grid.is_position_scented(1, 4))
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
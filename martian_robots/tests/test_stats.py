@@ -0,0 +1,71 @@
+import json
+import unittest
+from src.simulator import Simulator
+from src.stats import Histogram, SimulationStats
+
+
+SAMPLE_ROBOTS = [
+    (1, 1, 'E', 'RFRFRFRF'),
+    (3, 2, 'N', 'FRRFLLFFRRFLL'),
+    (0, 3, 'W', 'LLFFFLFLFL'),
+]
+
+
+class TestSimulationStats(unittest.TestCase):
+    """Test cases for runtime metrics."""
+    
+    def test_counters_on_sample_data(self):
+        """Test instruction counts and forward-move outcomes."""
+        stats = SimulationStats()
+        simulator = Simulator(5, 3, stats=stats)
+        results = simulator.process_multiple_robots(SAMPLE_ROBOTS)
+        
+        self.assertEqual(results, Simulator(5, 3).process_multiple_robots(SAMPLE_ROBOTS))
+        self.assertEqual(stats.robots, 3)
+        # Robot 2 is lost after 8 of its 13 instructions
+        self.assertEqual(stats.instructions, {'L': 7, 'R': 6, 'F': 13, 'other': 0})
+        self.assertEqual(stats.losses, 1)
+        self.assertEqual(stats.early_exits, 1)
+        self.assertEqual(stats.scent_hits, 1)
+        self.assertEqual(stats.forward_moves, 11)
+        self.assertEqual(stats.latency.count, 3)
+        self.assertEqual(stats.instructions_per_robot.total, 8 + 8 + 10)
+    
+    def test_invalid_instructions_counted(self):
+        """Test that ignored characters are counted separately."""
+        stats = SimulationStats()
+        Simulator(5, 3, stats=stats).process_robot(1, 1, 'N', 'FX?')
+        self.assertEqual(stats.instructions['other'], 2)
+    
+    def test_timed_iterable(self):
+        """Test charging iteration time to a phase."""
+        stats = SimulationStats()
+        self.assertEqual(list(stats.timed(range(3), 'parse')), [0, 1, 2])
+        self.assertGreater(stats.phase_seconds['parse'], 0)
+    
+    def test_histogram(self):
+        """Test bucket assignment."""
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+    
+    def test_exports(self):
+        """Test the JSON and Prometheus dumps."""
+        stats = SimulationStats()
+        Simulator(5, 3, stats=stats).process_multiple_robots(SAMPLE_ROBOTS)
+        
+        self.assertEqual(json.loads(stats.to_json())['losses'], 1)
+        text = stats.to_prometheus()
+        self.assertIn('martian_robots_instructions_total{type="F"} 13', text)
+        self.assertIn('martian_robots_robot_latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('martian_robots_robot_instructions_count 3', text)
+    
+    def test_disabled_by_default(self):
+        """Test that simulators collect nothing unless asked."""
+        self.assertIsNone(Simulator(5, 3).stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from src.planner import Planner
+from src.simulator import Simulator
+from src.terrain import Terrain, load_terrain, write_terrain
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+
+# 6 x 4 map (max 5, 3); row 0 is y = 3
+MAP = [
+    "......",
+    "..#...",
+    "..#...",
+    "......",
+]
+
+
+class TestTerrain(unittest.TestCase):
+    """Test cases for the packed obstacle layer."""
+
+    def test_ascii_map(self):
+        """Test parsing an ASCII map, north row first."""
+        terrain = Terrain.from_ascii(MAP)
+        self.assertEqual((terrain.max_x, terrain.max_y), (5, 3))
+        self.assertTrue(terrain.is_blocked(2, 1))
+        self.assertTrue(terrain.is_blocked(2, 2))
+        self.assertFalse(terrain.is_blocked(2, 3))
+        self.assertEqual(terrain.count(), 2)
+        with self.assertRaisesRegex(ValueError, "row 2"):
+            Terrain.from_ascii(["...", ".x.", "..."])
+        with self.assertRaisesRegex(ValueError, "row 2"):
+            Terrain.from_ascii(["...", "...."])
+
+    def test_binary_round_trip(self):
+        """Test writing terrain and memory-mapping it back."""
+        cells = [(0, 0), (7, 3), (12, 9), (12, 10)]
+        terrain = Terrain.from_cells(12, 10, cells)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mars.terrain')
+            write_terrain(path, terrain)
+            with load_terrain(path) as loaded:
+                self.assertEqual((loaded.max_x, loaded.max_y), (12, 10))
+                blocked = [(x, y) for x in range(13) for y in range(11) if loaded.is_blocked(x, y)]
+                self.assertEqual(blocked, cells)
+
+            ascii_path = os.path.join(directory, 'mars.txt')
+            with open(ascii_path, 'w') as f:
+                f.write("\n".join(MAP) + "\n")
+            self.assertEqual(load_terrain(ascii_path).count(), 2)
+
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - 1)
+            with self.assertRaisesRegex(ValueError, "Truncated"):
+                load_terrain(path)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_from_array(self):
+        """Test that packing an array matches building from cells."""
+        rng = np.random.default_rng(3)
+        blocked = rng.random((37, 21)) < 0.2
+        terrain = Terrain.from_array(blocked)
+        expected = Terrain.from_cells(36, 20, zip(*np.nonzero(blocked)))
+        self.assertEqual(terrain.count(), int(blocked.sum()))
+        for x in range(37):
+            for y in range(21):
+                self.assertEqual(terrain.is_blocked(x, y), expected.is_blocked(x, y))
+
+    def test_large_sparse_grid(self):
+        """Test that a large grid costs one bit per cell."""
+        terrain = Terrain.from_cells(9999, 9999, [(5000, 5000)])
+        self.assertEqual(terrain.nbytes(), 100_000_000 // 8)
+        self.assertTrue(terrain.is_blocked(5000, 5000))
+        self.assertFalse(terrain.is_blocked(5000, 5001))
+
+
+class TestTerrainSimulation(unittest.TestCase):
+    """Test cases for robots meeting obstacles."""
+
+    def test_policies(self):
+        """Test that a blocked F is skipped or stops the robot."""
+        terrain = Terrain.from_ascii(MAP)
+        ignore = Simulator(5, 3, terrain=terrain)
+        self.assertEqual(ignore.process_robot(0, 1, 'E', 'FFFLF'), "1 2 N")
+        stop = Simulator(5, 3, terrain=terrain, terrain_policy='stop')
+        self.assertEqual(stop.process_robot(0, 1, 'E', 'FFFLF'), "1 1 E")
+        # Scents and losses still apply off the grid
+        self.assertEqual(stop.process_robot(3, 3, 'N', 'F'), "3 3 N LOST")
+        self.assertEqual(stop.process_robot(3, 3, 'N', '(F)5RF'), "4 3 E")
+
+    def test_terrain_with_collisions(self):
+        """Test terrain combined with parked robots."""
+        terrain = Terrain.from_ascii(MAP)
+        simulator = Simulator(5, 3, occupancy='hash', collision_policy='stop', terrain=terrain)
+        self.assertEqual(simulator.process_robot(0, 0, 'E', 'F'), "1 0 E")
+        self.assertEqual(simulator.process_robot(0, 0, 'E', 'FFF'), "0 0 E")
+        self.assertEqual(simulator.process_robot(1, 2, 'E', 'FFF'), "1 2 E")
+
+    def test_rejects_mismatches(self):
+        """Test invalid terrain configurations."""
+        terrain = Terrain.from_ascii(MAP)
+        with self.assertRaisesRegex(ValueError, "dimensions"):
+            Simulator(6, 3, terrain=terrain)
+        with self.assertRaisesRegex(ValueError, "terrain policy"):
+            Simulator(5, 3, terrain=terrain, terrain_policy='bounce')
+        with self.assertRaisesRegex(ValueError, "terrain"):
+            Simulator(5, 3, terrain=terrain).process_program(0, 0, 'N', ((0, 1),))
+
+    def test_planner_avoids_obstacles(self):
+        """Test that planned programs route around the terrain."""
+        simulator = Simulator(5, 3, terrain=Terrain.from_ascii(MAP), terrain_policy='stop')
+        instructions = Planner(simulator.grid).plan((0, 1, 'E'), (4, 1, 'E'))
+        self.assertIsNotNone(instructions)
+        self.assertGreater(len(instructions), 4)
+        self.assertEqual(simulator.process_robot(0, 1, 'E', instructions), "4 1 E")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.batch import run_batch
+from src.parallel import SpeculativeRunner
+from src.scents import ConcurrentScentStore, ScentSet
+from src.simulator import Simulator
+from src.threaded import ThreadSafeSimulator
+from tests.test_parallel import loss_heavy_robots
+
+
+class TestConcurrentScentStore(unittest.TestCase):
+    """Test cases for the striped-lock scent store."""
+
+    def test_matches_set(self):
+        """Test that the store behaves like a plain scent set."""
+        store, expected = ConcurrentScentStore(5, 3, stripes=4), ScentSet()
+        for x, y in [(1, 4), (-1, 2), (6, 0), (1, 4), (-7, -3)]:
+            store.add_scent(x, y)
+            expected.add_scent(x, y)
+        self.assertEqual(set(store), expected)
+        self.assertEqual(len(store), len(expected))
+        self.assertTrue(store.is_scented(-7, -3))
+        self.assertFalse(store.is_scented(2, 4))
+        self.assertEqual(set(store.copy()), expected)
+        self.assertGreater(store.nbytes(), 0)
+        with self.assertRaises(ValueError):
+            ConcurrentScentStore(stripes=3)
+
+    def test_claim_is_atomic(self):
+        """Test that racing threads claim every scent exactly once."""
+        store = ConcurrentScentStore()
+        barrier = threading.Barrier(8)
+
+        def claim_all(_):
+            barrier.wait()
+            return sum(store.claim(x, -1) for x in range(2000))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            claimed = list(executor.map(claim_all, range(8)))
+        self.assertEqual(sum(claimed), 2000)
+        self.assertEqual(len(store), 2000)
+
+
+class TestThreadSafeSimulator(unittest.TestCase):
+    """Test cases for sharing a simulator between threads."""
+
+    def test_shared_simulator_is_sequentially_consistent(self):
+        """Test that concurrent robots lose exactly once per scent."""
+        robots = loss_heavy_robots(8, 4000, 8, 6)
+        simulator = ThreadSafeSimulator(8, 6, engine='fast')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda robot: simulator.process_robot(*robot), robots))
+        self.assertEqual(sum(result.endswith("LOST") for result in results),
+                         len(simulator.grid.scented_positions))
+        self.assertEqual(simulator.robots_processed, len(robots))
+
+    def test_batch_and_fork(self):
+        """Test uninterrupted batches and independent forks."""
+        robots = loss_heavy_robots(9, 500, 5, 3)
+        simulator = ThreadSafeSimulator(5, 3)
+        self.assertEqual(simulator.process_batch(robots), Simulator(5, 3).process_multiple_robots(robots))
+        simulator = ThreadSafeSimulator(5, 3)
+        simulator.process_robot(3, 3, 'N', 'F')
+        forked = simulator.fork()
+        self.assertIsInstance(forked.grid.scented_positions, ConcurrentScentStore)
+        self.assertEqual(forked.process_robot(0, 0, 'S', 'F'), "0 0 S LOST")
+        self.assertEqual(set(forked.grid.scented_positions), {(3, 4), (0, -1)})
+        self.assertEqual(set(simulator.grid.scented_positions), {(3, 4)})
+        self.assertEqual(simulator.dry_run(3, 3, 'N', 'F'), "3 3 N")
+        with self.assertRaises(ValueError):
+            ThreadSafeSimulator(5, 3, scent_store='set')
+
+
+class TestThreadExecutors(unittest.TestCase):
+    """Test cases for the thread-pool execution modes."""
+
+    def test_speculative_threads_match_sequential(self):
+        """Test speculative runs on threads, with and without a shared store."""
+        robots = loss_heavy_robots(6, 2000, 8, 6)
+        expected = Simulator(8, 6).process_multiple_robots(robots)
+        for scent_store in ('set', 'concurrent'):
+            simulator = Simulator(8, 6, scent_store=scent_store)
+            runner = SpeculativeRunner(simulator, max_workers=4, chunk_size=150, executor='thread')
+            self.assertEqual(runner.process_multiple_robots(iter(robots)), expected)
+            self.assertEqual(runner.robots_accepted + runner.robots_rerun, len(robots))
+        with self.assertRaises(ValueError):
+            SpeculativeRunner(Simulator(8, 6), executor='fiber')
+
+    def test_batch_on_threads(self):
+        """Test running independent missions in a thread pool."""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index in range(4):
+                paths.append(os.path.join(directory, f'{index}.txt'))
+                with open(paths[-1], 'w') as f:
+                    f.write("5 3\n1 1 E\nRFRFRFRF\n3 2 N\nFRRFLLFFRRFLL\n0 3 W\nLLFFFLFLFL\n")
+            missions = list(run_batch(paths, max_workers=2, write_next_to_input=False,
+                                      executor='thread'))
+        self.assertEqual([mission.path for mission in missions], paths)
+        for mission in missions:
+            self.assertEqual(mission.results, ["1 1 E", "3 3 N LOST", "2 3 S"])
+
+
+if __name__ == '__main__':
+    unittest.main()
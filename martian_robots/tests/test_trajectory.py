@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from src.simulator import Simulator
+from src.trajectory import (BLOCKED, LOST, MOVE, START, TURN, TrajectoryReader,
+                            TrajectoryRecorder, np)
+
+
+class TestTrajectory(unittest.TestCase):
+    """Test cases for the trajectory recorder and reader."""
+    
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'paths.bin')
+    
+    def record(self, robots, buffer_size=1 << 20):
+        with TrajectoryRecorder(self.path, buffer_size) as recorder:
+            simulator = Simulator(5, 3, recorder=recorder)
+            return simulator.process_multiple_robots(robots)
+    
+    def test_results_unchanged(self):
+        """Test that recording does not change results."""
+        robots = [(1, 1, 'E', 'RFRFRFRF'), (3, 2, 'N', 'FRRFLLFFRRFLL'), (0, 3, 'W', 'LLFFFLFLFL')]
+        self.assertEqual(self.record(robots), Simulator(5, 3).process_multiple_robots(robots))
+    
+    def test_recorded_events(self):
+        """Test the states and flags written for each robot."""
+        self.record([(1, 3, 'N', 'F'), (1, 3, 'N', 'FRF'), (0, 0, 'E', 'X')], buffer_size=18)
+        with TrajectoryReader(self.path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(list(reader.records(0)), [(1, 3, 0, START), (1, 3, 0, LOST)])
+            self.assertEqual(list(reader.records(1)), [
+                (1, 3, 0, START), (1, 3, 0, BLOCKED), (1, 3, 1, TURN), (2, 3, 1, MOVE),
+            ])
+            self.assertEqual(list(reader.records(2)), [(0, 0, 1, START)])
+            with self.assertRaises(IndexError):
+                reader.records(3)
+    
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_zero_copy_numpy_view(self):
+        """Test reading a path as a NumPy view of the mapping."""
+        self.record([(0, 0, 'N', 'FFRFF'), (2, 2, 'S', 'FF')])
+        reader = TrajectoryReader(self.path)
+        path = reader.path(0)
+        self.assertEqual(path['x'].tolist(), [0, 0, 0, 0, 1, 2])
+        self.assertEqual(path['y'].tolist(), [0, 1, 2, 2, 2, 2])
+        self.assertFalse(path.flags.owndata)
+        self.assertEqual(reader.path(1)['y'].tolist(), [2, 1, 0])
+        del path
+
+
+if __name__ == '__main__':
+    unittest.main()
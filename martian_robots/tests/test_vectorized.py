@@ -0,0 +1,65 @@
+import random
+import time
+import unittest
+from src.grid import Grid
+from src.simulator import Simulator
+from src.vectorized import np, run_vectorized
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorizedEngine(unittest.TestCase):
+    """Test cases for the NumPy single-robot engine."""
+    
+    def test_simple_runs(self):
+        """Test moves, turns and a loss."""
+        grid = Grid(5, 3)
+        self.assertEqual(run_vectorized(grid, 1, 1, 0, 'RFF'), (3, 1, 1, False))
+        self.assertEqual(run_vectorized(grid, 1, 1, 0, ''), (1, 1, 0, False))
+        self.assertEqual(run_vectorized(grid, 1, 3, 0, 'FRRR'), (1, 3, 0, True))
+        self.assertEqual(grid.scented_positions, {(1, 4)})
+    
+    def test_scent_skips_resume(self):
+        """Test that scented moves are skipped across block boundaries."""
+        grid = Grid(5, 3)
+        grid.add_scent(6, 1)
+        self.assertEqual(run_vectorized(grid, 4, 1, 1, 'FFFFFLF', block_size=2), (5, 2, 0, False))
+    
+    def test_matches_scalar_engine(self):
+        """Test agreement with the reference engine on long random strings."""
+        rng = random.Random(12)
+        for max_x, max_y in [(0, 0), (5, 3), (30, 20)]:
+            robots = [
+                (rng.randint(-1, max_x + 1), rng.randint(-1, max_y + 1), rng.choice('NESW'),
+                 ''.join(rng.choice('LRFFFFX') for _ in range(rng.randint(0, 400))))
+                for _ in range(150)
+            ]
+            reference = Simulator(max_x, max_y, vectorize_threshold=None)
+            vectorized = Simulator(max_x, max_y, vectorize_threshold=1)
+            self.assertEqual(vectorized.process_multiple_robots(robots),
+                             reference.process_multiple_robots(robots))
+            self.assertEqual(vectorized.grid.scented_positions,
+                             reference.grid.scented_positions)
+    
+    def test_many_consecutive_scent_hits(self):
+        """Test that a robot pressed against a scented edge stays fast."""
+        grid = Grid(5, 3)
+        grid.add_scent(0, 4)
+        start = time.perf_counter()
+        self.assertEqual(run_vectorized(grid, 0, 3, 0, 'F' * 50000), (0, 3, 0, False))
+        self.assertEqual(run_vectorized(grid, 0, 2, 0, ('F' * 500 + 'RFLLFR') * 100),
+                         (0, 3, 0, False))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        simulator = Simulator(5, 3)
+        simulator.process_robot(0, 3, 'N', 'F')
+        self.assertEqual(simulator.process_robot(0, 3, 'N', 'F' * 50000 + 'RF'), "1 3 E")
+    
+    def test_threshold_switches_engine(self):
+        """Test that long strings are routed to the vectorized engine."""
+        instructions = 'FR' * 40000
+        simulator = Simulator(10, 10, vectorize_threshold=50000)
+        self.assertEqual(simulator.process_robot(5, 5, 'N', instructions),
+                         Simulator(10, 10, vectorize_threshold=None).process_robot(5, 5, 'N', instructions))
+
+
+if __name__ == '__main__':
+    unittest.main()